@@ -16,32 +16,28 @@
 # \Author: ionut.cristian.arsene@cern.ch
 # \Interface:  cevat.batuhan.tolon@cern.ch
 
-import urllib.request
-from urllib.request import Request, urlopen
 import os
 import sys
 import argparse
-import ssl
 import logging
 import logging.config
 import shutil
 import argcomplete
 import pathlib
+from extramodules.dqExceptions import DownloadError
+from extramodules.dqLibGetter import DQ_LIB_FILES, getDQLibUrls, refreshDQLibs
 
 # This script provides download to DQ libraries from O2Physics-DQ Manually with/without Production tag or get DQ libraries from alice-software in local machine
 
 
 def main():
     
-    # header for github download
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_3) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/35.0.1916.47 Safari/537.36"
-        }
-    
     parser = argparse.ArgumentParser(description = "Arguments to pass")
     parser.add_argument("--version", help = "Online: Your Production tag for O2Physics example: for nightly-20220619, just enter as 20220619", action = "store", type = str.lower,)
     parser.add_argument("--debug", help = "Online and Local: execute with debug options", action = "store", choices = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], default = "DEBUG", type = str.upper,)
     parser.add_argument("--local", help = "Local: Use Local Paths for getting DQ Libraries instead of online github download. If you are working LXPLUS, It will not working so don't configure with option", action = "store_true",)
+    parser.add_argument("--refresh", help = "Online: Check github for changed DQ libraries with conditional requests and update only changed ones", action = "store_true",)
+    parser.add_argument("--timeout", help = "Online: Timeout in seconds for downloading each DQ library", action = "store", default = 60, type = float)
     parser.add_argument("--localPath", help = "Local: Configure your alice software folder name in your local home path (prefix: home/<user>). Default is home/<user>/alice. Example different configuration is --localpath alice-software --local --> home/<user>/alice-software", action = "store", type = str)
     
     argcomplete.autocomplete(parser)
@@ -58,12 +54,7 @@ def main():
     localPathEventMixing = ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/MixingLibrary.cxx"
     localPathHistogramsLibrary = ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/HistogramsLibrary.cxx"
     
-    URL_CUTS_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/CutsLibrary.cxx?raw=true")
-    URL_MCSIGNALS_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MCSignalLibrary.cxx?raw=true")
-    URL_MIXING_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MixingLibrary.cxx?raw=true")
-    URL_HISTOGRAMS_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/HistogramsLibrary.cxx?raw=true"
-    URL_VAR_MANAGER = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/VarManager.cxx?raw=true"
-
+    dqLibsVersion = "master"
     
     isLibsExist = True
     
@@ -91,12 +82,7 @@ def main():
     
     if extrargs.version and extrargs.local is False:
         logging.info("DQ libs will downloaded from github. Your Version For Downloading DQ Libs From Github : %s", extrargs.version,)
-        
-        URL_CUTS_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/" + extrargs.version + "/PWGDQ/Core/CutsLibrary.cxx?raw=true")
-        URL_MCSIGNALS_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/" + extrargs.version + "/PWGDQ/Core/MCSignalLibrary.cxx?raw=true")
-        URL_MIXING_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/" + extrargs.version + "/PWGDQ/Core/MixingLibrary.cxx?raw=true")
-        URL_HISTOGRAMS_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/" + extrargs.version + "/PWGDQ/Core/HistogramsLibrary.cxx?raw=true")
-        URL_VAR_MANAGER = ("https://github.com/AliceO2Group/O2Physics/blob/" + extrargs.version +  "/PWGDQ/Core/VarManager.cxx?raw=true")
+        dqLibsVersion = extrargs.version
 
     
     if extrargs.local and extrargs.version:
@@ -141,61 +127,56 @@ def main():
         logging.info("Local VarManager.cxx Path: %s ", localPathVarManager)
 
         try:
-            with open(MY_PATH + TEMP_LIB_PATH + "tempCutsLibrary.cxx", "wb") as f:
-                shutil.copyfile(localPathCutsLibrary, MY_PATH + TEMP_LIB_PATH + "tempCutsLibrary.cxx")
-                if os.path.isfile("templibs/tempCutsLibrary.cxx") is True:
-                    logging.info("tempCutsLibrary.cxx created at %s", MY_PATH + TEMP_LIB_PATH)
-                else:
-                    logging.error("tempCutsLibrary.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
-                    sys.exit()
+            shutil.copyfile(localPathCutsLibrary, MY_PATH + TEMP_LIB_PATH + "tempCutsLibrary.cxx")
+            if os.path.isfile("templibs/tempCutsLibrary.cxx") is True:
+                logging.info("tempCutsLibrary.cxx created at %s", MY_PATH + TEMP_LIB_PATH)
+            else:
+                logging.error("tempCutsLibrary.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
+                sys.exit()
         except FileNotFoundError:
             logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPathCutsLibrary,)
             sys.exit()
         
         try:
-            with open(MY_PATH + TEMP_LIB_PATH + "tempMCSignalsLibrary.cxx", "wb") as f:
-                shutil.copyfile(localPathMCSignalsLibrary, MY_PATH + TEMP_LIB_PATH + "tempMCSignalsLibrary.cxx")
-                if os.path.isfile("templibs/tempMCSignalsLibrary.cxx") is True:
-                    logging.info("tempMCSignalsLibrary.cxx created at %s", MY_PATH)
-                else:
-                    logging.error("tempMCSignalsLibrary.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
-                    sys.exit()
+            shutil.copyfile(localPathMCSignalsLibrary, MY_PATH + TEMP_LIB_PATH + "tempMCSignalsLibrary.cxx")
+            if os.path.isfile("templibs/tempMCSignalsLibrary.cxx") is True:
+                logging.info("tempMCSignalsLibrary.cxx created at %s", MY_PATH)
+            else:
+                logging.error("tempMCSignalsLibrary.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
+                sys.exit()
         except FileNotFoundError:
             logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPathMCSignalsLibrary,)
             sys.exit()
         
         try:
-            with open(MY_PATH + TEMP_LIB_PATH + "tempMixingLibrary.cxx", "wb") as f:
-                shutil.copyfile(localPathEventMixing, MY_PATH + TEMP_LIB_PATH + "tempMixingLibrary.cxx")
-                if os.path.isfile("templibs/tempMixingLibrary.cxx") is True:
-                    logging.info("tempMixingLibrary.cxx created at %s", MY_PATH + TEMP_LIB_PATH)
-                else:
-                    logging.error("tempMixingLibrary.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
-                    sys.exit()
+            shutil.copyfile(localPathEventMixing, MY_PATH + TEMP_LIB_PATH + "tempMixingLibrary.cxx")
+            if os.path.isfile("templibs/tempMixingLibrary.cxx") is True:
+                logging.info("tempMixingLibrary.cxx created at %s", MY_PATH + TEMP_LIB_PATH)
+            else:
+                logging.error("tempMixingLibrary.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
+                sys.exit()
         except FileNotFoundError:
             logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPathEventMixing,)
             sys.exit()
         
         try:
-            with open(MY_PATH + TEMP_LIB_PATH + "tempHistogramsLibrary.cxx", "wb") as f:
-                shutil.copyfile(localPathHistogramsLibrary, MY_PATH + TEMP_LIB_PATH + "tempHistogramsLibrary.cxx")
-                if os.path.isfile("templibs/tempHistogramsLibrary.cxx") is True:
-                    logging.info("tempHistogramsLibrary.cxx created at %s", MY_PATH + TEMP_LIB_PATH)
-                else:
-                    logging.error("tempHistogramsLibrary.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
-                    sys.exit()
+            shutil.copyfile(localPathHistogramsLibrary, MY_PATH + TEMP_LIB_PATH + "tempHistogramsLibrary.cxx")
+            if os.path.isfile("templibs/tempHistogramsLibrary.cxx") is True:
+                logging.info("tempHistogramsLibrary.cxx created at %s", MY_PATH + TEMP_LIB_PATH)
+            else:
+                logging.error("tempHistogramsLibrary.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
+                sys.exit()
         except FileNotFoundError:
             logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPathHistogramsLibrary,)
             sys.exit()
             
         try:
-            with open(MY_PATH + TEMP_LIB_PATH + "tempVarManager.cxx", "wb") as f:
-                shutil.copyfile(localPathVarManager, MY_PATH + TEMP_LIB_PATH + "tempVarManager.cxx")
-                if os.path.isfile("templibs/tempVarManager.cxx") is True:
-                    logging.info("tempVarManager.cxx created at %s", MY_PATH + TEMP_LIB_PATH)
-                else:
-                    logging.error("tempVarManager.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
-                    sys.exit()
+            shutil.copyfile(localPathVarManager, MY_PATH + TEMP_LIB_PATH + "tempVarManager.cxx")
+            if os.path.isfile("templibs/tempVarManager.cxx") is True:
+                logging.info("tempVarManager.cxx created at %s", MY_PATH + TEMP_LIB_PATH)
+            else:
+                logging.error("tempVarManager.cxx not created at %s Fatal Error", MY_PATH + TEMP_LIB_PATH)
+                sys.exit()
         except FileNotFoundError:
             logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPathVarManager,)
             sys.exit()
@@ -206,58 +187,28 @@ def main():
     if extrargs.local is False:
         if (os.path.isfile("templibs/tempCutsLibrary.cxx") and os.path.isfile("templibs/tempMCSignalsLibrary.cxx") and os.path.isfile("templibs/tempMixingLibrary.cxx") and os.path.isfile("templibs/tempHistogramsLibrary.cxx") and os.path.isfile("templibs/tempVarManager.cxx")) is False:
             logging.info("Some Libs are Missing. All DQ libs will download")
-            logging.info("Github CutsLibrary.cxx Path: %s ", URL_CUTS_LIBRARY)
-            logging.info("Github MCSignalsLibrary.cxx Path: %s ", URL_MCSIGNALS_LIBRARY)
-            logging.info("Github MixingLibrary.cxx Path: %s ", URL_MIXING_LIBRARY)
-            logging.info("Github HistogramsLibrary.cxx Path: %s ", URL_HISTOGRAMS_LIBRARY)
-            logging.info("Github VarManager.cxx Path: %s ", URL_VAR_MANAGER)
             isLibsExist = False
-            if extrargs.debug:
-                try:
-                    context = ssl._create_unverified_context() # prevent ssl problems
-                except urllib.error.HTTPError as error:
-                    logging.error(error)
-            else:
-                # Dummy SSL Adder
-                context = ssl._create_unverified_context() # prevent ssl problems
-            
-            # HTTP Request
-            requestCutsLibrary = Request(URL_CUTS_LIBRARY, headers = headers)
-            requestMCSignalsLibrary = Request(URL_MCSIGNALS_LIBRARY, headers = headers)
-            requestMixingLibrary = Request(URL_MIXING_LIBRARY, headers = headers)
-            requestHistogramsLibrary = Request(URL_HISTOGRAMS_LIBRARY, headers = headers)
-            requestVarManager = Request(URL_VAR_MANAGER, headers = headers)
-
-
-            # Get Files With Http Requests
-            htmlCutsLibrary = urlopen(requestCutsLibrary, context = context).read()
-            htmlMCSignalsLibrary = urlopen(requestMCSignalsLibrary, context = context).read()
-            htmlMixingLibrary = urlopen(requestMixingLibrary, context = context).read()
-            htmlHistogramsLibrary = urlopen(requestHistogramsLibrary, context = context).read()
-            htmlVarManager= urlopen(requestVarManager, context = context).read()
-
-            
-            with open("templibs/tempCutsLibrary.cxx", "wb") as f:
-                f.write(htmlCutsLibrary)
-                logging.info("tempCutsLibrary.cxx downloaded successfully from github")
-            with open("templibs/tempMCSignalsLibrary.cxx", "wb") as f:
-                f.write(htmlMCSignalsLibrary)
-                logging.info("tempMCSignalsLibrary.cxx downloaded successfully from github")
-            with open("templibs/tempMixingLibrary.cxx", "wb") as f:
-                f.write(htmlMixingLibrary)
-                logging.info("tempMixingLibrary.cxx downloaded successfully from github")
-            with open("templibs/tempHistogramsLibrary.cxx", "wb") as f:
-                f.write(htmlHistogramsLibrary)
-                logging.info("tempHistogramsLibrary.cxx downloaded successfully from github")
-            with open("templibs/tempVarManager.cxx", "wb") as f:
-                f.write(htmlVarManager)
-                logging.info("tempVarManager.cxx downloaded successfully from github")
         
-        if isLibsExist:
-            logging.info("DQ Libraries have been downloaded before. If you want to update, delete they manually and run this script again.")
+        if isLibsExist and extrargs.refresh is False and extrargs.version is None:
+            logging.info("DQ Libraries have been downloaded before. If you want to update, run this script again with --refresh option.")
             sys.exit()
-        else:
+        
+        for lib, url in getDQLibUrls(dqLibsVersion).items():
+            logging.info("Github %s Path: %s ", os.path.basename(url.split("?")[0]), url)
+        
+        # Get Files With concurrent conditional Http Requests (only changed libraries are downloaded and rewritten in templibs)
+        try:
+            changedLibs = refreshDQLibs(dqLibsVersion, timeout = extrargs.timeout)
+        except DownloadError as error:
+            logging.error(error)
+            sys.exit(1)
+        
+        for lib in changedLibs:
+            logging.info("%s updated successfully", os.path.basename(DQ_LIB_FILES[lib]))
+        if changedLibs:
             logging.info("DQ Libraries downloaded from github successfully!")
+        else:
+            logging.info("DQ Libraries are up to date (%s)", dqLibsVersion)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,508 @@
+// Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+// See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+// All rights not expressly granted are reserved.
+//
+// This software is distributed under the terms of the GNU General Public
+// License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+//
+// In applying this license CERN does not waive the privileges and immunities
+// granted to it by virtue of its status as an Intergovernmental Organization
+// or submit itself to any jurisdiction.
+//
+// Synthetic DQ task source for sourceScannerBenchmark.py (not compiled). It follows the layout of PWGDQ tasks:
+// structs with single-line and multi-line Configurable declarations, PROCESS_SWITCH macros, long process
+// functions and adaptAnalysisTask calls in defineDataProcessing.
+
+#include <chrono>
+#include <iostream>
+#include <string>
+#include <vector>
+
+#include "CCDB/BasicCCDBManager.h"
+#include "Framework/AnalysisDataModel.h"
+#include "Framework/AnalysisTask.h"
+#include "Framework/runDataProcessing.h"
+#include "PWGDQ/Core/AnalysisCompositeCut.h"
+#include "PWGDQ/Core/CutsLibrary.h"
+#include "PWGDQ/Core/HistogramManager.h"
+#include "PWGDQ/Core/HistogramsLibrary.h"
+#include "PWGDQ/Core/VarManager.h"
+#include "PWGDQ/DataModel/ReducedInfoTables.h"
+
+using namespace o2;
+using namespace o2::framework;
+using namespace o2::framework::expressions;
+using namespace o2::aod;
+
+// Some definitions
+namespace o2::aod
+{
+namespace dqanalysisflags
+{
+DECLARE_SOA_COLUMN(MixingHash, mixingHash, int);
+DECLARE_SOA_COLUMN(IsEventSelected, isEventSelected, int);
+DECLARE_SOA_COLUMN(IsBarrelSelected, isBarrelSelected, int);
+DECLARE_SOA_COLUMN(IsMuonSelected, isMuonSelected, int);
+} // namespace dqanalysisflags
+
+DECLARE_SOA_TABLE(EventCuts, "AOD", "DQANAEVCUTS", dqanalysisflags::IsEventSelected);
+DECLARE_SOA_TABLE(MixingHashes, "AOD", "DQANAMIXHASH", dqanalysisflags::MixingHash);
+DECLARE_SOA_TABLE(BarrelTrackCuts, "AOD", "DQANATRKCUTS", dqanalysisflags::IsBarrelSelected);
+DECLARE_SOA_TABLE(MuonTrackCuts, "AOD", "DQANAMUONCUTS", dqanalysisflags::IsMuonSelected);
+} // namespace o2::aod
+
+// Declarations of various short names
+using MyEvents = soa::Join<aod::ReducedEvents, aod::ReducedEventsExtended>;
+using MyEventsSelected = soa::Join<aod::ReducedEvents, aod::ReducedEventsExtended, aod::EventCuts>;
+using MyBarrelTracks = soa::Join<aod::ReducedTracks, aod::ReducedTracksBarrel, aod::ReducedTracksBarrelPID>;
+using MyMuonTracks = soa::Join<aod::ReducedMuons, aod::ReducedMuonsExtra>;
+
+constexpr static uint32_t gkEventFillMap = VarManager::ObjTypes::ReducedEvent | VarManager::ObjTypes::ReducedEventExtended;
+constexpr static uint32_t gkTrackFillMap = VarManager::ObjTypes::ReducedTrack | VarManager::ObjTypes::ReducedTrackBarrel | VarManager::ObjTypes::ReducedTrackBarrelPID;
+constexpr static uint32_t gkMuonFillMap = VarManager::ObjTypes::ReducedMuon | VarManager::ObjTypes::ReducedMuonExtra;
+
+void DefineHistograms(HistogramManager* histMan, TString histClasses);
+
+struct AnalysisEventSelection {
+  Produces<aod::EventCuts> eventSel;
+  Produces<aod::MixingHashes> hash;
+  OutputObj<THashList> fOutputList{"output"};
+  Configurable<std::string> fConfigMixingVariables{"cfgMixingVars", "", "Mixing configs separated by a comma, default no mixing"};
+  Configurable<std::string> fConfigEventCuts{"cfgEventCuts", "eventStandard", "Event selection"};
+  Configurable<bool> fConfigQA{"cfgQA", false, "If true, fill QA histograms"};
+  Configurable<std::string> fConfigAddEventHistogram{"cfgAddEventHistogram", "",
+                                                     "Comma separated list of histograms"};
+  Configurable<float> fConfigZVertexMax{"cfgZVertexMax", 10.0f, "Maximum z position of the primary vertex"};
+  Configurable<int> fConfigMinContributors{
+    "cfgMinContributors", 2,
+    "Minimum number of contributors to the primary vertex"};
+
+  HistogramManager* fHistMan = nullptr;
+  MixingHandler* fMixHandler = nullptr;
+  AnalysisCompositeCut* fEventCut;
+
+  void init(o2::framework::InitContext&)
+  {
+    fEventCut = new AnalysisCompositeCut(true);
+    TString eventCutStr = fConfigEventCuts.value;
+    fEventCut->AddCut(dqcuts::GetAnalysisCut(eventCutStr.Data()));
+    VarManager::SetUseVars(AnalysisCut::fgUsedVars); // provide the list of required variables so that VarManager knows what to fill
+
+    if (fConfigQA) {
+      VarManager::SetDefaultVarNames();
+      fHistMan = new HistogramManager("analysisHistos", "aa", VarManager::kNVars);
+      fHistMan->SetUseDefaultVariableNames(kTRUE);
+      fHistMan->SetDefaultVarNames(VarManager::fgVariableNames, VarManager::fgVariableUnits);
+      DefineHistograms(fHistMan, "Event_BeforeCuts;Event_AfterCuts;");
+      dqhistograms::AddHistogramsFromJSON(fHistMan, fConfigAddEventHistogram.value.c_str());
+      VarManager::SetUseVars(fHistMan->GetUsedVars()); // provide the list of required variables so that VarManager knows what to fill
+      fOutputList.setObject(fHistMan->GetMainHistogramList());
+    }
+
+    TString mixVarsString = fConfigMixingVariables.value;
+    std::unique_ptr<TObjArray> objArray(mixVarsString.Tokenize(","));
+    if (objArray->GetEntries() > 0) {
+      fMixHandler = new MixingHandler("mixingHandler", "mixing handler");
+      fMixHandler->Init();
+      for (int iVar = 0; iVar < objArray->GetEntries(); ++iVar) {
+        dqmixing::SetUpMixing(fMixHandler, objArray->At(iVar)->GetName());
+      }
+    }
+  }
+
+  template <uint32_t TEventFillMap, typename TEvent>
+  void runEventSelection(TEvent const& event)
+  {
+    // Reset the fValues array
+    VarManager::ResetValues(0, VarManager::kNEventWiseVariables);
+
+    VarManager::FillEvent<TEventFillMap>(event);
+    if (fConfigQA) {
+      fHistMan->FillHistClass("Event_BeforeCuts", VarManager::fgValues); // automatically fill all the histograms in the class Event
+    }
+    if (fEventCut->IsSelected(VarManager::fgValues)) {
+      if (fConfigQA) {
+        fHistMan->FillHistClass("Event_AfterCuts", VarManager::fgValues);
+      }
+      eventSel(1);
+    } else {
+      eventSel(0);
+    }
+
+    if (fMixHandler != nullptr) {
+      int hh = fMixHandler->FindEventCategory(VarManager::fgValues);
+      hash(hh);
+    }
+  }
+
+  void processSkimmed(MyEvents::iterator const& event)
+  {
+    runEventSelection<gkEventFillMap>(event);
+  }
+  void processDummy(MyEvents&)
+  {
+    // do nothing
+  }
+
+  PROCESS_SWITCH(AnalysisEventSelection, processSkimmed, "Run event selection on DQ skimmed events", false);
+  PROCESS_SWITCH(AnalysisEventSelection, processDummy, "Dummy function", false);
+};
+
+struct AnalysisTrackSelection {
+  Produces<aod::BarrelTrackCuts> trackSel;
+  OutputObj<THashList> fOutputList{"output"};
+  Configurable<std::string> fConfigCuts{"cfgTrackCuts", "jpsiPID1", "Comma separated list of barrel track cuts"};
+  Configurable<bool> fConfigQA{"cfgQA", false, "If true, fill QA histograms"};
+  Configurable<std::string> fConfigAddTrackHistogram{"cfgAddTrackHistogram", "", "Comma separated list of histograms"};
+  Configurable<int> fConfigPrefilterCutId{"cfgPrefilterCutId", 32, "Id of the Prefilter track cut (starting at 0)"};
+  Configurable<std::string> fConfigCcdbUrl{"ccdb-url", "http://alice-ccdb.cern.ch", "url of the ccdb repository"};
+  Configurable<std::string> fConfigCcdbPathTPC{"ccdb-path-tpc", "Users/z/zhxiong/TPCPID/PostCalib",
+                                               "base path to the ccdb object"};
+  Configurable<int64_t> fConfigNoLaterThan{"ccdb-no-later-than", std::chrono::duration_cast<std::chrono::milliseconds>(std::chrono::system_clock::now().time_since_epoch()).count(), "latest acceptable timestamp of creation for the object"};
+  Configurable<bool> fConfigComputeTPCpostCalib{"cfgTPCpostCalib", false, "If true, compute TPC post-calibrated n-sigmas"};
+  Configurable<std::string> fConfigRunPeriods{
+    "cfgRunPeriods",
+    "LHC22f",
+    "run periods for used data"};
+
+  Service<o2::ccdb::BasicCCDBManager> fCCDB;
+
+  HistogramManager* fHistMan;
+  std::vector<AnalysisCompositeCut> fTrackCuts;
+
+  int fCurrentRun; // current run (needed to detect run changes for loading CCDB parameters)
+
+  void init(o2::framework::InitContext&)
+  {
+    fCurrentRun = 0;
+
+    TString cutNamesStr = fConfigCuts.value;
+    if (!cutNamesStr.IsNull()) {
+      std::unique_ptr<TObjArray> objArray(cutNamesStr.Tokenize(","));
+      for (int icut = 0; icut < objArray->GetEntries(); ++icut) {
+        fTrackCuts.push_back(*dqcuts::GetCompositeCut(objArray->At(icut)->GetName()));
+      }
+    }
+    VarManager::SetUseVars(AnalysisCut::fgUsedVars); // provide the list of required variables so that VarManager knows what to fill
+
+    if (fConfigQA) {
+      VarManager::SetDefaultVarNames();
+      fHistMan = new HistogramManager("analysisHistos", "aa", VarManager::kNVars);
+      fHistMan->SetUseDefaultVariableNames(kTRUE);
+      fHistMan->SetDefaultVarNames(VarManager::fgVariableNames, VarManager::fgVariableUnits);
+
+      // set one histogram directory for each defined track cut
+      TString histDirNames = "TrackBarrel_BeforeCuts;";
+      for (auto& cut : fTrackCuts) {
+        histDirNames += Form("TrackBarrel_%s;", cut.GetName());
+      }
+
+      DefineHistograms(fHistMan, histDirNames.Data());
+      dqhistograms::AddHistogramsFromJSON(fHistMan, fConfigAddTrackHistogram.value.c_str());
+      VarManager::SetUseVars(fHistMan->GetUsedVars()); // provide the list of required variables so that VarManager knows what to fill
+      fOutputList.setObject(fHistMan->GetMainHistogramList());
+    }
+    if (fConfigComputeTPCpostCalib) {
+      // Setup the CCDB
+      fCCDB->setURL(fConfigCcdbUrl.value);
+      fCCDB->setCaching(true);
+      fCCDB->setLocalObjectValidityChecking();
+      fCCDB->setCreatedNotAfter(fConfigNoLaterThan.value);
+    }
+  }
+
+  template <uint32_t TEventFillMap, uint32_t TTrackFillMap, typename TEvent, typename TTracks>
+  void runTrackSelection(TEvent const& event, TTracks const& tracks)
+  {
+    VarManager::ResetValues(0, VarManager::kNBarrelTrackVariables);
+    // fill event information which might be needed in histograms/cuts that combine track and event properties
+    VarManager::FillEvent<TEventFillMap>(event);
+
+    // check whether the run changed, and if so, update the CCDB
+    if (fConfigComputeTPCpostCalib && fCurrentRun != event.runNumber()) {
+      auto calibList = fCCDB->getForTimeStamp<TList>(fConfigCcdbPathTPC.value, event.timestamp());
+      VarManager::SetCalibrationObject(VarManager::kTPCElectronMean, calibList->FindObject("mean_map_electron"));
+      VarManager::SetCalibrationObject(VarManager::kTPCElectronSigma, calibList->FindObject("sigma_map_electron"));
+      VarManager::SetCalibrationObject(VarManager::kTPCPionMean, calibList->FindObject("mean_map_pion"));
+      VarManager::SetCalibrationObject(VarManager::kTPCPionSigma, calibList->FindObject("sigma_map_pion"));
+      fCurrentRun = event.runNumber();
+    }
+
+    trackSel.reserve(tracks.size());
+    uint32_t filterMap = 0;
+    int iCut = 0;
+
+    for (auto& track : tracks) {
+      filterMap = 0;
+      VarManager::FillTrack<TTrackFillMap>(track);
+      if (fConfigQA) {
+        fHistMan->FillHistClass("TrackBarrel_BeforeCuts", VarManager::fgValues);
+      }
+      iCut = 0;
+      for (auto cut = fTrackCuts.begin(); cut != fTrackCuts.end(); cut++, iCut++) {
+        if ((*cut).IsSelected(VarManager::fgValues)) {
+          filterMap |= (uint32_t(1) << iCut);
+          if (fConfigQA) {
+            fHistMan->FillHistClass(Form("TrackBarrel_%s", (*cut).GetName()), VarManager::fgValues);
+          }
+        }
+      }
+      trackSel(static_cast<int>(filterMap));
+    }
+  }
+
+  void processSkimmed(MyEventsSelected::iterator const& event, MyBarrelTracks const& tracks)
+  {
+    runTrackSelection<gkEventFillMap, gkTrackFillMap>(event, tracks);
+  }
+  void processDummy(MyEvents&)
+  {
+    // do nothing
+  }
+
+  PROCESS_SWITCH(AnalysisTrackSelection, processSkimmed, "Run barrel track selection on DQ skimmed tracks", false);
+  PROCESS_SWITCH(AnalysisTrackSelection, processDummy, "Dummy function", false);
+};
+
+struct AnalysisMuonSelection {
+  Produces<aod::MuonTrackCuts> muonSel;
+  OutputObj<THashList> fOutputList{"output"};
+  Configurable<std::string> fConfigCuts{"cfgMuonCuts", "muonQualityCuts", "Comma separated list of muon cuts"};
+  Configurable<bool> fConfigQA{"cfgQA", false, "If true, fill QA histograms"};
+  Configurable<std::string> fConfigAddMuonHistogram{"cfgAddMuonHistogram", "", "Comma separated list of histograms"};
+  Configurable<float> fConfigMuonPtLow{"cfgMuonLowPt", 0.5f,
+                                       "Low pt cut for muons in the forward arm"};
+
+  HistogramManager* fHistMan;
+  std::vector<AnalysisCompositeCut> fMuonCuts;
+
+  void init(o2::framework::InitContext&)
+  {
+    TString cutNamesStr = fConfigCuts.value;
+    if (!cutNamesStr.IsNull()) {
+      std::unique_ptr<TObjArray> objArray(cutNamesStr.Tokenize(","));
+      for (int icut = 0; icut < objArray->GetEntries(); ++icut) {
+        fMuonCuts.push_back(*dqcuts::GetCompositeCut(objArray->At(icut)->GetName()));
+      }
+    }
+    VarManager::SetUseVars(AnalysisCut::fgUsedVars); // provide the list of required variables so that VarManager knows what to fill
+
+    if (fConfigQA) {
+      VarManager::SetDefaultVarNames();
+      fHistMan = new HistogramManager("analysisHistos", "aa", VarManager::kNVars);
+      fHistMan->SetUseDefaultVariableNames(kTRUE);
+      fHistMan->SetDefaultVarNames(VarManager::fgVariableNames, VarManager::fgVariableUnits);
+
+      // set one histogram directory for each defined track cut
+      TString histDirNames = "TrackMuon_BeforeCuts;";
+      for (auto& cut : fMuonCuts) {
+        histDirNames += Form("TrackMuon_%s;", cut.GetName());
+      }
+
+      DefineHistograms(fHistMan, histDirNames.Data());
+      dqhistograms::AddHistogramsFromJSON(fHistMan, fConfigAddMuonHistogram.value.c_str());
+      VarManager::SetUseVars(fHistMan->GetUsedVars()); // provide the list of required variables so that VarManager knows what to fill
+      fOutputList.setObject(fHistMan->GetMainHistogramList());
+    }
+  }
+
+  template <uint32_t TEventFillMap, uint32_t TMuonFillMap, typename TEvent, typename TMuons>
+  void runMuonSelection(TEvent const& event, TMuons const& muons)
+  {
+    VarManager::ResetValues(0, VarManager::kNMuonTrackVariables);
+    VarManager::FillEvent<TEventFillMap>(event);
+
+    muonSel.reserve(muons.size());
+    uint32_t filterMap = 0;
+    int iCut = 0;
+
+    for (auto& muon : muons) {
+      filterMap = 0;
+      VarManager::FillTrack<TMuonFillMap>(muon);
+      if (fConfigQA) {
+        fHistMan->FillHistClass("TrackMuon_BeforeCuts", VarManager::fgValues);
+      }
+      iCut = 0;
+      for (auto cut = fMuonCuts.begin(); cut != fMuonCuts.end(); cut++, iCut++) {
+        if ((*cut).IsSelected(VarManager::fgValues)) {
+          filterMap |= (uint32_t(1) << iCut);
+          if (fConfigQA) {
+            fHistMan->FillHistClass(Form("TrackMuon_%s", (*cut).GetName()), VarManager::fgValues);
+          }
+        }
+      }
+      muonSel(static_cast<int>(filterMap));
+    }
+  }
+
+  void processSkimmed(MyEventsSelected::iterator const& event, MyMuonTracks const& muons)
+  {
+    runMuonSelection<gkEventFillMap, gkMuonFillMap>(event, muons);
+  }
+  void processDummy(MyEvents&)
+  {
+    // do nothing
+  }
+
+  PROCESS_SWITCH(AnalysisMuonSelection, processSkimmed, "Run muon selection on DQ skimmed muons", false);
+  PROCESS_SWITCH(AnalysisMuonSelection, processDummy, "Dummy function", false);
+};
+
+struct AnalysisSameEventPairing {
+  OutputObj<THashList> fOutputList{"output"};
+  Configurable<string> fConfigTrackCuts{"cfgTrackCuts", "", "Comma separated list of barrel track cuts"};
+  Configurable<string> fConfigMuonCuts{"cfgMuonCuts", "", "Comma separated list of muon cuts"};
+  Configurable<string> fConfigPairCuts{"cfgPairCuts", "", "Comma separated list of pair cuts"};
+  Configurable<std::string> fConfigAddSEPHistogram{"cfgAddSEPHistogram", "", "Comma separated list of histograms"};
+  Configurable<bool> fConfigFlatTables{"cfgFlatTables", false, "Produce a single flat tables with all relevant information of the pairs and single tracks"};
+  Configurable<bool> fUseKFVertexing{"cfgUseKFVertexing", false,
+                                     "Use KF Particle for secondary vertex reconstruction (DCAFitter is used by default)"};
+  Configurable<float> fConfigMagField{"cfgMagField", 5.0f, "Manually set magnetic field"};
+  Configurable<std::string> fConfigGRPmagPath{
+    "grpmagPath",
+    "GLO/Config/GRPMagField",
+    "CCDB path of the GRPMagField object"};
+
+  HistogramManager* fHistMan;
+  std::vector<std::vector<TString>> fTrackHistNames;
+  std::vector<std::vector<TString>> fMuonHistNames;
+  std::vector<AnalysisCompositeCut> fPairCuts;
+
+  void init(o2::framework::InitContext& context)
+  {
+    bool enableBarrelHistos = context.mOptions.get<bool>("processDecayToEESkimmed");
+    bool enableMuonHistos = context.mOptions.get<bool>("processDecayToMuMuSkimmed");
+
+    VarManager::SetDefaultVarNames();
+    fHistMan = new HistogramManager("analysisHistos", "aa", VarManager::kNVars);
+    fHistMan->SetUseDefaultVariableNames(kTRUE);
+    fHistMan->SetDefaultVarNames(VarManager::fgVariableNames, VarManager::fgVariableUnits);
+
+    TString histNames = "";
+    if (enableBarrelHistos) {
+      TString cutNames = fConfigTrackCuts.value;
+      std::unique_ptr<TObjArray> objArray(cutNames.Tokenize(","));
+      for (int icut = 0; icut < objArray->GetEntries(); ++icut) {
+        std::vector<TString> names = {
+          Form("PairsBarrelSEPM_%s", objArray->At(icut)->GetName()),
+          Form("PairsBarrelSEPP_%s", objArray->At(icut)->GetName()),
+          Form("PairsBarrelSEMM_%s", objArray->At(icut)->GetName())};
+        histNames += Form("%s;%s;%s;", names[0].Data(), names[1].Data(), names[2].Data());
+        fTrackHistNames.push_back(names);
+      }
+    }
+    if (enableMuonHistos) {
+      TString cutNames = fConfigMuonCuts.value;
+      std::unique_ptr<TObjArray> objArray(cutNames.Tokenize(","));
+      for (int icut = 0; icut < objArray->GetEntries(); ++icut) {
+        std::vector<TString> names = {
+          Form("PairsMuonSEPM_%s", objArray->At(icut)->GetName()),
+          Form("PairsMuonSEPP_%s", objArray->At(icut)->GetName()),
+          Form("PairsMuonSEMM_%s", objArray->At(icut)->GetName())};
+        histNames += Form("%s;%s;%s;", names[0].Data(), names[1].Data(), names[2].Data());
+        fMuonHistNames.push_back(names);
+      }
+    }
+
+    DefineHistograms(fHistMan, histNames.Data());
+    dqhistograms::AddHistogramsFromJSON(fHistMan, fConfigAddSEPHistogram.value.c_str());
+    VarManager::SetUseVars(fHistMan->GetUsedVars());
+    fOutputList.setObject(fHistMan->GetMainHistogramList());
+  }
+
+  template <int TPairType, uint32_t TEventFillMap, uint32_t TTrackFillMap, typename TEvent, typename TTracks1, typename TTracks2>
+  void runSameEventPairing(TEvent const& event, TTracks1 const& tracks1, TTracks2 const& tracks2)
+  {
+    std::vector<std::vector<TString>> histNames = fTrackHistNames;
+    if constexpr (TPairType == VarManager::kDecayToMuMu) {
+      histNames = fMuonHistNames;
+    }
+
+    uint32_t twoTrackFilter = 0;
+    for (auto& [t1, t2] : combinations(tracks1, tracks2)) {
+      if constexpr (TPairType == VarManager::kDecayToEE) {
+        twoTrackFilter = uint32_t(t1.isBarrelSelected()) & uint32_t(t2.isBarrelSelected());
+      }
+      if constexpr (TPairType == VarManager::kDecayToMuMu) {
+        twoTrackFilter = uint32_t(t1.isMuonSelected()) & uint32_t(t2.isMuonSelected());
+      }
+      if (!twoTrackFilter) { // the tracks must have at least one filter bit in common to continue
+        continue;
+      }
+      VarManager::FillPair<TPairType, TTrackFillMap>(t1, t2);
+      for (unsigned int icut = 0; icut < histNames.size(); icut++) {
+        if (twoTrackFilter & (uint32_t(1) << icut)) {
+          if (t1.sign() * t2.sign() < 0) {
+            fHistMan->FillHistClass(histNames[icut][0].Data(), VarManager::fgValues);
+          } else if (t1.sign() > 0) {
+            fHistMan->FillHistClass(histNames[icut][1].Data(), VarManager::fgValues);
+          } else {
+            fHistMan->FillHistClass(histNames[icut][2].Data(), VarManager::fgValues);
+          }
+        }
+      }
+    }
+  }
+
+  void processDecayToEESkimmed(soa::Filtered<MyEventsSelected>::iterator const& event, soa::Filtered<MyBarrelTracks> const& tracks)
+  {
+    VarManager::ResetValues(0, VarManager::kNVars);
+    VarManager::FillEvent<gkEventFillMap>(event, VarManager::fgValues);
+    runSameEventPairing<VarManager::kDecayToEE, gkEventFillMap, gkTrackFillMap>(event, tracks, tracks);
+  }
+  void processDecayToMuMuSkimmed(soa::Filtered<MyEventsSelected>::iterator const& event, soa::Filtered<MyMuonTracks> const& muons)
+  {
+    VarManager::ResetValues(0, VarManager::kNVars);
+    VarManager::FillEvent<gkEventFillMap>(event, VarManager::fgValues);
+    runSameEventPairing<VarManager::kDecayToMuMu, gkEventFillMap, gkMuonFillMap>(event, muons, muons);
+  }
+  void processDummy(MyEvents&)
+  {
+    // do nothing
+  }
+
+  PROCESS_SWITCH(AnalysisSameEventPairing, processDecayToEESkimmed, "Run electron-electron pairing, with skimmed tracks", false);
+  PROCESS_SWITCH(AnalysisSameEventPairing, processDecayToMuMuSkimmed, "Run muon-muon pairing, with skimmed muons", false);
+  PROCESS_SWITCH(AnalysisSameEventPairing, processDummy, "Dummy function", false);
+};
+
+WorkflowSpec defineDataProcessing(ConfigContext const& cfgc)
+{
+  return WorkflowSpec{
+    adaptAnalysisTask<AnalysisEventSelection>(cfgc),
+    adaptAnalysisTask<AnalysisTrackSelection>(cfgc),
+    adaptAnalysisTask<AnalysisMuonSelection>(cfgc),
+    adaptAnalysisTask<AnalysisSameEventPairing>(cfgc)};
+}
+
+void DefineHistograms(HistogramManager* histMan, TString histClasses)
+{
+  //
+  // Define here the histograms for all the classes required in analysis.
+  //  The histogram classes are provided in the histClasses string, separated by semicolon ";"
+  //  The histogram classes and their components histograms are defined below depending on the name of the histogram class
+  //
+  std::unique_ptr<TObjArray> objArray(histClasses.Tokenize(";"));
+  for (Int_t iclass = 0; iclass < objArray->GetEntries(); ++iclass) {
+    TString classStr = objArray->At(iclass)->GetName();
+    histMan->AddHistClass(classStr.Data());
+
+    // NOTE: The level of detail for histogramming can be controlled via configurables
+    if (classStr.Contains("Event")) {
+      dqhistograms::DefineHistograms(histMan, objArray->At(iclass)->GetName(), "event", "triggerall,cent,mc");
+    }
+
+    if (classStr.Contains("Track")) {
+      if (classStr.Contains("Barrel")) {
+        dqhistograms::DefineHistograms(histMan, objArray->At(iclass)->GetName(), "track", "its,tpcpid,dca,tofpid");
+      }
+      if (classStr.Contains("Muon")) {
+        dqhistograms::DefineHistograms(histMan, objArray->At(iclass)->GetName(), "track", "muon");
+      }
+    }
+
+    if (classStr.Contains("Pairs")) {
+      dqhistograms::DefineHistograms(histMan, objArray->At(iclass)->GetName(), "pair", "barrel,dimuon,vertexing-forward");
+    }
+  } // end loop over histogram classes
+}
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# Micro-benchmark of O2Physics source scanner of configUpdater (lines/second before and after single-pass scanner)
+#
+# Usage (from PythonInterfaceOOP):
+#   python3 benchmarks/sourceScannerBenchmark.py --source-dir ~/alice/O2Physics
+#   python3 benchmarks/sourceScannerBenchmark.py PWGDQ/Tasks/tableReader.cxx PWGDQ/TableProducer/tableMaker.cxx
+# Without sources, the synthetic DQ task source in benchmarks/fixtures/ is scanned (single-line and multi-line
+# Configurable declarations, PROCESS_SWITCH macros and adaptAnalysisTask calls)
+
+import argparse
+import glob
+import logging
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extramodules.configUpdaterFramework import configurableSelectorWithRegex, defaultValueHandler # noqa: E402
+from extramodules.regexPatterns import RegexPatterns # noqa: E402
+
+
+def legacyConfigurableSelectorWithRegex(file: str) -> list:
+    """Previous scanner (all patterns are matched on every line, patterns are compiled implicitly)"""
+    
+    configurableValues = []
+    for line in file.split("\n"):
+        line = line.strip()
+        if line.startswith("struct"):
+            configurableValues.append({
+                "taskName": line.split()[1],
+                "configurables": [],
+                "processFunc": [],
+                "adaptAnalysisTask": []
+                })
+            continue
+        configurableMatch = re.match(RegexPatterns.CONFIGURABLE_PATTERN.value, line)
+        processSwitchMatch = re.match(RegexPatterns.PROCESS_SWITCH_PATTERN.value, line)
+        adaptAnalysisTaskMatch = re.findall(RegexPatterns.ADAPT_ANALYSIS_TASK_PATTERN.value, line)
+        if configurableMatch:
+            dataType = configurableMatch.group(1)
+            defaultValue = defaultValueHandler(dataType, configurableMatch.group(4))
+            logging.debug(f"dataType: {dataType} | defaultValue: {defaultValue}")
+            if "epoch" not in defaultValue:
+                configurableValues[-1]["configurables"].append({
+                    "dataType": dataType,
+                    "variableName": configurableMatch.group(2),
+                    "defaultValue": defaultValue,
+                    "configName": configurableMatch.group(3),
+                    "description": configurableMatch.group(7)
+                    })
+        elif processSwitchMatch:
+            logging.debug(f"processFunc: {processSwitchMatch.group(2)}")
+            configurableValues[-1]["processFunc"].append({
+                "taskName": processSwitchMatch.group(1),
+                "processFunc": processSwitchMatch.group(2),
+                "processFuncDesc": processSwitchMatch.group(3),
+                "processFuncDefaultValue": processSwitchMatch.group(4)
+                })
+        elif adaptAnalysisTaskMatch:
+            variables = []
+            for match in adaptAnalysisTaskMatch:
+                variables.append((match[0], match[1], [match[2]] if match[2] else []))
+                variables = [item for t in variables for item in t]
+                configurableValues[-1]["adaptAnalysisTask"].append({
+                    "adaptAnalysisTaskName": match[0],
+                    "variables": variables
+                    })
+    return configurableValues
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def countConfigurables(configurableValues: list) -> int:
+    return sum(len(struct["configurables"]) for struct in configurableValues)
+
+
+def getConfigurableKeys(configurableValues: list) -> dict:
+    """Returns configurables by (task name, config name)"""
+    
+    return {(struct["taskName"], configurable["configName"]): configurable
+            for struct in configurableValues
+            for configurable in struct["configurables"]}
+
+
+def reportDifferences(fileName: str, before: list, after: list) -> bool:
+    """Prints differences between outputs of both scanners for a source (e.g. joined multi-line Configurables)
+
+    Returns:
+        bool: True if outputs differ
+    """
+    
+    if before == after:
+        return False
+    beforeKeys = getConfigurableKeys(before)
+    afterKeys = getConfigurableKeys(after)
+    print(f"Outputs differ for {fileName}:")
+    for taskName, configName in sorted(afterKeys.keys() - beforeKeys.keys()):
+        print(f"  only after : {taskName}:{configName} = {afterKeys[(taskName, configName)]['defaultValue']}")
+    for taskName, configName in sorted(beforeKeys.keys() - afterKeys.keys()):
+        print(f"  only before: {taskName}:{configName} = {beforeKeys[(taskName, configName)]['defaultValue']}")
+    for key in sorted(beforeKeys.keys() & afterKeys.keys()):
+        if beforeKeys[key] != afterKeys[key]:
+            print(f"  changed    : {key[0]}:{key[1]} {beforeKeys[key]} -> {afterKeys[key]}")
+    beforeOthers = [{**struct, "configurables": None} for struct in before]
+    afterOthers = [{**struct, "configurables": None} for struct in after]
+    if beforeOthers != afterOthers:
+        print("  structs, process functions or adaptAnalysisTask entries differ")
+    return True
+
+
+def benchmark(scanner, sources: list, repeat: int) -> tuple:
+    """Returns best time of scanning all sources and number of found configurables"""
+    
+    bestTime = None
+    for _ in range(repeat):
+        startTime = time.perf_counter()
+        configurables = sum(countConfigurables(scanner(source)) for source in sources)
+        elapsed = time.perf_counter() - startTime
+        bestTime = elapsed if bestTime is None else min(bestTime, elapsed)
+    return bestTime, configurables
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Micro-benchmark of O2Physics source scanner of configUpdater")
+    parser.add_argument("sources", help = "Task source files", nargs = "*")
+    parser.add_argument("--source-dir", help = "Local O2Physics checkout (all PWGDQ sources are scanned)", action = "store", type = str, metavar = "O2PHYSICS_DIR")
+    parser.add_argument("--repeat", help = "Number of repetitions (best time is reported)", action = "store", type = int, default = 20)
+    args = parser.parse_args()
+    
+    fileNames = list(args.sources)
+    if args.source_dir:
+        fileNames += sorted(glob.glob(os.path.join(args.source_dir, "PWGDQ", "**", "*.cxx"), recursive = True))
+    if not fileNames:
+        fileNames = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.cxx")))
+    
+    sources = []
+    for fileName in fileNames:
+        with open(fileName, errors = "replace") as f:
+            sources.append(f.read())
+    lines = sum(source.count("\n") + 1 for source in sources)
+    print(f"{len(sources)} sources, {lines} lines, best of {args.repeat}")
+    
+    for name, scanner in (("before", legacyConfigurableSelectorWithRegex), ("after", configurableSelectorWithRegex)):
+        bestTime, configurables = benchmark(scanner, sources, args.repeat)
+        print(f"{name:>6}: {lines / bestTime:12.0f} lines/s ({bestTime * 1000:.1f} ms, {configurables} configurables)")
+    
+    differentSources = [fileName for fileName, source in zip(fileNames, sources) if reportDifferences(fileName, legacyConfigurableSelectorWithRegex(source), configurableSelectorWithRegex(source))]
+    if not differentSources:
+        print("Outputs of both scanners are identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,22 +15,38 @@
 
 # Script for update json config files
 
-from extramodules.configSetter import MasterLogger
+from extramodules.configSetter import LogRecordBuffer, MasterLogger
 from extramodules.o2TaskEnums import DQTasksUrlEnum, DQBarrelDepsUrlEnum, DQCommonDepsUrlEnum, DQMuonDepsUrlEnum, ConverterTasksUrlEnum, CentralityTaskEnum
-from extramodules.utils import loadJson, dumpJson
-from extramodules.configUpdaterFramework import ConfigMerger, removeUnmatchedSubkeys, alignDicts, latestConfigFileGenerator, newAddedConfigsReport
+from extramodules.utils import dumpJsonLines, loadJson
+from extramodules.configUpdaterFramework import ConfigMerger, O2SourceCache, reconcileConfigs, updateReconcileDiff, deprecatedConfigsReport, latestConfigFileGenerator, newAddedConfigsReport, getTaskSources
+from extramodules.configManifest import dumpConfigJson, dumpConfigManifest, getChangedTasks, getFileSha, getKeepKey, loadConfigManifest
 from extramodules.choicesHandler import ChoicesCompleterList
+from extramodules.dqExceptions import DownloadError
 import json
 import argparse
 import argcomplete
+import glob
+import logging
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import time
 
-logger = MasterLogger().getAdvancedLogger(f"configUpdater_{int(time.time())}.log", "INFO")
+logger = logging.getLogger("crumbs") # handlers are configured in main (MasterLogger), so worker processes don't create log files
+logBuffer = None # log records of worker process
 
+# Main task keys of configs and their workflows for bulk updates. A config belongs to the first workflow whose main task keys
+# are all in the config, so more specific workflows come first (e.g. table-maker configs include d-q-filter-p-p-task and
+# filterPPwithAssociation configs are filterPP configs with track to collision association)
+MAIN_TASK_KEYS = [(("table-maker-m-c",), "tableMakerMC"), (("table-maker",), "tableMaker"), (("analysis-event-selection",), "tableReader"), (("d-q-filter-p-p-task", "track-to-collision-association"), "filterPPwithAssociation"), (("d-q-filter-p-p-task",), "filterPP"), (("d-q-event-qvector",), "dqFlow"), (("dalitz-pairing",), "dalitzSelection"), (("v0-selector",), "v0selector")]
 
-def updatedConfigFileGenerator(taskWithDeps: dict, oldConfigList: list, keepTasks = [], keepSubkeys: list = []):
+# Configurables which only exist in dqEfficiency (analysis configs for MC)
+MC_SIGNAL_REGEX = re.compile(r"cfg\w*MC\w*Signals")
+
+
+def updatedConfigFileGenerator(taskWithDeps: dict, oldConfigList: list, keepTasks = [], keepSubKeys: list = [], sourceCache: O2SourceCache = None, incremental: bool = False, configsToCreate: list = None):
     """
     Update configuration files for a given task with new dependencies and settings.
 
@@ -38,10 +54,13 @@ def updatedConfigFileGenerator(taskWithDeps: dict, oldConfigList: list, keepTask
         taskWithDeps (dict): A dictionary representing the updated task configuration with its dependencies.
         oldConfigList (list): A list of file paths to the existing configuration files to update.
         keepTasks (list, optional): A list of task names to keep from the old configuration. Defaults to an empty list.
-        keepSubkeys (list, optional): A list of sub-keys to keep from the old configuration. Defaults to an empty list.
+        keepSubKeys (list, optional): A list of sub-keys to keep from the old configuration. Defaults to an empty list.
+        sourceCache (O2SourceCache, optional): Shared O2Physics source cache of session. Defaults to None.
+        incremental (bool, optional): Re-process only task blocks whose source changed since the previous update. Defaults to False.
+        configsToCreate (list, optional): Updated config file paths (one for each old config). Defaults to None (configs/ is replaced with updatedconfigs/).
 
     Returns:
-        list: A list of dictionaries representing the latest configuration settings for each updated file.
+        list: Diff records (see reconcileConfigs) of each updated file with "config", "output" and "status" keys.
 
     Raises:
         FileNotFoundError: If one of the old configuration files does not exist.
@@ -54,53 +73,175 @@ def updatedConfigFileGenerator(taskWithDeps: dict, oldConfigList: list, keepTask
     deprecated options, and aligns the dictionaries. Then, it reorders the tasks as expected, generates the latest
     configs, and reports any new added configs. The updated configuration files are saved in a new directory named
     'updatedconfigs' in the current working directory.
+    
+    Each updated config has a manifest (e.g. updatedconfigs/configAnalysisData.json.manifest) which records the source
+    hash of each task block. In incremental mode, only the task blocks whose source hash changed (or which are new or
+    removed) are merged, cleaned and aligned again; other task blocks are taken from the previous updated config.
     """
     
     # buffers
     newConfigsDir = "updatedconfigs/"
     oldConfigsDir = "configs/"
-    taskWithDepsJson = latestConfigFileGenerator(taskWithDeps)
+    if sourceCache is None:
+        sourceCache = O2SourceCache()
+    taskWithDepsJson = latestConfigFileGenerator(taskWithDeps, sourceCache)
+    taskSources = getTaskSources(taskWithDeps, sourceCache)
+    keepKey = getKeepKey(keepTasks, keepSubKeys)
+    oldConfigShaList = [getFileSha(oldConfig) for oldConfig in oldConfigList]
     oldConfigJsonList = [loadJson(oldConfig) for oldConfig in oldConfigList]
-    mergedConfigs = []
+    previousConfigList = []
+    manifestList = []
+    taskOrderList = []
     transformedConfigList = []
-    latestConfigList = []
+    diffRecords = []
     
     # For debugging
     # dumpJson(f"{int(time.time())}.json", taskWithDepsJson)
     
-    # Create new Config dir as updatedconfigs
-    Path(newConfigsDir).mkdir(parents = True, exist_ok = True)
-    
-    configsToCreate = [element.replace(oldConfigsDir, newConfigsDir) for element in oldConfigList]
+    if configsToCreate is None:
+        configsToCreate = [element.replace(oldConfigsDir, newConfigsDir) for element in oldConfigList]
     
-    # Merge config json file with latest version (for keeping aod dpl tasks and re-order parrent keys as tasks)
-    for oldConfigJson in oldConfigJsonList:
-        tempObj = ConfigMerger(oldConfigJson, taskWithDepsJson)
-        mergedConfigs.append(tempObj.mergeConfigs())
+    # Create new Config dirs (e.g. updatedconfigs)
+    for configDir in {os.path.dirname(configToCreate) for configToCreate in configsToCreate}:
+        Path(configDir or ".").mkdir(parents = True, exist_ok = True)
     
-
-    for i, mergedConfig in enumerate(mergedConfigs):
-        # Remove deprecated tasks and configurables/process functions
-        logger.info(f"Key Remove Section for ==> {oldConfigList[i]}")
-        transformConfig = removeUnmatchedSubkeys(mergedConfig, taskWithDepsJson, keepTasks, keepSubKeys)
+    for oldConfig, oldConfigSha, oldConfigJson, configToCreate in zip(oldConfigList, oldConfigShaList, oldConfigJsonList, configsToCreate):
+        # Task order of updated config: tasks of old config, then new tasks
+        taskOrder = [task for task in oldConfigJson if task in taskWithDepsJson or task in keepTasks]
+        taskOrder += [task for task in taskWithDepsJson if task not in oldConfigJson]
+        taskOrderList.append(taskOrder)
         
-        # Re-order Sub keys (configurables/process funcs) as expected
-        transformConfig = alignDicts(taskWithDepsJson, transformConfig, keepTasks)
-        transformedConfigList.append(transformConfig)
+        # Find task blocks to re-process (all of them if there is no valid manifest)
+        manifest, previousConfig = loadConfigManifest(configToCreate, oldConfigSha, keepKey) if incremental else (None, None)
+        if manifest is None:
+            previousConfig = {}
+            changedTasks = set(oldConfigJson) | set(taskWithDepsJson)
+        else:
+            changedTasks = getChangedTasks(manifest, taskSources)
+            changedTasks.update(task for task in taskOrder if task not in previousConfig)
+            logger.info(f"{len(changedTasks)} of {len(taskOrder)} task blocks changed for ==> {oldConfig}")
+        previousConfigList.append(previousConfig)
+        manifestList.append(manifest)
         
-
-    for oldConfig, oldConfigJson, transformedConfig, configToCreate in zip(oldConfigList, oldConfigJsonList, transformedConfigList, configsToCreate):
+        if not changedTasks:
+            transformedConfigList.append(None)
+            continue
+        oldTaskBlocks = {task: value for task, value in oldConfigJson.items() if task in changedTasks}
+        latestTaskBlocks = {task: value for task, value in taskWithDepsJson.items() if task in changedTasks}
+        
+        # Merge config json file with latest version (for keeping aod dpl tasks and re-order parrent keys as tasks)
+        configMerger = ConfigMerger(oldTaskBlocks, latestTaskBlocks, shareUnchanged = True) # reconcileConfigs does not modify merged config
+        
+        # Remove deprecated tasks and configurables/process functions, re-order sub keys as expected and find new ones
+        logger.info(f"Key Remove Section for ==> {oldConfig}")
+        transformConfig, reconcileDiff = reconcileConfigs(configMerger.mergedConfig, latestTaskBlocks, oldTaskBlocks, keepTasks, keepSubKeys, configMerger.conflicts)
+        deprecatedConfigsReport(reconcileDiff)
+        
+        # Diff of whole config (diff of unchanged task blocks is taken from manifest)
+        configDiff = reconcileDiff
+        if manifest is not None:
+            diffTaskOrder = list(oldConfigJson) + [task for task in taskWithDepsJson if task not in oldConfigJson]
+            configDiff = updateReconcileDiff(manifest["diff"], reconcileDiff, changedTasks, diffTaskOrder)
+        transformedConfigList.append((transformConfig, reconcileDiff, configDiff))
+    
+    for oldConfig, oldConfigSha, previousConfig, manifest, taskOrder, transformed, configToCreate in zip(oldConfigList, oldConfigShaList, previousConfigList, manifestList, taskOrderList, transformedConfigList, configsToCreate):
+        if transformed is None:
+            logger.info(f"{configToCreate} is up to date.")
+            diffRecords.append({"config": oldConfig, "output": configToCreate, "status": "unchanged", **manifest["diff"]})
+            continue
+        transformedConfig, reconcileDiff, configDiff = transformed
         
         # Generate report for new configs - tasks
         logger.info(f"New Added Configs Section For ==> {oldConfig}")
-        newAddedConfigsReport(transformedConfig, oldConfigJson)
+        newAddedConfigsReport(reconcileDiff)
         
-        # Generate latest configs
-        dumpJson(configToCreate, transformedConfig, 4)
+        # Generate latest configs (unchanged task blocks are taken from previous updated config)
+        latestConfig = {task: transformedConfig[task] if task in transformedConfig else previousConfig[task]
+                        for task in taskOrder}
+        outputSha = dumpConfigJson(configToCreate, latestConfig, 4)
+        dumpConfigManifest(configToCreate, oldConfigSha, keepKey, outputSha, {task: taskSources[task] for task in latestConfig if task in taskSources}, configDiff)
+        diffRecords.append({"config": oldConfig, "output": configToCreate, "status": "updated", **configDiff})
         logger.info(f"{configToCreate} created successfully.")
     
     logger.info("Config Updating process finished.")
-    return latestConfigList
+    return diffRecords
+
+
+def classifyConfig(config: dict):
+    """Classifies a config by its main task keys (see MAIN_TASK_KEYS)
+
+    Args:
+        config (dict): Config JSON
+
+    Returns:
+        str or None: Workflow of config (e.g. tableMaker) or None if config has no main task key
+    """
+    
+    if not isinstance(config, dict):
+        return None
+    for mainTaskKeys, workflow in MAIN_TASK_KEYS:
+        if not all(mainTaskKey in config for mainTaskKey in mainTaskKeys):
+            continue
+        if workflow == "tableReader" and any(MC_SIGNAL_REGEX.fullmatch(subKey) for block in config.values() if isinstance(block, dict) for subKey in block):
+            return "dqEfficiency"
+        return workflow
+    return None
+
+
+def findConfigFiles(paths: list) -> list:
+    """Finds config files of directories (recursively) and glob patterns
+
+    Args:
+        paths (list): Directories, glob patterns or config files
+
+    Returns:
+        list: Sorted config file paths without duplicates
+    """
+    
+    configFiles = set()
+    for path in paths:
+        if os.path.isdir(path):
+            configFiles.update(str(configFile) for configFile in Path(path).rglob("*.json"))
+        else:
+            configFiles.update(configFile for configFile in glob.glob(path, recursive = True) if os.path.isfile(configFile))
+    return sorted(configFiles)
+
+
+def initUpdateWorker(level) -> None:
+    """Initializer of worker processes (log records are buffered and they are replayed by main process)"""
+    
+    global logBuffer
+    logBuffer = LogRecordBuffer.install(level)
+
+
+def updateWorkflowJob(reportName: str, taskWithDeps: dict, configList: list, keepTasks: list, keepSubKeys: list, parsedSources: dict, sourceHashes: dict, incremental: bool, configsToCreate: list = None) -> tuple:
+    """Updates configs of one workflow in a worker process
+
+    Args:
+        reportName (str): Name of workflow for reports
+        taskWithDeps (dict): Tasks of workflow with URLs of their sources
+        configList (list): Config files of workflow
+        keepTasks (list): Task names to keep from the old configuration
+        keepSubKeys (list): Sub-keys to keep from the old configuration
+        parsedSources (dict): Parsed sources of workflow from main process (see O2SourceCache.getParsedSources)
+        sourceHashes (dict): Hashes of sources of workflow from main process (see O2SourceCache.getSourceHashes)
+        incremental (bool): Re-process only task blocks whose source changed
+        configsToCreate (list, optional): Updated config file paths. Defaults to None.
+
+    Returns:
+        tuple: Buffered log records of workflow, True if configs are updated successfully and diff records of configs
+    """
+    
+    isSuccessful = True
+    diffRecords = []
+    try:
+        sourceCache = O2SourceCache(parsedSources = parsedSources, sourceHashes = sourceHashes)
+        diffRecords = updatedConfigFileGenerator(taskWithDeps, configList, keepTasks, keepSubKeys, sourceCache, incremental, configsToCreate)
+    except Exception:
+        logger.exception(f"Configs of {reportName} could not be updated")
+        isSuccessful = False
+    records, logBuffer.records = logBuffer.records, [] # worker processes are reused for next workflows
+    return records, isSuccessful, diffRecords
 
 
 if __name__ == "__main__":
@@ -108,11 +249,25 @@ if __name__ == "__main__":
     mainDQTasks = ["all", "tableMaker", "tableMakerMC", "dqEfficiency", "tableReader", "dqFlow", "dalitzSelection", "filterPP", "filterPPwithAssociation", "v0selector"]
     
     parser = argparse.ArgumentParser(description = "Arguments to pass")
-    parser.add_argument("--update", help = "Tasks to Update", action = "store", nargs = "*", type = str, choices = mainDQTasks, required = True).completer = ChoicesCompleterList(mainDQTasks)
+    modeGroup = parser.add_mutually_exclusive_group(required = True)
+    modeGroup.add_argument("--update", help = "Tasks to Update", action = "store", nargs = "*", type = str, choices = mainDQTasks).completer = ChoicesCompleterList(mainDQTasks)
+    modeGroup.add_argument("--configs", help = "Update all config files of directories (recursively) or glob patterns, workflows are found by main task keys (bulk mode)", action = "store", nargs = "+", type = str, metavar = "DIR_OR_GLOB").completer = argcomplete.completers.FilesCompleter()
+    parser.add_argument("--output-dir", help = "Directory for updated configs in bulk mode (relative paths of configs are kept) and the diff file", action = "store", type = str, default = "updatedconfigs").completer = argcomplete.completers.DirectoriesCompleter()
+    parser.add_argument("--jobs", help = "Number of worker processes for updating workflows in parallel (1 updates them sequentially)", action = "store", type = int, default = os.cpu_count() or 1)
+    parser.add_argument("--full", help = "Rebuild all task blocks of configs (by default only task blocks with changed sources are re-processed)", action = "store_true", default = False)
+    parser.add_argument("--diff-file", help = "JSON Lines file for diffs of updated configs (added/removed tasks and configurables, changed defaults). Defaults to configUpdaterDiff.jsonl in output dir", action = "store", type = str)
+    parser.add_argument("--source-dir", help = "Read task sources from local O2Physics checkout instead of github (offline mode)", action = "store", type = str, metavar = "O2PHYSICS_DIR").completer = argcomplete.completers.DirectoriesCompleter()
     
     argcomplete.autocomplete(parser)
     args = parser.parse_args()
     
+    if args.source_dir is not None and not os.path.isdir(args.source_dir):
+        parser.error(f"--source-dir {args.source_dir} is not a directory")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
+    MasterLogger().getAdvancedLogger(f"configUpdater_{int(time.time())}.log", "INFO")
+    
     # All config json files
     configListTableMakerData = ["configs/configTableMakerDataRun2.json", "configs/configTableMakerDataRun3.json"]
     configListTableMakerMC = ["configs/configTableMakerMCRun2.json", "configs/configTableMakerMCRun3.json"]
@@ -263,69 +418,109 @@ if __name__ == "__main__":
     keepTasks = ["internal-dpl-aod-reader", "internal-dpl-clock", "internal-dpl-aod-spawner", "internal-dpl-aod-index-builder", "internal-dpl-aod-global-analysis-file-sink", "internal-dpl-aod-writer", "internal-dpl-injected-dummy-sink"]
     keepSubKeys = ["processBarrelOnlyWithQvector", "processMuonOnlyWithQvector", "genname"]
     
-    if "all" in args.update:
-        logger.info("Report Generation for All PWG-DQ Configs...")
-        
-        logger.info("Generating Report For TableMaker===")
-        updatedConfigFileGenerator(tableMaker, configListTableMakerData, keepTasks, keepSubKeys)
-        
-        logger.info("Generating Report For TableMakerMC===")
-        updatedConfigFileGenerator(tableMakerMC, configListTableMakerMC, keepTasks)
-        
-        logger.info("Generating Report For dqEfficiency===")
-        updatedConfigFileGenerator(dqEfficiency, configListDQEfficiency, keepTasks)
-        
-        logger.info("Generating Report for TableReader===")
-        updatedConfigFileGenerator(tableReader, configListTableReader, keepTasks)
-        
-        logger.info("Generating Report For dqFlow===")
-        updatedConfigFileGenerator(dqFlow, configListDQFlow, keepTasks)
-        
-        logger.info("Generating Report For dalitzSelection===")
-        updatedConfigFileGenerator(dalitzSelection, configListDalitzSelection, keepTasks)
-        
-        logger.info("Generating Report For filterPP===")
-        updatedConfigFileGenerator(filterPP, configListFilterPP, keepTasks)
-        
-        logger.info("Generating Report For filterPPwithAssociation===")
-        updatedConfigFileGenerator(filterPPWithAssociation, configListFilterPPWithAssociation, keepTasks)
-        
-        logger.info("Generating Report For v0selector===")
-        updatedConfigFileGenerator(v0selector, configListV0selector, keepTasks)
-        sys.exit()
-    
-    if "tableMaker" in args.update:
-        logger.info("Generating Report For TableMaker===")
-        updatedConfigFileGenerator(tableMaker, configListTableMakerData, keepTasks, keepSubKeys)
-    
-    if "tableMakerMC" in args.update:
-        logger.info("Generating Report For TableMakerMC===")
-        updatedConfigFileGenerator(tableMakerMC, configListTableMakerMC, keepTasks)
-    
-    if "dqEfficiency" in args.update:
-        logger.info("Generating Report For dqEfficiency===")
-        updatedConfigFileGenerator(dqEfficiency, configListDQEfficiency, keepTasks)
-    
-    if "tableReader" in args.update:
-        logger.info("Generating Report for TableReader===")
-        updatedConfigFileGenerator(tableReader, configListTableReader, keepTasks)
-    
-    if "dqFlow" in args.update:
-        logger.info("Generating Report For dqFlow===")
-        updatedConfigFileGenerator(dqFlow, configListDQFlow, keepTasks)
-    
-    if "dalitzSelection" in args.update:
-        logger.info("Generating Report For dalitzSelection===")
-        updatedConfigFileGenerator(dalitzSelection, configListDalitzSelection, keepTasks)
-    
-    if "filterPP" in args.update:
-        logger.info("Generating Report For filterPP===")
-        updatedConfigFileGenerator(filterPP, configListFilterPP, keepTasks)
-    
-    if "filterPPwithAssociation" in args.update:
-        logger.info("Generating Report For filterPPwithAssociation===")
-        updatedConfigFileGenerator(filterPPWithAssociation, configListFilterPPWithAssociation, keepTasks)
+    # Workflows with tasks and config files to update (in update order)
+    workflowsToUpdate = {
+        "tableMaker": ("TableMaker", tableMaker, configListTableMakerData),
+        "tableMakerMC": ("TableMakerMC", tableMakerMC, configListTableMakerMC),
+        "dqEfficiency": ("dqEfficiency", dqEfficiency, configListDQEfficiency),
+        "tableReader": ("TableReader", tableReader, configListTableReader),
+        "dqFlow": ("dqFlow", dqFlow, configListDQFlow),
+        "dalitzSelection": ("dalitzSelection", dalitzSelection, configListDalitzSelection),
+        "filterPP": ("filterPP", filterPP, configListFilterPP),
+        "filterPPwithAssociation": ("filterPPwithAssociation", filterPPWithAssociation, configListFilterPPWithAssociation),
+        "v0selector": ("v0selector", v0selector, configListV0selector)
+        }
     
-    if "v0selector" in args.update:
-        logger.info("Generating Report For v0selector===")
-        updatedConfigFileGenerator(v0selector, configListV0selector, keepTasks)
+    # Update jobs: (workflow, config files, updated config files or None for default paths)
+    updateJobs = []
+    if args.configs is not None:
+        # Bulk mode: classify configs by main task keys, each workflow is split into chunks for worker processes
+        configFiles = findConfigFiles(args.configs)
+        if not configFiles:
+            logger.error(f"No config files found for {' '.join(args.configs)}")
+            sys.exit(1)
+        configRoot = os.path.commonpath([os.path.dirname(os.path.abspath(configFile)) for configFile in configFiles])
+        workflowConfigs = {workflow: [] for workflow in workflowsToUpdate}
+        for configFile in configFiles:
+            try:
+                workflow = classifyConfig(loadJson(configFile))
+            except (OSError, ValueError) as error:
+                logger.warning(f"{configFile} is skipped, it could not be read: {error}")
+                continue
+            if workflow is None:
+                logger.warning(f"{configFile} is skipped, it has no main task key of a DQ workflow")
+                continue
+            workflowConfigs[workflow].append(configFile)
+        
+        selectedWorkflows = [workflow for workflow, configList in workflowConfigs.items() if configList]
+        chunkSize = max(1, -(-sum(len(configList) for configList in workflowConfigs.values()) // args.jobs))
+        for workflow in selectedWorkflows:
+            configList = workflowConfigs[workflow]
+            logger.info(f"{len(configList)} configs found for {workflow}")
+            for index in range(0, len(configList), chunkSize):
+                chunk = configList[index:index + chunkSize]
+                configsToCreate = [os.path.join(args.output_dir, os.path.relpath(os.path.abspath(configFile), configRoot)) for configFile in chunk]
+                updateJobs.append((workflow, chunk, configsToCreate))
+    else:
+        if "all" in args.update:
+            logger.info("Report Generation for All PWG-DQ Configs...")
+            selectedWorkflows = list(workflowsToUpdate.keys())
+        else:
+            selectedWorkflows = [workflow for workflow in workflowsToUpdate.keys() if workflow in args.update]
+        updateJobs = [(workflow, workflowsToUpdate[workflow][2], None) for workflow in selectedWorkflows]
+    
+    # Download all sources of selected workflows once and concurrently (common dependencies are shared)
+    sourceCache = O2SourceCache(sourceDir = args.source_dir)
+    try:
+        sourceCache.prefetch(url for workflow in selectedWorkflows for url in workflowsToUpdate[workflow][1].values())
+    except DownloadError as error:
+        logger.exception(error)
+        sys.exit(1)
+    
+    sourceCache.close()
+    
+    jobs = min(args.jobs, len(updateJobs))
+    failedJobs = []
+    diffRecords = []
+    if jobs <= 1:
+        for workflow, configList, configsToCreate in updateJobs:
+            reportName, taskWithDeps = workflowsToUpdate[workflow][:2]
+            logger.info(f"Generating Report For {reportName}===")
+            try:
+                diffRecords += updatedConfigFileGenerator(taskWithDeps, configList, keepTasks, keepSubKeys, sourceCache, not args.full, configsToCreate)
+            except Exception:
+                logger.exception(f"Configs of {reportName} could not be updated")
+                failedJobs.append((workflow, configList))
+    else:
+        # Jobs are independent (different config files), sources are parsed only once in main process
+        with ProcessPoolExecutor(max_workers = jobs, initializer = initUpdateWorker, initargs = (logging.getLogger().level,)) as executor:
+            futures = []
+            for workflow, configList, configsToCreate in updateJobs:
+                reportName, taskWithDeps = workflowsToUpdate[workflow][:2]
+                parsedSources = sourceCache.getParsedSources(taskWithDeps.values())
+                sourceHashes = sourceCache.getSourceHashes(taskWithDeps.values())
+                futures.append(executor.submit(updateWorkflowJob, reportName, taskWithDeps, configList, keepTasks, keepSubKeys, parsedSources, sourceHashes, not args.full, configsToCreate))
+            
+            # Merge logs of jobs in update order, so the log is deterministic and independent from scheduling
+            for (workflow, configList, configsToCreate), future in zip(updateJobs, futures):
+                reportName = workflowsToUpdate[workflow][0]
+                logger.info(f"Generating Report For {reportName}===")
+                records, isSuccessful, workflowDiffRecords = future.result()
+                LogRecordBuffer.replay(records)
+                diffRecords += workflowDiffRecords
+                if not isSuccessful:
+                    failedJobs.append((workflow, configList))
+    
+    # Machine-readable diff of all updated configs (one JSON object per config)
+    if args.diff_file is None:
+        args.diff_file = os.path.join(args.output_dir, "configUpdaterDiff.jsonl")
+    Path(args.diff_file).parent.mkdir(parents = True, exist_ok = True)
+    dumpJsonLines(args.diff_file, diffRecords)
+    logger.info(f"Diff of {len(diffRecords)} configs is written to {args.diff_file}")
+    
+    if failedJobs:
+        if args.configs is not None:
+            logger.error(f"Configs could not be updated: {', '.join(configFile for workflow, configList in failedJobs for configFile in configList)}")
+        else:
+            logger.error(f"Configs could not be updated for workflows: {', '.join(workflow for workflow, configList in failedJobs)}")
+        sys.exit(1)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes deep validation of AO2D files in text lists (Developer package)
+
+import logging
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+from .utils import writeFileAtomic
+
+# Every ROOT file starts with this magic header
+ROOT_MAGIC = b"root"
+
+
+def checkAodFile(aodFile: str):
+    """Checks that an AO2D file exists, it is a non-empty regular file and it has ROOT file header
+
+    Args:
+        aodFile (str): Local AO2D file
+
+    Returns:
+        str: Reason why AO2D file can't be read, or None if it is valid
+    """
+    
+    try:
+        fileStat = os.stat(aodFile)
+    except FileNotFoundError:
+        return "file not found"
+    except OSError as error:
+        return f"file could not be accessed ({error.strerror})"
+    
+    if not stat.S_ISREG(fileStat.st_mode):
+        return "not a regular file"
+    if fileStat.st_size == 0:
+        return "empty file"
+    
+    try:
+        with open(aodFile, "rb") as f:
+            header = f.read(len(ROOT_MAGIC))
+    except OSError as error:
+        return f"file could not be read ({error.strerror})"
+    if header != ROOT_MAGIC:
+        return "not a ROOT file (missing root header)"
+    return None
+
+
+def readAodList(aodListFileName: str, deduplicate: bool = False, duplicates: list = None) -> list:
+    """Reads AO2D files of a text list (empty lines and comments are skipped, local paths are converted to absolute paths)
+
+    Args:
+        aodListFileName (str): AO2D text list (without @)
+        deduplicate (bool, optional): Skip entries which are already listed. Defaults to False.
+        duplicates (list, optional): Skipped duplicate entries are appended to it (if None, they are logged). Defaults to None.
+
+    Returns:
+        list: AO2D files (in list order)
+    """
+    
+    aodFiles = []
+    seenFiles = set()
+    skippedFiles = []
+    with open(aodListFileName) as aodListFile:
+        for line in aodListFile:
+            aodFile = line.strip()
+            if not aodFile or aodFile.startswith("#"):
+                continue
+            if "://" not in aodFile:
+                aodFile = os.path.abspath(aodFile)
+            if deduplicate and aodFile in seenFiles:
+                skippedFiles.append(aodFile)
+                continue
+            seenFiles.add(aodFile)
+            aodFiles.append(aodFile)
+    
+    if duplicates is not None:
+        duplicates.extend(skippedFiles)
+    elif skippedFiles:
+        logging.warning("%d duplicate entries of %s are skipped", len(skippedFiles), aodListFileName)
+    return aodFiles
+
+
+class AodListValidator(object):
+    
+    """Validates all AO2D files of a text list before a workflow runs. Entries are deduplicated (see readAodList) and
+    local files are checked concurrently (see checkAodFile), so a wrong entry in a long list is reported before launch
+    instead of stopping a workflow in the middle. Remote files (e.g. alien://) are not checked.
+
+    Args:
+        aodListFileName (str): AO2D text list (without @)
+        maxWorkers (int, optional): Maximum number of files checked at the same time. Defaults to 32.
+    """
+    
+    def __init__(self, aodListFileName: str, maxWorkers: int = 32) -> None:
+        self.aodListFileName = aodListFileName
+        self.maxWorkers = maxWorkers
+        self.aodFiles = []
+        self.duplicates = []
+        self.remoteFiles = []
+        self.badEntries = {}
+    
+    def validate(self) -> dict:
+        """Checks all AO2D files of text list concurrently
+
+        Returns:
+            dict: Bad AO2D files with the reason (empty if all files are valid)
+        """
+        
+        self.duplicates = []
+        self.aodFiles = readAodList(self.aodListFileName, deduplicate = True, duplicates = self.duplicates)
+        localFiles = [aodFile for aodFile in self.aodFiles if "://" not in aodFile]
+        self.remoteFiles = [aodFile for aodFile in self.aodFiles if "://" in aodFile]
+        
+        self.badEntries = {}
+        if localFiles:
+            with ThreadPoolExecutor(max_workers = min(self.maxWorkers, len(localFiles))) as executor:
+                for aodFile, reason in zip(localFiles, executor.map(checkAodFile, localFiles)):
+                    if reason is not None:
+                        self.badEntries[aodFile] = reason
+        return self.badEntries
+    
+    def getValidFiles(self) -> list:
+        """Returns unique AO2D files of text list without bad entries (in list order)"""
+        
+        return [aodFile for aodFile in self.aodFiles if aodFile not in self.badEntries]
+    
+    def report(self) -> None:
+        """Logs result of validation"""
+        
+        for aodFile in sorted(set(self.duplicates)):
+            logging.warning("%s is listed %d times in %s, it will be read once", aodFile, self.duplicates.count(aodFile) + 1, self.aodListFileName)
+        if self.remoteFiles:
+            logging.info("%d remote AO2D files are not checked", len(self.remoteFiles))
+        for aodFile, reason in self.badEntries.items():
+            logging.error("Bad AO2D file in %s: %s (%s)", self.aodListFileName, aodFile, reason)
+        logging.info("%s: %d unique AO2D files, %d bad files, %d duplicate entries", self.aodListFileName, len(self.aodFiles), len(self.badEntries), len(self.duplicates))
+    
+    def writeCleanedList(self, cleanedListFileName: str) -> str:
+        """Writes a text list with unique and valid AO2D files (absolute paths)
+
+        Args:
+            cleanedListFileName (str): Cleaned AO2D text list (without @)
+
+        Returns:
+            str: Cleaned AO2D text list
+        """
+        
+        writeFileAtomic(cleanedListFileName, "".join(f"{aodFile}\n" for aodFile in self.getValidFiles()).encode("utf-8"))
+        logging.info("Cleaned AO2D list is written: %s", cleanedListFileName)
+        return cleanedListFileName
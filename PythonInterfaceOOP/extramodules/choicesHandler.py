@@ -13,6 +13,22 @@
 # granted to it by virtue of its status as an Intergovernmental Organization
 # or submit itself to any jurisdiction.
 
+from bisect import bisect_left
+
+
+def splitMultiValuePrefix(prefix: str):
+    """Splits comma separated prefix to already completed values and the value which is being completed
+
+    Args:
+        prefix (str): Typed prefix e.g. jpsiPID1,jpsiPI
+
+    Returns:
+        tuple[str, str]: Completed values with trailing comma (e.g. jpsiPID1,) and last value (e.g. jpsiPI)
+    """
+    
+    head, sep, last = prefix.rpartition(",")
+    return head + sep, last
+
 
 class ChoicesCompleterList(object):
     
@@ -21,6 +37,9 @@ class ChoicesCompleterList(object):
     the TAB key is the class written for autocomplete and validation when an argument can take multiple values.
     By default, the argcomplete package has the ChoicesCompleter Class,
     which can only validate arguments that take an one value and allows autocomplete with the TAB key.
+    
+    Choices are kept in a sorted array, so only choices which start with the typed prefix are returned with
+    binary search instead of filtering all choices. Comma separated values (e.g. jpsiPID1,jpsiPI) are also completed.
 
     Args:
         object (list): parserargs choices object as a list
@@ -28,6 +47,83 @@ class ChoicesCompleterList(object):
     
     def __init__(self, choices):
         self.choices = list(choices)
+        self.sortedChoices = sorted(set(self.choices))
+    
+    def __call__(self, prefix = "", **kwargs):
+        head, last = splitMultiValuePrefix(prefix)
+        return [head + choice for choice in self.getChoices(last)]
+    
+    def getChoices(self, prefix: str):
+        """Generator for choices which start with prefix (binary search on sorted choices)
+
+        Args:
+            prefix (str): Typed prefix
+
+        Yields:
+            str: Choice which starts with prefix
+        """
+        
+        for i in range(bisect_left(self.sortedChoices, prefix), len(self.sortedChoices)):
+            choice = self.sortedChoices[i]
+            if not choice.startswith(prefix):
+                break
+            yield choice
+
+
+class SelsCompleter(object):
+    
+    """
+    Lazy autocompletion class for filter selections (cfgBarrelSels and cfgMuonSels in filterPP task).
+    Selections have <track-cut>:[<pair-cut>]:<n> and <track-cut>::<n> styles, so all possible combinations
+    are not generated. Candidates are generated from the typed prefix step by step:
+    analysis cut, then : or ::, then pair cut, then n.
+
+    Args:
+        analysisCuts (list): All analysis cuts from CutsLibrary
+        pairCuts (list): Only pair cuts from CutsLibrary
+        multiplicities (list, optional): Possible n values. Defaults to 1 to 9.
+    """
+    
+    def __init__(self, analysisCuts, pairCuts, multiplicities = range(1, 10)):
+        self.analysisCuts = ChoicesCompleterList(analysisCuts)
+        self.pairCuts = ChoicesCompleterList(pairCuts)
+        self.multiplicities = [str(n) for n in multiplicities]
+        self.analysisCutsSet = set(self.analysisCuts.sortedChoices)
+        self.pairCutsSet = set(self.pairCuts.sortedChoices)
     
-    def __call__(self, **kwargs):
-        return self.choices
+    def __call__(self, prefix = "", **kwargs):
+        head, last = splitMultiValuePrefix(prefix)
+        for sel in self.getSels(last):
+            yield head + sel
+    
+    def getSels(self, prefix: str):
+        """Generator for selection candidates which start with prefix
+
+        Args:
+            prefix (str): Typed part of the selection
+
+        Yields:
+            str: Selection candidate (it ends with a colon if it is not complete yet)
+        """
+        
+        cut, sep, rest = prefix.partition(":")
+        if not sep:
+            for analysisCut in self.analysisCuts.getChoices(cut):
+                yield analysisCut + ":" # cut:
+            return
+        if cut not in self.analysisCutsSet:
+            return
+        
+        pairCut, sep, n = rest.partition(":")
+        if not sep:
+            if not pairCut:
+                yield cut + "::" # cut::
+            for pair in self.pairCuts.getChoices(pairCut):
+                yield cut + ":" + pair + ":" # cut:paircut:
+            return
+        if pairCut and pairCut not in self.pairCutsSet:
+            return
+        
+        for multiplicity in self.multiplicities:
+            if multiplicity.startswith(n):
+                yield cut + ":" + pairCut + ":" + multiplicity # cut::n or cut:paircut:n
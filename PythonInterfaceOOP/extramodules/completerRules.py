@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes declarative autocompletion rules for JSON configurables (Developer package)
+
+import hashlib
+import re
+from argcomplete.completers import ChoicesCompleter
+from .choicesHandler import ChoicesCompleterList, SelsCompleter
+
+# Completer kind for configurables which are not provided as CLI arguments
+SKIP_KIND = "skip"
+
+
+class CompleterRules(object):
+    
+    """Declarative registry which maps configurables to completer kinds. A completer kind defines the completer and type of CLI argument.
+
+    Exact configurable names are resolved with one dict lookup, other rules (prefix, suffix, contains and regex) are compiled
+    into one regex alternation and resolved with one match. Rules are checked in the order they are added (first rule wins).
+    Run scripts can extend a copy of default rules (see getDefaultCompleterRules) without editing configSetter.py, e.g.
+
+        completerRules = getDefaultCompleterRules()
+        completerRules.addKind("ptBinSelection", choices = ["1", "2", "5"])
+        completerRules.addExact("ptBinSelection", ["cfgPtBin"])
+        setArgsToArgumentParser = SetArgsToArgumentParser(parsedJsonFile, tasksToPassList, completerRules = completerRules)
+    """
+    
+    def __init__(self):
+        self.kinds = {}
+        self.exactRules = {}
+        self.patternRules = [] # list of (regex, kind)
+        self._regex = None
+        self._groupKinds = {}
+    
+    def addKind(self, kind: str, choices: list = None, dqLibAttrs: list = None, completerClass = None, multiValue = False, lowerCase = False):
+        """Registers a completer kind
+
+        Args:
+            kind (str): Completer kind name
+            choices (list, optional): Predefined choices for completer. Defaults to None.
+            dqLibAttrs (list, optional): DQLibGetter attributes which are passed to completer instead of choices. Defaults to None.
+            completerClass (optional): Completer class. Defaults to ChoicesCompleterList for multi value kinds, else ChoicesCompleter.
+            multiValue (bool, optional): Argument takes multiple values. Defaults to False.
+            lowerCase (bool, optional): Argument value is converted to lower case. Defaults to False.
+
+        Returns:
+            CompleterRules: self for chaining
+        """
+        
+        if completerClass is None:
+            completerClass = ChoicesCompleterList if multiValue else ChoicesCompleter
+        self.kinds[kind] = {
+            "choices": list(choices) if choices is not None else None,
+            "dqLibAttrs": list(dqLibAttrs) if dqLibAttrs is not None else None,
+            "completerClass": completerClass,
+            "multiValue": multiValue,
+            "lowerCase": lowerCase
+            }
+        return self
+    
+    def addExact(self, kind: str, configurables: list):
+        """Adds rule for exact configurable names (checked before all other rules)"""
+        
+        self.checkKind(kind)
+        for configurable in configurables:
+            self.exactRules[configurable] = kind
+        return self
+    
+    def addPrefix(self, kind: str, prefixes: list):
+        """Adds rule for configurables which start with one of prefixes"""
+        
+        return self.addPattern(kind, "(?:" + "|".join(re.escape(prefix) for prefix in prefixes) + ")")
+    
+    def addSuffix(self, kind: str, suffixes: list):
+        """Adds rule for configurables which end with one of suffixes"""
+        
+        return self.addPattern(kind, ".*(?:" + "|".join(re.escape(suffix) for suffix in suffixes) + ")$")
+    
+    def addContains(self, kind: str, substrings: list):
+        """Adds rule for configurables which contain one of substrings"""
+        
+        return self.addPattern(kind, ".*(?:" + "|".join(re.escape(substring) for substring in substrings) + ")")
+    
+    def addPattern(self, kind: str, pattern: str):
+        """Adds rule for configurables which match regex pattern from the beginning (re.match)"""
+        
+        self.checkKind(kind)
+        re.compile(pattern) # validate pattern before it is compiled into alternation
+        self.patternRules.append((pattern, kind))
+        self._regex = None
+        return self
+    
+    def checkKind(self, kind: str) -> None:
+        """Checks completer kind is registered
+
+        Raises:
+            KeyError: If completer kind is not registered
+        """
+        
+        if kind != SKIP_KIND and kind not in self.kinds:
+            raise KeyError(f"Completer kind {kind} is not registered (use addKind)")
+    
+    def compile(self):
+        """Compiles all pattern rules into one regex alternation with a named group for each rule"""
+        
+        self._groupKinds = {f"r{i}": kind
+                            for i, (pattern, kind) in enumerate(self.patternRules)}
+        alternation = "|".join(f"(?P<r{i}>{pattern})" for i, (pattern, kind) in enumerate(self.patternRules))
+        self._regex = re.compile(alternation or "(?!)")
+        return self._regex
+    
+    def classify(self, configurable: str):
+        """Classifies a configurable to its completer kind
+
+        Args:
+            configurable (str): Configurable or process function name in JSON config
+
+        Returns:
+            str or None: Completer kind for configurable ("skip" if no argument is needed, None if there is no autocompletion)
+        """
+        
+        kind = self.exactRules.get(configurable)
+        if kind is not None:
+            return kind
+        
+        regex = self._regex or self.compile()
+        match = regex.match(configurable)
+        if match is None:
+            return None
+        return self._groupKinds[match.lastgroup]
+    
+    def isMultiValue(self, kind: str) -> bool:
+        return kind in self.kinds and self.kinds[kind]["multiValue"]
+    
+    def isLowerCase(self, kind: str) -> bool:
+        return kind in self.kinds and self.kinds[kind]["lowerCase"]
+    
+    def needsDQLibs(self, kind: str) -> bool:
+        return kind in self.kinds and self.kinds[kind]["dqLibAttrs"] is not None
+    
+    def getCompleter(self, kind: str, dqLibGetter = None):
+        """Creates completer of completer kind
+
+        Args:
+            kind (str): Completer kind
+            dqLibGetter (DQLibGetter, optional): DQ lib getter for kinds with DQ library choices. Defaults to None.
+
+        Returns:
+            Completer object or None if DQ libraries are needed but not provided
+        """
+        
+        kindSpec = self.kinds[kind]
+        if kindSpec["dqLibAttrs"] is None:
+            return kindSpec["completerClass"](kindSpec["choices"])
+        if dqLibGetter is None:
+            return None
+        return kindSpec["completerClass"](*[getattr(dqLibGetter, attr) for attr in kindSpec["dqLibAttrs"]])
+    
+    def fingerprint(self) -> str:
+        """Returns hash of all rules and kind types (used as cache key for argument manifests)"""
+        
+        kindTypes = sorted((kind, spec["multiValue"], spec["lowerCase"]) for kind, spec in self.kinds.items())
+        rules = repr([sorted(self.exactRules.items()), self.patternRules, kindTypes])
+        return hashlib.sha256(rules.encode("utf-8")).hexdigest()
+
+
+def getDefaultCompleterRules() -> CompleterRules:
+    """Creates autocompletion rules according to naming conventions in O2-DQ Framework and Common Framework
+
+    Returns:
+        CompleterRules: New rule registry with default rules
+    """
+    
+    completerRules = CompleterRules()
+    
+    # Completer kinds for O2-DQ Framework (choices from DQ libraries)
+    completerRules.addKind("analysisCuts", dqLibAttrs = ["allAnalysisCuts"], multiValue = True)
+    completerRules.addKind("mcSignals", dqLibAttrs = ["allMCSignals"], multiValue = True)
+    completerRules.addKind("runPeriods", dqLibAttrs = ["allLHCPeriods"], multiValue = True)
+    completerRules.addKind("histograms", dqLibAttrs = ["allHistos"], multiValue = True) # NOTE Now we use only all histos for backward comp.
+    completerRules.addKind("sels", dqLibAttrs = ["allAnalysisCuts", "allOnlyPairCuts"], completerClass = SelsCompleter, multiValue = True)
+    completerRules.addKind("mixingVars", dqLibAttrs = ["allMixing"], multiValue = True)
+    
+    # Completer kinds with predefined choices
+    completerRules.addKind("booleanSelection", choices = ["true", "false"], lowerCase = True)
+    completerRules.addKind("collisionSystemSelection", choices = ["PbPb", "pp", "pPb", "Pbp", "XeXe"])
+    completerRules.addKind("binarySelection", choices = ["0", "1"])
+    completerRules.addKind("tripletSelection", choices = ["-1", "0", "1"], multiValue = True)
+    completerRules.addKind("eventMuonSelection", choices = ["0", "1", "2"])
+    completerRules.addKind("itsMatchingSelection", choices = ["0", "1", "2", "3"])
+    
+    # Exact names are checked first
+    completerRules.addExact("runPeriods", ["cfgRunPeriods"])
+    completerRules.addExact("booleanSelection", ["cfgIsAmbiguous", "cfgFillCandidateTable", "cfgFlatTables", "cfgTPCpostCalib", "cfgUseKFVertexing", "cfgUseRemoteField", "cfgUseAbsDCA", "cfgPropToPCA"])
+    completerRules.addExact(SKIP_KIND, ["processDummy"]) # NOTE we don't need configure processDummy since we have dummy automizer
+    
+    # Possible autocompletions for DQ Framework (semi hard-coded with naming conventions, first rule wins)
+    completerRules.addContains("analysisCuts", ["Cuts"])
+    completerRules.addSuffix("mcSignals", ["Signals", "signals"])
+    completerRules.addContains("histograms", ["Histogram"])
+    completerRules.addSuffix("sels", ["BarrelSels", "MuonSels"])
+    completerRules.addContains("mixingVars", ["MixingVars"])
+    completerRules.addPattern("booleanSelection", "cfg.*QA")
+    
+    # Possible autocompletions for Common Framework
+    completerRules.addPrefix("booleanSelection", ["process"]) # NOTE This is an global definition in O2 Analysis framework, all process functions startswith "process"
+    completerRules.addExact("collisionSystemSelection", ["syst"])
+    completerRules.addExact("binarySelection", ["doVertexZeq"])
+    completerRules.addPrefix("tripletSelection", ["pid-", "est"])
+    completerRules.addExact("eventMuonSelection", ["muonSelection"])
+    completerRules.addExact("itsMatchingSelection", ["itsMatching"])
+    completerRules.addExact("booleanSelection", ["compatibilityIU", "produceFBextendedTable", "doNotCrashOnNull", "useParamCollection", "fatalOnPassNotAvailable", "doNotSwap", "debug"])
+    
+    return completerRules
+
+
+# Default rules for all run scripts
+DEFAULT_COMPLETER_RULES = getDefaultCompleterRules()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes manifests of generated configs for incremental config updates (Developer package)
+
+import hashlib
+import json
+import logging
+
+from .utils import loadJson, writeFileAtomic
+
+# Increase it if processing of task blocks in configUpdater changes (all configs are rebuilt once)
+CONFIG_MANIFEST_VERSION = 2
+
+
+def sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def getConfigManifestFileName(configFileName: str) -> str:
+    """Returns manifest file name of generated config (e.g. updatedconfigs/configAnalysisData.json.manifest)"""
+    
+    return f"{configFileName}.manifest"
+
+
+def getKeepKey(keepTasks: list, keepSubKeys: list) -> str:
+    """Returns hash of kept tasks and sub keys (generated blocks depend on them)"""
+    
+    return sha256(json.dumps([sorted(keepTasks), sorted(keepSubKeys)]).encode("utf-8"))
+
+
+def dumpConfigJson(configFileName: str, config: dict, indent = 4) -> str:
+    """Atomic JSON dump of generated config
+
+    Returns:
+        str: SHA-256 hex digest of written file
+    """
+    
+    content = json.dumps(config, indent = indent).encode("utf-8")
+    writeFileAtomic(configFileName, content)
+    return sha256(content)
+
+
+def loadConfigManifest(configFileName: str, oldConfigSha: str, keepKey: str):
+    """Loads manifest of generated config and the config itself if both are still valid
+
+    A manifest is valid if it has current version, it is created from the same old config with the same kept keys
+    and the generated config is not changed since then.
+
+    Args:
+        configFileName (str): Generated config (e.g. updatedconfigs/configAnalysisData.json)
+        oldConfigSha (str): SHA-256 hex digest of old config which is updated
+        keepKey (str): Hash of kept tasks and sub keys (see getKeepKey)
+
+    Returns:
+        tuple: Manifest and generated config, or (None, None) if they can't be used
+    """
+    
+    manifestFileName = getConfigManifestFileName(configFileName)
+    try:
+        manifest = loadJson(manifestFileName)
+        with open(configFileName, "rb") as f:
+            content = f.read()
+    except (OSError, ValueError):
+        return None, None
+    
+    if not isinstance(manifest, dict) or manifest.get("version") != CONFIG_MANIFEST_VERSION:
+        return None, None
+    if manifest.get("oldConfigSha") != oldConfigSha or manifest.get("keepKey") != keepKey:
+        return None, None
+    if manifest.get("outputSha") != sha256(content):
+        logging.info(f"{configFileName} is modified after it is generated, it will be rebuilt.")
+        return None, None
+    return manifest, json.loads(content)
+
+
+def dumpConfigManifest(configFileName: str, oldConfigSha: str, keepKey: str, outputSha: str, taskSources: dict, diff: dict) -> None:
+    """Writes manifest of generated config
+
+    Args:
+        configFileName (str): Generated config
+        oldConfigSha (str): SHA-256 hex digest of old config which is updated
+        keepKey (str): Hash of kept tasks and sub keys (see getKeepKey)
+        outputSha (str): SHA-256 hex digest of generated config
+        taskSources (dict): Task blocks of generated config with their source URL and source SHA-256 hex digest
+        diff (dict): Diff of generated config and old config (see reconcileConfigs)
+    """
+    
+    manifest = {
+        "version": CONFIG_MANIFEST_VERSION,
+        "oldConfigSha": oldConfigSha,
+        "keepKey": keepKey,
+        "outputSha": outputSha,
+        "tasks": taskSources,
+        "diff": diff
+        }
+    try:
+        writeFileAtomic(getConfigManifestFileName(configFileName), json.dumps(manifest, indent = 2).encode("utf-8"))
+    except OSError as error:
+        # Manifests are only an optimization, the next update will be a full rebuild
+        logging.warning(f"Manifest of {configFileName} could not be written: {error}")
+
+
+def getChangedTasks(manifest: dict, taskSources: dict) -> set:
+    """Returns task blocks whose source is changed, new or removed since the manifest is written
+
+    Args:
+        manifest (dict): Manifest of generated config (see loadConfigManifest)
+        taskSources (dict): Current task blocks with their source URL and source SHA-256 hex digest
+
+    Returns:
+        set: Changed task blocks
+    """
+    
+    previousTaskSources = manifest["tasks"]
+    changedTasks = {task
+                    for task, source in taskSources.items()
+                    if previousTaskSources.get(task) != source}
+    changedTasks.update(task for task in previousTaskSources if task not in taskSources)
+    return changedTasks
+
+
+def getFileSha(fileName: str) -> str:
+    """Returns SHA-256 hex digest of a file"""
+    
+    with open(fileName, "rb") as f:
+        return sha256(f.read())
@@ -15,15 +15,19 @@
 
 # This script includes setter functions for configurables (Developer package)
 
-from extramodules.dqLibGetter import DQLibGetter
-from extramodules.utils import convertListToStr, listToString, stringToList
+from extramodules.dqLibGetter import DQ_LIB_INDEX_VERSION, DQLibGetter
+from extramodules.utils import convertListToStr, dumpPickle, listToString, loadPickle, stringToList, writeFileAtomic
+from extramodules.runDirectory import RUN_DIR_ROOT_ENV, getDefaultRunDirRoot
 from extramodules.choicesHandler import ChoicesCompleterList
+from extramodules.completerRules import DEFAULT_COMPLETER_RULES, SKIP_KIND, CompleterRules
 from argcomplete.completers import ChoicesCompleter
 import logging
 from logging import handlers, RootLogger
 import sys
 import os
 import json
+import hashlib
+import pathlib
 import argparse
 import argcomplete
 
@@ -73,6 +77,60 @@ class MasterLogger(object):
         return self._logger
 
 
+class LogRecordBuffer(logging.Handler):
+    
+    """Logging handler which keeps records in memory instead of writing them. It is used in worker processes, so the
+    main process can replay log records of each job (see replay) in a deterministic order.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.records = []
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        # Make record picklable and independent from objects of worker process
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+    
+    @staticmethod
+    def install(level) -> "LogRecordBuffer":
+        """Replaces all handlers of root logger with a new buffer (e.g. in initializer of worker processes)"""
+        
+        buffer = LogRecordBuffer()
+        rootLogger = logging.getLogger()
+        for handler in list(rootLogger.handlers):
+            rootLogger.removeHandler(handler)
+        rootLogger.addHandler(buffer)
+        rootLogger.setLevel(level)
+        return buffer
+    
+    @staticmethod
+    def replay(records: list) -> None:
+        """Passes buffered records to the handlers of current process"""
+        
+        for record in records:
+            logging.getLogger(record.name).handle(record)
+
+
+def positiveFloat(value: str) -> float:
+    """Argument type of intervals (positive float)
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a positive number
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value}")
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0: {value}")
+    return number
+
+
 def dispArgs(allArgs: dict) -> None:
     """Display all configured commands you provided in CLI
 
@@ -166,7 +224,7 @@ def setConverters(allArgs: dict, updatedConfigFileName: str, commandToRun: str)
     return commandToRun
 
 
-def generateDescriptors(resfilename: str, tablesToProduce: dict, tables: dict, writerConfigFileName: str, readerConfigFileName = 'aodReaderTempConfig', kFlag = False) -> None:
+def generateDescriptors(resfilename: str, tablesToProduce: dict, tables: dict, writerConfigFileName: str, readerConfigFileName = "aodReaderTempConfig.json", kFlag = False) -> None:
     """Generates Descriptors for Writing/Reading Tables from AO2D with json config file (input descriptor is optional)
 
     Args:
@@ -205,13 +263,10 @@ def generateDescriptors(resfilename: str, tablesToProduce: dict, tables: dict, w
             iTableReader += 1
     
     # writerConfigFileName = "aodWriterTempConfig.json"
-    with open(writerConfigFileName, "w") as writerConfigFile:
-        json.dump(writerConfig, writerConfigFile, indent = 2)
+    writeFileAtomic(writerConfigFileName, json.dumps(writerConfig, indent = 2).encode("utf-8"))
     
     if kFlag is True:
-        readerConfigFileName = "aodReaderTempConfig.json"
-        with open(readerConfigFileName, "w") as readerConfigFile:
-            json.dump(readerConfig, readerConfigFile, indent = 2)
+        writeFileAtomic(readerConfigFileName, json.dumps(readerConfig, indent = 2).encode("utf-8"))
     logging.info("aodWriterTempConfig==========")
     logging.info(f"{writerConfig}")
 
@@ -358,40 +413,158 @@ def setProcessDummy(config: dict, dummyHasTasks: list) -> None:
                                 #logging.debug(" - [%s] processDummy : true", k)
 
 
-def setParallelismOnSkimming(commandToRun: str, updatedConfigFileName: str, analysisTaskName: str, analysisTaskTempConfig: str, config: dict) -> str:
-    """Setter method for activate parallel sesion run in O2
+# Argument manifest cache (bump the version if classifyConfigurable or getArgumentManifest output changes)
+ARG_MANIFEST_DIR = "templibs"
+ARG_MANIFEST_VERSION = 1
+
+
+def classifyConfigurable(configurable: str, completerRules: CompleterRules = None):
+    """Classifies a configurable to its autocompletion kind according to naming conventions in O2-DQ Framework and Common Framework
 
     Args:
-        commandToRun (str): Command To Run
-        updatedConfigFileName (str): Skimming task temp JSON config file name
-        analysisTaskName (str): Command to Run for Analysis Task in O2
-        analysisTaskTempConfig (dict): Analysis task temp JSON config file name
-        config (dict): Skimming task JSON config file
+        configurable (str): Configurable or process function name in JSON config
+        completerRules (CompleterRules, optional): Autocompletion rules. Defaults to DEFAULT_COMPLETER_RULES.
 
     Returns:
-        str: Command To Run for run analysis and skimming task at same time
+        str or None: Completer kind for configurable ("skip" if no argument is needed, None if there is no autocompletion)
     """
     
-    # save skimming task command to run string to another variable (not mandatory but more readable)
-    skimmingTaskFullCommand = commandToRun
-    
-    # open analysis temp config
-    with open(analysisTaskTempConfig) as configAnalysisTask:
-        config2 = json.load(configAnalysisTask)
+    return (completerRules or DEFAULT_COMPLETER_RULES).classify(configurable)
+
+
+def getArgumentManifest(configForParsing: dict, tasksToPassList: list, completerRules: CompleterRules = None) -> dict:
+    """Creates argument manifest from JSON config file. The manifest includes all CLI arguments with their
+    completer kinds and process function/dummy automation informations, so the parser can be built in one pass.
+
+    Args:
+        configForParsing (dict[str, dict]): JSON config file for creating CLI arguments
+        tasksToPassList (list[str]): Tasks which will not be provided as CLI arguments
+        completerRules (CompleterRules, optional): Autocompletion rules. Defaults to DEFAULT_COMPLETER_RULES.
+
+    Returns:
+        dict: Argument manifest as {"args": [[taskname:configurable, completerKind], ...], "processFuncs": dict[str, list], "dummyHasTasks": list}
+    """
     
-    # merge configs
-    mergedConfigs = {
-        **config2,
-        **config
+    manifest = {
+        "args": [],
+        "processFuncs": {},
+        "dummyHasTasks": []
         }
     
-    #save merged configs (skimming/analysis)
-    with open(updatedConfigFileName, "w") as outputFile:
-        json.dump(mergedConfigs, outputFile, indent = 2)
-    # analysisjson = "aodWriterAnalysisTempConfig.json"
-    skimmingjson = "aodWriterSkimmingTempConfig.json"
+    # Iterating in JSON config file
+    for taskname, cfgValuePair in configForParsing.items():
+        if not isinstance(cfgValuePair, dict):
+            continue
+        for configurable in cfgValuePair.keys():
+            if "process" in configurable and "Dummy" not in configurable:
+                manifest["processFuncs"].setdefault(taskname, []).append(configurable)
+            
+            # Tasks to pass
+            if taskname in tasksToPassList:
+                continue
+            
+            # Get has processDummy tasks from json
+            if configurable == "processDummy":
+                manifest["dummyHasTasks"].append(taskname)
+            
+            completerKind = classifyConfigurable(configurable, completerRules)
+            if completerKind == SKIP_KIND:
+                continue
+            manifest["args"].append([taskname + ":" + configurable, completerKind]) # Set CLI argument as --> taskname:config
+    
+    return manifest
+
+
+def getArgumentManifestFileName(cfgJsonName: str) -> str:
+    """Returns cache file name of argument manifest for JSON config file (unique per config path)"""
     
-    return f"{skimmingTaskFullCommand} | {analysisTaskName} --configuration json://{updatedConfigFileName} --aod-writer-json {skimmingjson} -b"
+    pathHash = hashlib.sha256(os.path.abspath(cfgJsonName).encode("utf-8")).hexdigest()[: 12]
+    return os.path.join(ARG_MANIFEST_DIR, f"argManifest_{pathlib.Path(cfgJsonName).stem}_{pathHash}.pickle")
+
+
+def loadArgumentManifest(cfgJsonName: str, tasksToPassList: list, completerRules: CompleterRules = None) -> dict:
+    """Loads argument manifest of JSON config file from cache. The cache is keyed by the config file hash, DQ lib index version
+    and autocompletion rules fingerprint, if it is not valid the manifest is created from JSON config file and cached.
+
+    Args:
+        cfgJsonName (str): Path to Json config file for creating CLI arguments
+        tasksToPassList (list[str]): Tasks which will not be provided as CLI arguments
+        completerRules (CompleterRules, optional): Autocompletion rules. Defaults to DEFAULT_COMPLETER_RULES.
+
+    Returns:
+        dict: Argument manifest (see getArgumentManifest)
+    """
+    
+    with open(cfgJsonName, "rb") as configFile:
+        content = configFile.read()
+    
+    completerRules = completerRules or DEFAULT_COMPLETER_RULES
+    manifestKey = [ARG_MANIFEST_VERSION, DQ_LIB_INDEX_VERSION, completerRules.fingerprint(), hashlib.sha256(content).hexdigest(), sorted(tasksToPassList)]
+    manifestFileName = getArgumentManifestFileName(cfgJsonName)
+    
+    cachedManifest = loadPickle(manifestFileName)
+    if isinstance(cachedManifest, dict) and cachedManifest.get("key") == manifestKey:
+        return cachedManifest["manifest"]
+    
+    manifest = getArgumentManifest(json.loads(content), tasksToPassList, completerRules)
+    if os.path.isdir(ARG_MANIFEST_DIR):
+        dumpPickle(manifestFileName, {
+            "key": manifestKey,
+            "manifest": manifest
+            })
+    return manifest
+
+
+def getArgsToComplete(args: list, compLine: str, compPoint: int):
+    """Fast path for TAB autocompletion. It selects only the JSON arguments which are needed for completing the command line.
+
+    Args:
+        args (list[list]): Arguments and completer kinds from argument manifest
+        compLine (str): Command line which is being completed (COMP_LINE)
+        compPoint (int): Cursor position in command line (COMP_POINT)
+
+    Returns:
+        tuple[list, bool]: Arguments to register and whether completers are needed
+    """
+    
+    cwordPrequote, cwordPrefix, cwordSuffix, compWords, lastWordbreakPos = argcomplete.split_line(compLine, compPoint)
+    
+    if cwordPrefix.startswith("-"):
+        # Option names are completed, only names are needed without completers
+        if "=" not in cwordPrefix:
+            return args, False
+        # Parameter of an option is completed in the same word (--option=value)
+        return findArgsOfOption(args, cwordPrefix), True
+    
+    # Parameter of an option is completed, find the last provided option
+    for word in reversed(compWords):
+        if word.startswith("-"):
+            # --option=value takes its parameter in the same word, next words are not its parameters
+            if "=" in word:
+                return [], False
+            return findArgsOfOption(args, word), True
+    return [], False
+
+
+def findArgsOfOption(args: list, optionString: str) -> list:
+    """Finds the argument of an option string in argument manifest as argparse resolves it: exact name first,
+    otherwise unique prefix of a name (abbreviation, allow_abbrev). The value of --option=value is split off.
+
+    Args:
+        args (list[list]): Arguments and completer kinds from argument manifest
+        optionString (str): Option string from command line (e.g. --table-maker:cfgQA, --table-maker:cfgQ=true)
+
+    Returns:
+        list[list]: Matched argument (empty if there is no match or the abbreviation is ambiguous)
+    """
+    
+    optionString = optionString.split("=", 1)[0]
+    exactArgs = [arg for arg in args if "--" + arg[0] == optionString]
+    if exactArgs or not optionString.startswith("--") or len(optionString) == 2:
+        return exactArgs
+    
+    prefixArgs = [arg for arg in args if ("--" + arg[0]).startswith(optionString)]
+    return prefixArgs if len(prefixArgs) == 1 else []
 
 
 class SetArgsToArgumentParser(object):
@@ -404,59 +577,43 @@ class SetArgsToArgumentParser(object):
         parser (object): For getting args from ArgumentParser
         dummyHasTasks (Optional, list[str]): If there are tasks with processDummy in the json, it will save them to the list (for dummy automizer)
         processFuncs: (dict[str, list]): Creating task-processFunctions dependency tree for automations
+        completerRules (Optional, CompleterRules): Autocompletion rules for JSON configurables, run scripts can extend a copy of default rules (getDefaultCompleterRules)
         
     """
     
-    def __init__(self, cfgJsonName: str, tasksToPassList: list, parser = None, dummyHasTasks: list = [], processFuncs: dict = {}) -> None:
+    def __init__(self, cfgJsonName: str, tasksToPassList: list, parser = None, dummyHasTasks: list = [], processFuncs: dict = {}, completerRules: CompleterRules = None) -> None:
         
         self.cfgJsonName = cfgJsonName
         self.tasksToPassList = list(tasksToPassList)
         self.parser = argparse.ArgumentParser(description = 'Arguments to pass', formatter_class = argparse.ArgumentDefaultsHelpFormatter)
         self.dummyHasTasks = dummyHasTasks
         self.processFuncs = processFuncs
+        self.completerRules = completerRules or DEFAULT_COMPLETER_RULES
         
-        # Load the configuration file for creating parser args (hard coded)
-        configForParsing = {}
-        with open(cfgJsonName) as configFile:
-            configForParsing = json.load(configFile)
+        # Load the argument manifest of configuration file for creating parser args (from cache if config is not changed)
+        # list for save all arguments with completer kinds (template --> taskname:configuration)
+        manifest = loadArgumentManifest(cfgJsonName, self.tasksToPassList, self.completerRules)
+        for taskname, processFuncList in manifest["processFuncs"].items():
+            self.processFuncs.setdefault(taskname, []).extend(processFuncList)
+        self.dummyHasTasks.extend(manifest["dummyHasTasks"])
         
-        # Dependency injection
-        dqLibGetter = DQLibGetter()
+        # Fast path for TAB autocompletion: register only needed arguments
+        argsToRegister = manifest["args"]
+        withCompleters = True
+        if "_ARGCOMPLETE" in os.environ:
+            argsToRegister, withCompleters = getArgsToComplete(argsToRegister, os.environ.get("COMP_LINE", ""), int(os.environ.get("COMP_POINT", 0)))
         
-        # Get All Configurables for DQ Framework from DQ header files
-        allAnalysisCuts = dqLibGetter.allAnalysisCuts
-        allMCSignals = dqLibGetter.allMCSignals
-        allSels = dqLibGetter.allSels
-        allMixing = dqLibGetter.allMixing
-        allRunPeriods = dqLibGetter.allLHCPeriods
+        # Dependency injection (DQ libraries are needed only for their completers)
+        dqLibGetter = None
+        if withCompleters and any(self.completerRules.needsDQLibs(completerKind) for arg, completerKind in argsToRegister):
+            dqLibGetter = DQLibGetter()
         
-        # Get all histogram groups for DQ Framework from histogram library
-        # NOTE Now we use only all histos for backward comp.
-        allHistos = dqLibGetter.allHistos
-        # allEventHistos = dqLibGetter.allEventHistos
-        # allTrackHistos = dqLibGetter.allTrackHistos
-        # allMCTruthHistos = dqLibGetter.allMCTruthHistos
-        # allPairHistos = dqLibGetter.allPairHistos
-        # allDileptonHistos = dqLibGetter.allDileptonHistos
+        completers = self.getCompleters(argsToRegister, dqLibGetter) if withCompleters else {}
         
         # Predefined lists for autocompletion
         booleanSelections = ["true", "false"]
-        itsMatchingSelections = ["0", "1", "2", "3"]
-        binarySelection = ["0", "1"]
-        tripletSelection = ["-1", "0", "1"]
-        collisionSystemSelections = ["PbPb", "pp", "pPb", "Pbp", "XeXe"]
-        eventMuonSelections = ["0", "1", "2"]
         debugLevelSelectionsList = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         
-        # list for save all arguments (template --> taskname:configuration)
-        arglist = []
-        
-        # Iterating in JSON config file
-        for task, cfgValuePair in configForParsing.items():
-            if isinstance(cfgValuePair, dict):
-                for argument in cfgValuePair.keys():
-                    arglist.append(task + ":" + argument) # Set CLI argument as --> taskname:config
-        
         # We can define hard coded global arguments
         self.parser.add_argument("cfgFileName", metavar = "Config.json", default = "config.json", help = "config JSON file name (mandatory)")
         self.parser.add_argument("-runParallel", help = "Run parallel in session", action = "store_true", default = False)
@@ -466,6 +623,11 @@ class SetArgsToArgumentParser(object):
         groupGlobal.add_argument("--aod-memory-rate-limit", help = "Rate limit AOD processing based on memory", action = "store", type = str)
         groupGlobal.add_argument("--writer", help = "Argument for producing extra reduced tables", action = "store", type = str).completer = ChoicesCompleter(booleanSelections)
         groupGlobal.add_argument("--helpO2", help = "Display help message on O2", action = "store_true", default = False)
+        groupGlobal.add_argument("--shards", help = "Split AO2D text list (@list.txt) into shards and run one workflow per shard in its own work directory, then merge their outputs", action = "store", type = int, default = 1)
+        groupGlobal.add_argument("--min-shard-size", help = "Minimum size of a shard in MB, AO2D files are packed into fewer shards if they are small", action = "store", type = float, default = 256)
+        groupGlobal.add_argument("--shard-plan", help = "Reuse shard plan JSON of a previous sharded run (shardPlan.json in its shard work directory)", action = "store", type = str).completer = argcomplete.completers.FilesCompleter()
+        groupGlobal.add_argument("--max-parallel", help = "Maximum number of shards running at the same time (defaults to number of CPUs)", action = "store", type = int)
+        groupGlobal.add_argument("--merge-command", help = "Merge command for shard outputs as FILE=COMMAND with {output}, {inputs} and {inputList} placeholders (e.g. AnalysisResults.root='hadd -f {output} {inputs}')", action = "append", type = str, metavar = "FILE=COMMAND")
         
         # Converter Task Options
         groupO2Converters = self.parser.add_argument_group(title = "Add to workflow O2 Converter task options")
@@ -480,109 +642,40 @@ class SetArgsToArgumentParser(object):
         groupHelper.add_argument("--debug", help = "execute with debug options", action = "store", type = str.upper, default = "INFO", choices = debugLevelSelectionsList,).completer = ChoicesCompleterList(debugLevelSelectionsList)
         groupHelper.add_argument("--logFile", help = "Enable logger for both file and CLI", action = "store_true")
         groupHelper.add_argument("--override", help = "If true JSON Overrider Interface If false JSON Additional Interface", action = "store", default = "true", type = str.lower, choices = booleanSelections,).completer = ChoicesCompleter(booleanSelections)
+        groupHelper.add_argument("--validate-aod", help = "Check every AO2D file of text list (@list.txt) before workflow runs (existence, size and ROOT header)", action = "store_true")
+        groupHelper.add_argument("--cleaned-aod-list", help = "Validate AO2D text list and write a list without bad and duplicate entries, workflow runs over the cleaned list", action = "store", type = str)
+        groupHelper.add_argument("--monitor", help = "Sample CPU, RSS, PSS, /dev/shm usage and I/O of every workflow process and write a time series and a per-device summary", action = "store_true")
+        groupHelper.add_argument("--monitor-interval", help = "Sampling interval of --monitor in seconds", action = "store", type = positiveFloat, default = 1.0)
+        groupHelper.add_argument("--monitor-format", help = "Time series format of --monitor", action = "store", type = str, default = "csv", choices = ["csv", "jsonl"]).completer = ChoicesCompleter(["csv", "jsonl"])
+        groupHelper.add_argument("--run-dir-root", help = f"Create a unique work directory under this root for temp configs, descriptors and logs of this run (also ${RUN_DIR_ROOT_ENV}). If not set, they are written to current directory", action = "store", type = str, default = getDefaultRunDirRoot()).completer = argcomplete.completers.DirectoriesCompleter()
         
         # Create argument group for iterating json options
         groupJsonParser = self.parser.add_argument_group(title = "JSON configuration options")
         
         # save args to parser(template --> --taskname:config)
-        for arg in arglist:
-            # seperate the template to list --> taskname:config to [taskname, configurable]
-            seperatedArg = stringToList(arg, ":")
-            configurable: str = seperatedArg[1] # configurable as second index
-            taskname: str = seperatedArg[0] # taskname as first index
-            if "process" in configurable and "Dummy" not in configurable:
-                self.processFuncs.setdefault(taskname, []).append(configurable)
-            
-            # Tasks to pass
-            if taskname in tasksToPassList:
-                continue
-            
-            # Get has processDummy tasks from json
-            if configurable == "processDummy":
-                self.dummyHasTasks.append(taskname)
-            
-            # We may define posible all autocompletions as semi hard-coded with substring search (according to naming conventions)
-            # Define some autocompletion rules for match-case (for O2-DQ Framework)
-            containsCuts = "Cuts" in configurable
-            containsSignals = configurable.endswith("Signals") or configurable.endswith("signals")
-            containsHistogram = "Histogram" in configurable
-            containsSels = configurable.endswith("BarrelSels") or configurable.endswith("MuonSels")
-            containsMixingVars = "MixingVars" in configurable
-            containsQA = configurable.startswith("cfg") and "QA" in configurable
-            containsAmbiguous = configurable == "cfgIsAmbiguous"
-            containsFillCandidateTable = configurable == "cfgFillCandidateTable"
-            containsFlatTables = configurable == "cfgFlatTables"
-            containsUseKFVertexing = configurable == "cfgUseKFVertexing"
-            containsUseRemoteField = configurable == "cfgUseRemoteField"
-            containsUseAbsDCA = configurable == "cfgUseAbsDCA"
-            containsPropToPCA = configurable == "cfgPropToPCA"
-            containsTPCpostCalib = configurable == "cfgTPCpostCalib"
-            containsRunPeriods = configurable == "cfgRunPeriods"
-            containsProcess = configurable.startswith("process")
-            
-            # Create arguments with possible autocompletions for DQ Framework
-            if containsCuts:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", nargs = "*", type = str, metavar = "\b").completer = ChoicesCompleterList(allAnalysisCuts)
-            elif containsSignals:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", nargs = "*", type = str, metavar = "\b").completer = ChoicesCompleterList(allMCSignals)
-            elif containsRunPeriods:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", nargs = "*", type = str, metavar = "\b").completer = ChoicesCompleterList(allRunPeriods)
-            elif containsHistogram:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", nargs = "*", type = str, metavar = "\b").completer = ChoicesCompleterList(allHistos)
-            elif containsSels:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", nargs = "*", type = str, metavar = "\b").completer = ChoicesCompleterList(allSels)
-            elif containsMixingVars:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", nargs = "*", type = str, metavar = "\b").completer = ChoicesCompleterList(allMixing)
-            elif containsQA:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif containsAmbiguous:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif containsFillCandidateTable:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif containsFlatTables:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif containsTPCpostCalib:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif containsUseKFVertexing:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif containsUseRemoteField:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif containsUseAbsDCA:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif containsPropToPCA:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif configurable == "processDummy": # NOTE we don't need configure processDummy since we have dummy automizer
-                continue
-            
-            # Create arguments with possible autocompletions for Common Framework
-            elif containsProcess: # NOTE This is an global definition in O2 Analysis framework, all process functions startswith "process"
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif configurable == "syst":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str, metavar = "\b").completer = ChoicesCompleter(collisionSystemSelections)
-            elif configurable == "doVertexZeq":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str, metavar = "\b").completer = ChoicesCompleter(binarySelection)
-            elif configurable.startswith("pid-") or configurable.startswith("est"):
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", nargs = "*", type = str, metavar = "\b").completer = ChoicesCompleterList(tripletSelection)
-            elif configurable == "muonSelection":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str, metavar = "\b").completer = ChoicesCompleter(eventMuonSelections)
-            elif configurable == "itsMatching":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str, metavar = "\b").completer = ChoicesCompleter(itsMatchingSelections)
-            elif configurable == "compatibilityIU":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif configurable == "produceFBextendedTable":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif configurable == "doNotCrashOnNull":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif configurable == "useParamCollection":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif configurable == "fatalOnPassNotAvailable":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif configurable == "doNotSwap":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            elif configurable == "debug":
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str.lower, metavar = "\b").completer = ChoicesCompleter(booleanSelections)
-            else:
-                groupJsonParser.add_argument("--" + arg, help = "", action = "store", type = str, metavar = "\b") # Create other arguments without autocompletion
+        for arg, completerKind in argsToRegister:
+            nargs = "*" if self.completerRules.isMultiValue(completerKind) else None
+            argType = str.lower if self.completerRules.isLowerCase(completerKind) else str
+            argument = groupJsonParser.add_argument("--" + arg, help = "", action = "store", nargs = nargs, type = argType, metavar = "\b")
+            if completers.get(completerKind) is not None:
+                argument.completer = completers[completerKind]
+    
+    def getCompleters(self, argsToRegister: list, dqLibGetter: DQLibGetter = None) -> dict:
+        """Creates one completer for each completer kind of arguments (completers are shared by arguments)
+
+        Args:
+            argsToRegister (list[list]): Arguments and completer kinds from argument manifest
+            dqLibGetter (DQLibGetter, optional): DQ lib getter for analysis selections. If None, completers for DQ libraries are not created.
+
+        Returns:
+            dict: Completer kinds with completers
+        """
+        
+        completers = {}
+        for arg, completerKind in argsToRegister:
+            if completerKind is not None and completerKind not in completers:
+                completers[completerKind] = self.completerRules.getCompleter(completerKind, dqLibGetter)
+        return completers
     
     def parseArgs(self, testString = None):
         """
@@ -17,61 +17,241 @@
 # \Interface:  cevat.batuhan.tolon@cern.ch
 
 from extramodules.regexPatterns import RegexPatterns
-from collections import OrderedDict
+from extramodules.dqExceptions import DownloadError, SourceFileNotFoundError
+from extramodules.httpFetcher import HttpFetcher
+from extramodules.utils import iterMappedLines
+from collections import OrderedDict, namedtuple
+from urllib.parse import urlsplit
+import hashlib
 import logging
-from urllib.request import Request, urlopen
-import urllib
-import ssl
+import os
 import re
-import sys
+
+
+# Kinds of merge conflicts
+VALUE_CONFLICT = "value" # both values are not dicts and they differ, value of first config is kept
+TYPE_CONFLICT = "type" # only one of values is a dict, the dict is kept
+
+MergeConflict = namedtuple("MergeConflict", ["path", "kind", "value1", "value2"])
 
 
 class ConfigMerger:
     
-    def __init__(self, config1: dict, config2: dict):
+    """
+    Merges two JSON configs in one iterative traversal (no recursion, so deep configs can't exceed the recursion limit).
+    The merged config is computed once in the constructor, mergeConfigs returns it without merging again.
+    
+    Args:
+        config1 (dict): First config, its values and key order are preserved.
+        config2 (dict): Second config, its keys which are not in first config are added.
+        shareUnchanged (bool, optional): Copy-on-write mode. Sub-dicts which are not changed by the second config are
+            shared with first config instead of copied, so the merged config must not be modified in place. Defaults to False.
+    
+    Attributes:
+        mergedConfig (dict): The merged config.
+        conflicts (list[MergeConflict]): Structured merge-conflict report (path of keys, kind, value in config1 and config2).
+    """
+    
+    def __init__(self, config1: dict, config2: dict, shareUnchanged = False):
         self.config1 = config1
         self.config2 = config2
-        self.mergedConfig = self.mergeConfigs()
+        self.shareUnchanged = shareUnchanged
+        self.conflicts = []
+        self.mergedConfig = self.traverse()
     
     def mergeConfigs(self, showWarnings = False) -> dict:
         """
         Merges two JSON configs, updating the first dict with values from the second dict. If a key is present in both dicts,
-        the value from the second dict will be used. If a key is present only in the second dict, it will be added to the first
-        dict.
+        the value from the first dict will be used (except a dict in second dict replaces a non-dict value). If a key is
+        present only in the second dict, it will be added to the first dict.
 
         :return: The merged JSON config.
         """
-        # Create a new ordered dictionary to hold the merged configuration
-        mergedConfig = OrderedDict()
         
-        # Add all keys from config1 to the merged configuration, preserving their order
-        for key, value in self.config1.items():
-            if isinstance(value, dict):
-                # If the value is a dictionary, recursively merge it with the corresponding value from config2
-                if key in self.config2 and isinstance(self.config2[key], dict):
-                    mergedConfig[key] = ConfigMerger(value, self.config2[key]).mergedConfig
+        if showWarnings:
+            for conflict in self.conflicts:
+                logging.warning(f"'{'/'.join(conflict.path)}' has different values in the two configs: '{conflict.value2}' vs '{conflict.value1}'")
+        return self.mergedConfig
+    
+    def traverse(self) -> dict:
+        """Merges configs depth-first with an explicit stack and collects merge conflicts"""
+        
+        conflicts = self.conflicts
+        shareUnchanged = self.shareUnchanged
+        mergedConfig = None
+        
+        # frame: [dict1, dict2, path, remaining items of dict1, merged dict, isChanged]
+        stack = [[self.config1, self.config2, (), iter(self.config1.items()), OrderedDict(), False]]
+        while stack:
+            frame = stack[-1]
+            dict1, dict2, path, items, merged = frame[:5]
+            for key, value1 in items:
+                if key not in dict2:
+                    merged[key] = value1
+                    continue
+                value2 = dict2[key]
+                isDict1 = isinstance(value1, dict)
+                isDict2 = isinstance(value2, dict)
+                if isDict1 and isDict2:
+                    # Merge sub-dicts before continuing with this dict (placeholder keeps key order)
+                    merged[key] = value1
+                    stack.append([value1, value2, path + (key, ), iter(value1.items()), OrderedDict(), False])
+                    break
+                if isDict2:
+                    merged[key] = value2
+                    frame[5] = True
+                    conflicts.append(MergeConflict(path + (key, ), TYPE_CONFLICT, value1, value2))
                 else:
-                    mergedConfig[key] = value
+                    merged[key] = value1
+                    if isDict1 or value1 != value2:
+                        conflicts.append(MergeConflict(path + (key, ), TYPE_CONFLICT if isDict1 else VALUE_CONFLICT, value1, value2))
             else:
-                # Otherwise, use the value from config1
-                mergedConfig[key] = value
+                # All keys of dict1 are merged, add keys which are only in dict2
+                for key, value2 in dict2.items():
+                    if key not in dict1:
+                        merged[key] = value2
+                        frame[5] = True
+                stack.pop()
+                result = dict1 if shareUnchanged and not frame[5] else merged
+                if stack:
+                    parent = stack[-1]
+                    parent[4][path[-1]] = result
+                    if result is not dict1:
+                        parent[5] = True
+                else:
+                    mergedConfig = result
+        return mergedConfig
+    
+    def getConflictReport(self) -> list:
+        """Returns merge conflicts as JSON serializable list"""
+        
+        return [{
+            "path": list(conflict.path),
+            "kind": conflict.kind,
+            "config1Value": conflict.value1,
+            "config2Value": conflict.value2
+            } for conflict in self.conflicts]
+
+
+# Path of file in O2Physics repository from github URL (e.g. .../O2Physics/blob/master/PWGDQ/Tasks/dqFlow.cxx?raw=true)
+O2PHYSICS_BLOB_REGEX = re.compile(r"/O2Physics/blob/[^/]+/(?P<path>[^?#]+)")
+
+
+def getLocalSourcePath(url: str, sourceDir: str) -> str:
+    """Maps O2Physics github URL of a task (e.g. DQTasksUrlEnum.DQ_FLOW.value) to its path in local O2Physics checkout
+
+    Args:
+        url (str): github URL of source file
+        sourceDir (str): Root directory of local O2Physics checkout
+
+    Returns:
+        str: Path of source file in local checkout (URL itself if it is not an O2Physics github URL)
+    """
+    
+    match = O2PHYSICS_BLOB_REGEX.search(url)
+    if match is None:
+        return url
+    return os.path.join(sourceDir, *match.group("path").split("/"))
+
+
+class O2SourceCache(object):
+    
+    """Per-session cache of parsed O2Physics source files. Each unique URL is downloaded and parsed only once in a session.
+    Missing files are streamed concurrently and each file is parsed line by line while its bytes arrive, so parsing
+    overlaps with network wait and workflows with common dependencies share the parsed sources.
+    
+    If a local O2Physics checkout is given, github URLs are mapped to files in the checkout and they are read
+    with memory mapping, so no network is needed.
+
+    Args:
+        timeout (float, optional): Timeout in seconds for each file. Defaults to 60.
+        maxWorkers (int, optional): Maximum number of concurrent downloads. Defaults to 16.
+        sourceDir (str, optional): Root directory of local O2Physics checkout (offline mode). Defaults to None.
+        parsedSources (dict, optional): Already parsed sources (e.g. from getParsedSources of another cache). Defaults to None.
+        sourceHashes (dict, optional): SHA-256 hex digests of already parsed sources (see getSourceHashes). Defaults to None.
+    """
+    
+    def __init__(self, timeout: float = 60, maxWorkers: int = 16, sourceDir: str = None, parsedSources: dict = None, sourceHashes: dict = None):
+        self.parsedSources = dict(parsedSources or {})
+        self.sourceHashes = dict(sourceHashes or {})
+        self.sourceDir = sourceDir
+        self.fetcher = HttpFetcher(timeout = timeout, maxWorkers = maxWorkers)
+    
+    def prefetch(self, urls) -> None:
+        """Streams and parses all URLs which are not in cache concurrently
+
+        Args:
+            urls (iterable[str]): URLs (or local paths) of source files (duplicates are parsed once)
+
+        Raises:
+            DownloadError: If one of source files could not be downloaded
+            SourceFileNotFoundError: If one of source files is not found in local O2Physics checkout
+        """
+        
+        missingUrls = {url: url for url in urls if url not in self.parsedSources}
+        if not missingUrls:
+            return
+        self.parsedSources.update(self.fetcher.mapConcurrent(self.parseSource, missingUrls))
+        if self.sourceDir is not None:
+            logging.info(f"{len(missingUrls)} O2Physics source files parsed from {self.sourceDir}.")
+        else:
+            logging.info(f"{len(missingUrls)} O2Physics source files downloaded and parsed.")
+    
+    def iterSourceLines(self, url: str):
+        """Yields decoded lines of source file from a streaming HTTP response or a memory-mapped local file"""
+        
+        path = url if self.sourceDir is None else getLocalSourcePath(url, self.sourceDir)
+        if urlsplit(path).scheme in ("http", "https"):
+            for line in self.fetcher.iterLines(path):
+                yield line.decode("utf-8") # lines end with newline, so multi-byte characters are never splitted
+            return
+        try:
+            yield from iterMappedLines(path)
+        except FileNotFoundError:
+            if path != url:
+                raise SourceFileNotFoundError(url, path)
+            raise DownloadError(url, "file not found")
+        except OSError as error:
+            raise DownloadError(path, error.strerror)
+    
+    def parseSource(self, url: str) -> list:
+        """Parses source file incrementally while it is streamed (see configurableSelectorWithRegex) and keeps its hash"""
         
-        # Add any keys from config2 that are not already in the merged configuration
-        for key, value in self.config2.items():
-            if key not in mergedConfig:
-                mergedConfig[key] = value
-            elif isinstance(value, dict) and isinstance(mergedConfig[key], dict):
-                # If both values are dictionaries, recursively merge them
-                mergedConfig[key] = ConfigMerger(mergedConfig[key], value).mergedConfig
-            elif isinstance(value, dict) and not isinstance(mergedConfig[key], dict):
-                # If the value in config1 is not a dictionary but the value in config2 is, then overwrite it with the value from config2
-                mergedConfig[key] = value
-            elif value != mergedConfig[key] and showWarnings is True:
-                # If both values are not dictionaries and they differ, print a warning
-                logging.warning(f"'{key}' has different values in the two configs: '{value}' vs '{mergedConfig[key]}'")
+        sourceHash = hashlib.sha256()
         
-        # Return the merged configuration
-        return mergedConfig
+        def iterHashedLines():
+            for line in self.iterSourceLines(url):
+                sourceHash.update(line.encode("utf-8"))
+                yield line
+        
+        parsedSource = configurableSelectorWithRegex(iterHashedLines())
+        self.sourceHashes[url] = sourceHash.hexdigest()
+        return parsedSource
+    
+    def get(self, url: str) -> list:
+        """Returns parsed structs of source file (downloads and parses it if it is not in cache)"""
+        
+        if url not in self.parsedSources:
+            self.prefetch([url])
+        return self.parsedSources[url]
+    
+    def getParsedSources(self, urls) -> dict:
+        """Returns picklable URLs with parsed structs, e.g. for passing sources to worker processes"""
+        
+        return {url: self.get(url)
+                for url in urls}
+    
+    def getSourceHashes(self, urls) -> dict:
+        """Returns URLs with SHA-256 hex digests of source files"""
+        
+        return {url: self.sourceHashes[url]
+                for url in urls
+                if url in self.sourceHashes}
+    
+    def close(self) -> None:
+        """Closes keep-alive connections"""
+        
+        self.fetcher.close()
 
 
 def defaultValueHandler(dataType, defaultValue):
@@ -159,47 +339,23 @@ def listToDict(lst):
     return d
 
 
-def newAddedConfigsReport(dict1: dict, dict2: dict):
+def newAddedConfigsReport(diff: dict) -> None:
     """
-    Generates a report of new configurations added to a task.
-
-    Given two dictionaries `dict1` and `dict2`, where `dict1` represents the previous configuration
-    of a task and `dict2` represents the current configuration, this function compares the two
-    dictionaries and returns a list of tuples representing new configurations added to the task.
+    Logs new tasks and new configurables/process functions of a reconcile diff (see reconcileConfigs).
 
     Args:
-        dict1 (dict): The previous configuration of the task.
-        dict2 (dict): The current configuration of the task.
-
-    Returns:
-        List[Tuple[str, Optional[None]]]: A list of tuples representing new configurations added
-        to the task. Each tuple contains the name of the configuration key and a value of `None`.
+        diff (dict): Reconcile diff with "newTasks" and "newConfigs".
     """
-    extra = []
-    extraKeys = None
-    extraParrentKeys = set(dict1.keys() - dict2.keys())
-    if len(extraParrentKeys) > 0:
-        for key, value in dict1.items():
-            if key in extraParrentKeys and isinstance(value, dict):
-                logging.info(f"New Task: [{key}]")
-                for k,v in value.items():
-                    logging.info(f"{k} : {v}")
-                    
-    for key, value in dict1.items():
-        if key in dict2:
-            subDict1 = dict1[key]
-            subDict2 = dict2[key]
-            if isinstance(subDict1, dict) and isinstance(subDict2, dict):
-                extraKeys = set(subDict1.keys()) - set(subDict2.keys())
-            if extraKeys and isinstance(value, dict):
-                logging.info(f"New Added Configs to Task: [{key}]")
-                for i in list(extraKeys):
-                    configurable = i
-                    defaultValue = dict1.get(key).get(i)
-                    logging.info(f"{configurable} : {defaultValue}")
-        else:
-            extra.append((key, None))
-    return extra
+    
+    for task, block in diff["newTasks"].items():
+        logging.info(f"New Task: [{task}]")
+        for configurable, defaultValue in block.items():
+            logging.info(f"{configurable} : {defaultValue}")
+    
+    for task, newConfigs in diff["newConfigs"].items():
+        logging.info(f"New Added Configs to Task: [{task}]")
+        for configurable, defaultValue in newConfigs.items():
+            logging.info(f"{configurable} : {defaultValue}")
 
 
 def transformTaskname(inputStr: str) -> str:
@@ -373,14 +529,35 @@ def rawAdaptiveTaskProcessor(rawData):
     return buffer
 
 
+# Precompiled patterns of source scanner
+CONFIGURABLE_REGEX = re.compile(RegexPatterns.CONFIGURABLE_PATTERN.value)
+PROCESS_SWITCH_REGEX = re.compile(RegexPatterns.PROCESS_SWITCH_PATTERN.value)
+ADAPT_ANALYSIS_TASK_REGEX = re.compile(RegexPatterns.ADAPT_ANALYSIS_TASK_PATTERN.value)
+
+# Maximum number of lines for a multi-line Configurable declaration
+MAX_CONFIGURABLE_LINES = 8
+
+
+def isStatementStart(line: str) -> bool:
+    """Returns True if stripped line starts a statement which is scanned (used for ending multi-line Configurable declarations)"""
+    
+    return line.startswith("struct") or line.startswith("Configurable<") or line.startswith("PROCESS_SWITCH") or "adaptAnalysisTask" in line
+
 
 def configurableSelectorWithRegex(file):
     """
     Extract configurable values from a file using regular expressions and return a list of dictionaries containing
     these values for each struct in the file.
     
+    The file can be given as a string or as an iterable of lines (a streaming HTTP response, an opened local file or
+    a cached blob), so lines are parsed incrementally as they arrive and the whole file is never needed in memory.
+    
+    The file is scanned in one pass. Regex patterns are precompiled and they are applied only to lines which contain
+    one of keywords (Configurable<, PROCESS_SWITCH, adaptAnalysisTask, struct). Configurable declarations which
+    are splitted into multiple lines are joined before matching.
+    
     Args:
-    - file (str): The file to extract configurable values from.
+    - file (str or Iterable[str]): The file content or lines of file to extract configurable values from.
     
     Returns:
     - List[Dict]: A list of dictionaries, where each dictionary represents a struct and contains the following keys:
@@ -405,17 +582,28 @@ def configurableSelectorWithRegex(file):
     """
     
     configurableValues = []
+    isDebug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    pendingConfigurable = [] # lines of multi-line Configurable declaration
     
-    # All Regex Patterns we need
-    CONFIGURABLE_PATTERN = RegexPatterns.CONFIGURABLE_PATTERN.value
-    PROCESS_SWITCH_PATTERN = RegexPatterns.PROCESS_SWITCH_PATTERN.value
-    ADAPT_ANALYSIS_TASK_PATTERN = RegexPatterns.ADAPT_ANALYSIS_TASK_PATTERN.value
-    
-    # split file with escape char
-    lines = file.split("\n")
+    # split file with escape char (iterables of lines are consumed lazily)
+    lines = file.split("\n") if isinstance(file, str) else file
     
     for line in lines:
         line = line.strip()
+        
+        # Continue multi-line Configurable declaration until it ends with semicolon
+        if pendingConfigurable:
+            if not isStatementStart(line):
+                pendingConfigurable.append(line)
+                if ";" not in line and len(pendingConfigurable) < MAX_CONFIGURABLE_LINES:
+                    continue
+                configurableMatch = CONFIGURABLE_REGEX.match(" ".join(pendingConfigurable))
+                pendingConfigurable = []
+                if configurableMatch:
+                    addConfigurableMatch(configurableValues, configurableMatch, isDebug)
+                continue
+            pendingConfigurable = [] # declaration is not completed, scan line as a new statement
+        
         # Check if the line starts with "struct" to identify a new struct
         if line.startswith("struct"):
             structName = line.split()[1]
@@ -426,46 +614,32 @@ def configurableSelectorWithRegex(file):
                 "processFunc": [],
                 "adaptAnalysisTask": []
                 })
-        else:
-            # Otherwise, try to extract the configurable values using the regex pattern
-            configurableMatch = re.match(CONFIGURABLE_PATTERN, line)
-            processSwitchMatch = re.match(PROCESS_SWITCH_PATTERN, line)
-            adaptAnalysisTaskMatch = re.findall(ADAPT_ANALYSIS_TASK_PATTERN, line)
-            
+            continue
+        
+        # Otherwise, try to extract the values using the regex patterns (only if line has keyword of pattern)
+        if "Configurable<" in line:
+            configurableMatch = CONFIGURABLE_REGEX.match(line)
             if configurableMatch:
-                # Extract the values from the regex match
-                dataType = configurableMatch.group(1)
-                variableName = configurableMatch.group(2)
-                configName = configurableMatch.group(3)
-                defaultValue = configurableMatch.group(4)
-                defaultValue = defaultValueHandler(dataType, defaultValue)
-                description = configurableMatch.group(7)
-                logging.debug("==Configurable Match==")
-                logging.debug(f"dataType: {dataType} | group 1")
-                logging.debug(f"variableName: {variableName} | group 2")
-                logging.debug(f"configName: {configName} | group 3")
-                logging.debug(f"defaultValue: {defaultValue} | group 4")
-                logging.debug(f"description: {description} | group 7")
-                # Add the extracted values to the current struct's dictionary
-                if "epoch" not in defaultValue:
-                    configurableValues[-1]["configurables"].append({
-                        "dataType": dataType,
-                        "variableName": variableName,
-                        "defaultValue": defaultValue,
-                        "configName": configName,
-                        "description": description
-                        })
-            elif processSwitchMatch:
+                addConfigurableMatch(configurableValues, configurableMatch, isDebug)
+                continue
+            if line.startswith("Configurable<") and ";" not in line:
+                pendingConfigurable = [line]
+                continue
+        
+        if "PROCESS_SWITCH" in line:
+            processSwitchMatch = PROCESS_SWITCH_REGEX.match(line)
+            if processSwitchMatch:
                 # Extract the values from the regex match
                 taskName = processSwitchMatch.group(1)
                 processFunc = processSwitchMatch.group(2)
                 processFuncDesc = processSwitchMatch.group(3)
                 processFuncDefaultValue = processSwitchMatch.group(4)
-                logging.debug("==processSwitchMatch==")
-                logging.debug(f"taskName: {taskName} | group 1")
-                logging.debug(f"processFunc: {processFunc} | group 2")
-                logging.debug(f"processFuncDesc: {processFuncDesc} | group 3")
-                logging.debug(f"processFuncDefaultValue: {processFuncDefaultValue} | group 4")
+                if isDebug:
+                    logging.debug("==processSwitchMatch==")
+                    logging.debug(f"taskName: {taskName} | group 1")
+                    logging.debug(f"processFunc: {processFunc} | group 2")
+                    logging.debug(f"processFuncDesc: {processFuncDesc} | group 3")
+                    logging.debug(f"processFuncDefaultValue: {processFuncDefaultValue} | group 4")
                 # Add the extracted values to the current struct's dictionary
                 configurableValues[-1]["processFunc"].append({
                     "taskName": taskName,
@@ -473,87 +647,188 @@ def configurableSelectorWithRegex(file):
                     "processFuncDesc": processFuncDesc,
                     "processFuncDefaultValue": processFuncDefaultValue,
                     })
-            elif adaptAnalysisTaskMatch:
-                variables = []
-                # Extract the values from the regex match
-                for match in adaptAnalysisTaskMatch:
-                    adaptAnalysisTaskName = match[0]
-                    cfg = match[1]
-                    taskParamsMatch = match[2]
-                    taskParams = [taskParamsMatch] if taskParamsMatch else []
-                    variables.append((adaptAnalysisTaskName, cfg, taskParams))
-                    variables = [item for t in variables for item in t]
+                continue
+        
+        if "adaptAnalysisTask" in line:
+            adaptAnalysisTaskMatch = ADAPT_ANALYSIS_TASK_REGEX.findall(line)
+            variables = []
+            # Extract the values from the regex match
+            for match in adaptAnalysisTaskMatch:
+                adaptAnalysisTaskName = match[0]
+                cfg = match[1]
+                taskParamsMatch = match[2]
+                taskParams = [taskParamsMatch] if taskParamsMatch else []
+                variables.append((adaptAnalysisTaskName, cfg, taskParams))
+                variables = [item for t in variables for item in t]
+                if isDebug:
                     logging.debug("==Adapt Analysis Tasks Match==")
                     logging.debug(f"adaptAnalysisTaskName: {adaptAnalysisTaskMatch} | match 0")
                     logging.debug(f"cfgc: {cfg} | match 1")
                     logging.debug(f"taskParamsMatch: {taskParamsMatch} | match 2")
-                    configurableValues[-1]["adaptAnalysisTask"].append({
-                        "adaptAnalysisTaskName": adaptAnalysisTaskName,
-                        "variables": variables
-                        })
+                configurableValues[-1]["adaptAnalysisTask"].append({
+                    "adaptAnalysisTaskName": adaptAnalysisTaskName,
+                    "variables": variables
+                    })
     return configurableValues
 
-def alignDicts(dict1: dict, dict2: dict, keepParentKeys=None) -> dict:
-    newDict = OrderedDict()
-    dict2Ordered = OrderedDict()
-    for key, value in dict2.items():
-        dict2Ordered[key] = value
-    for key in dict2Ordered.keys():
-        if key in dict1:
-            newValue = {}
-            for subKey in dict1[key]:
-                if subKey in dict2Ordered[key]:
-                    newValue[subKey] = dict2Ordered[key][subKey]
+
+def addConfigurableMatch(configurableValues: list, configurableMatch, isDebug = False) -> None:
+    """Adds the values of a Configurable regex match to the current struct's dictionary"""
+    
+    # Extract the values from the regex match
+    dataType = configurableMatch.group(1)
+    variableName = configurableMatch.group(2)
+    configName = configurableMatch.group(3)
+    defaultValue = configurableMatch.group(4)
+    defaultValue = defaultValueHandler(dataType, defaultValue)
+    description = configurableMatch.group(7)
+    if isDebug:
+        logging.debug("==Configurable Match==")
+        logging.debug(f"dataType: {dataType} | group 1")
+        logging.debug(f"variableName: {variableName} | group 2")
+        logging.debug(f"configName: {configName} | group 3")
+        logging.debug(f"defaultValue: {defaultValue} | group 4")
+        logging.debug(f"description: {description} | group 7")
+    # Add the extracted values to the current struct's dictionary
+    if "epoch" not in defaultValue:
+        configurableValues[-1]["configurables"].append({
+            "dataType": dataType,
+            "variableName": variableName,
+            "defaultValue": defaultValue,
+            "configName": configName,
+            "description": description
+            })
+
+
+def reconcileConfigs(mergedConfig: dict, latestConfig: dict, oldConfig: dict, keepTasks = None, keepSubKeys = None, conflicts = ()):
+    """
+    Reconciles a merged config with the latest config in one pass: removes deprecated tasks and configurables/process
+    functions, re-orders configurables as in the latest config and detects new tasks and configurables.
+
+    Args:
+    - mergedConfig: Old config merged with the latest config (see ConfigMerger), it is not modified.
+    - latestConfig: Latest config from O2Physics sources (see latestConfigFileGenerator).
+    - oldConfig: Old config, it is used for detecting new tasks and configurables.
+    - keepTasks: Tasks which are kept although they are not in the latest config.
+    - keepSubKeys: Configurables/process functions which are kept although they are not in the latest config.
+    - conflicts: Merge conflicts of old and latest config (see ConfigMerger.conflicts), they are reported as changed defaults.
+
+    Returns:
+    - Tuple of the aligned config and the diff. The diff is a JSON serializable dict with keys
+      "deprecatedTasks" (list), "deprecatedConfigs" (task -> list of configurables), "newTasks" (task -> task block),
+      "newConfigs" (task -> new configurables with their default values) and "changedDefaults"
+      (task -> configurables with {"value": value in config, "default": default value in O2Physics}).
+    """
+    
+    # Set indexes for membership tests (upstream tasks and configurables are indexed by latest config dicts)
+    keepTasks = frozenset(keepTasks or ())
+    keepSubKeys = frozenset(keepSubKeys or ())
+    
+    alignedConfig = OrderedDict()
+    diff = {
+        "deprecatedTasks": [],
+        "deprecatedConfigs": {},
+        "newTasks": {},
+        "newConfigs": {},
+        "changedDefaults": {}
+        }
+    for task, block in mergedConfig.items():
+        latestBlock = latestConfig.get(task)
+        if latestBlock is None:
+            if task in keepTasks:
+                alignedConfig[task] = block
+            else:
+                diff["deprecatedTasks"].append(task)
+            continue
+        if not isinstance(block, dict) or not isinstance(latestBlock, dict):
+            alignedConfig[task] = block # not a task block
+            continue
+        
+        # configurables in latest order, values of merged config have priority
+        alignedBlock = {subKey: block[subKey] if subKey in block else value
+                        for subKey, value in latestBlock.items()}
+        deprecatedConfigs = []
+        for subKey, value in block.items():
+            if subKey not in latestBlock:
+                if subKey in keepSubKeys:
+                    alignedBlock[subKey] = value
                 else:
-                    newValue[subKey] = dict1[key][subKey]
-            for subKey in dict2Ordered[key]:
-                if subKey not in newValue:
-                    newValue[subKey] = dict2Ordered[key][subKey]
-            newDict[key] = newValue
-        elif key in dict2Ordered and (keepParentKeys is None or key in keepParentKeys):
-            newDict[key] = dict2Ordered[key]
-    return newDict
-
-def removeUnmatchedSubkeys(d1: dict, d2: dict, keepParrentKeys = None, keepSubKeys = None):
-    if keepParrentKeys is None:
-        keepParrentKeys = set()
-    if keepSubKeys is None:
-        keepSubKeys = {}
-    deprecatedTasks = []
-    deprecatedConfigs = {}
-    for key in list(d1.keys()):
-        if key not in d2 and key not in keepParrentKeys:
-            deprecatedTasks.append(key)
-            del d1[key]
+                    deprecatedConfigs.append(subKey)
+        alignedConfig[task] = alignedBlock
+        if deprecatedConfigs:
+            diff["deprecatedConfigs"][task] = deprecatedConfigs
+        
+        oldBlock = oldConfig.get(task)
+        if task not in oldConfig:
+            diff["newTasks"][task] = alignedBlock
+        elif isinstance(oldBlock, dict):
+            newConfigs = {subKey: value for subKey, value in alignedBlock.items() if subKey not in oldBlock}
+            if newConfigs:
+                diff["newConfigs"][task] = newConfigs
+    
+    # Values of old config are kept, so the conflicts are configurables whose default is different in O2Physics
+    for conflict in conflicts:
+        task, configurable = conflict.path[0], "/".join(conflict.path[1:])
+        if configurable and task in alignedConfig:
+            diff["changedDefaults"].setdefault(task, {})[configurable] = {
+                "value": conflict.value1,
+                "default": conflict.value2
+                }
+    return alignedConfig, diff
+
+
+def updateReconcileDiff(previousDiff: dict, diff: dict, changedTasks: set, taskOrder: list) -> dict:
+    """
+    Combines the diff of unchanged task blocks from a previous update with the diff of re-processed task blocks
+    (incremental updates). The result is the same as the diff of a full update.
+
+    Args:
+    - previousDiff: Diff of previous update of config (see reconcileConfigs).
+    - diff: Diff of re-processed task blocks.
+    - changedTasks: Re-processed task blocks, their entries in previous diff are replaced.
+    - taskOrder: Tasks of old config followed by new tasks (order of merged config).
+
+    Returns:
+    - Combined diff.
+    """
+    
+    taskIndex = {task: index for index, task in enumerate(taskOrder)}
+    
+    def orderTasks(tasks):
+        return sorted(tasks, key = lambda task: taskIndex.get(task, len(taskIndex)))
+    
+    combinedDiff = {}
+    for category, entries in diff.items():
+        if isinstance(entries, list):
+            tasks = [task for task in previousDiff.get(category, []) if task not in changedTasks] + entries
+            combinedDiff[category] = orderTasks(tasks)
         else:
-            subkeysToRemove = []
-            if key in d2:
-                if isinstance(d1[key], dict):
-                    for subkey in list(d1[key].keys()):
-                        if subkey not in d2[key] and subkey not in keepSubKeys:
-                            subkeysToRemove.append(subkey)
-                    for subkey in subkeysToRemove:
-                        deprecatedConfigs[key] = subkey
-                        del d1[key][subkey]
-    
-    if len(deprecatedTasks) > 0:
-        logging.info(f"Removed Deprecated Tasks:")
-        for task in deprecatedTasks:
+            blocks = {task: value for task, value in previousDiff.get(category, {}).items() if task not in changedTasks}
+            blocks.update(entries)
+            combinedDiff[category] = {task: blocks[task] for task in orderTasks(blocks)}
+    return combinedDiff
+
+
+def deprecatedConfigsReport(diff: dict) -> None:
+    """Logs deprecated tasks and configurables/process functions of a reconcile diff (see reconcileConfigs)"""
+    
+    if diff["deprecatedTasks"]:
+        logging.info("Removed Deprecated Tasks:")
+        for task in diff["deprecatedTasks"]:
             logging.info(f"[{task}]")
-    elif len(deprecatedTasks) == 0:
+    else:
         logging.info("No deprecated task found for this session.")
     
-    if len(deprecatedConfigs) > 0:
+    if diff["deprecatedConfigs"]:
         logging.info("Removed Deprecated Configurables/Process Functions:")
-        for task, configurable in deprecatedConfigs.items():
-            logging.info(f"[{task}] - {configurable}")
-    elif len(deprecatedTasks) == 0:
+        for task, configurables in diff["deprecatedConfigs"].items():
+            for configurable in configurables:
+                logging.info(f"[{task}] - {configurable}")
+    else:
         logging.info("No deprecated Configurables/Process Functions found for this session.")
-    
-    return d1
 
 
-def latestConfigFileGenerator(input: dict) -> dict:
+def latestConfigFileGenerator(input: dict, sourceCache: O2SourceCache = None) -> dict:
     """
     Downloads HTML content from the URLs provided in the input dictionary, extracts configurable parameters from the 
     HTML using a configurable selector function, processes and merges the extracted data into a single dictionary, 
@@ -561,6 +836,10 @@ def latestConfigFileGenerator(input: dict) -> dict:
 
     Args:
     - input: A dictionary containing URLs as values and their corresponding analysis names as keys.
+    - sourceCache: Shared source cache of session. If not provided, sources are downloaded only for this call.
+
+    Raises:
+    - DownloadError: If a source could not be downloaded
 
     Returns:
     - mergedConfig: Latest configs in O2
@@ -573,24 +852,15 @@ def latestConfigFileGenerator(input: dict) -> dict:
     adaptList = []
     mergedAdapt = {}
     
-    # header for github download
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_3) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/35.0.1916.47 Safari/537.36"
-        }
-    try:
-        context = ssl._create_unverified_context() # prevent ssl problems
-    except urllib.error.HTTPError as error:
-        logging.error(error)
+    if sourceCache is None:
+        sourceCache = O2SourceCache()
+    
+    # Download and parse all sources concurrently (sources in cache are not downloaded again)
+    sourceCache.prefetch(input.values())
     
     for url in input.values():
-        try:
-            htmlContent = urlopen(Request(url, headers = headers), context = context).read().decode("utf-8")
-        except urllib.error.HTTPError as error:
-            logging.exception(error)
-            sys.exit()
-        
-        # call configurable selector function
-        rawConfigurables = configurableSelectorWithRegex(htmlContent)
+        # configurables are selected while source is streamed (see O2SourceCache.parseSource)
+        rawConfigurables = sourceCache.get(url)
         
         # process raw datas
         processedConfigurables = rawConfigProcessor(rawConfigurables)
@@ -611,3 +881,29 @@ def latestConfigFileGenerator(input: dict) -> dict:
     mergedConfig = replaceDictKeys(mergedAdapt, mergedConfig)
     mergedConfig = transformDictKeys(mergedConfig, mergedAdapt)
     return mergedConfig
+
+
+def getTaskSources(input: dict, sourceCache: O2SourceCache) -> dict:
+    """
+    Returns the task blocks of latest config (see latestConfigFileGenerator) with the source which produced each of them.
+    The same key transformations are applied, so the task names are the same as in latest config.
+
+    Args:
+    - input: A dictionary containing URLs as values and their corresponding analysis names as keys.
+    - sourceCache: Source cache which includes parsed sources and hashes of input URLs.
+
+    Returns:
+    - Dictionary maps task names to {"url": source URL, "sha": SHA-256 hex digest of source}
+    """
+    
+    taskSources = {}
+    mergedAdapt = {}
+    for url in input.values():
+        rawConfigurables = sourceCache.get(url)
+        source = {"url": url, "sha": sourceCache.sourceHashes.get(url)}
+        taskSources.update({taskName: source for taskName in rawConfigProcessor(rawConfigurables)})
+        mergedAdapt.update(rawAdaptiveTaskProcessor(rawConfigurables))
+    
+    # values have to be dicts for transformDictKeys (task blocks are dicts in latest config too)
+    taskSources = replaceDictKeys(mergedAdapt, taskSources)
+    return transformDictKeys(taskSources, mergedAdapt)
@@ -75,6 +75,24 @@ class TextListNotStartsWithAtError(Exception):
         return f"{self.arg} AO2D text lists have to start with @ symbol"
 
 
+class BadAodFilesError(Exception):
+    
+    """Exception raised if AO2D text list includes files which can't be read
+
+    Attributes:
+        aodListFileName: AO2D text list
+        badEntries: bad AO2D files with the reason
+    """
+    
+    def __init__(self, aodListFileName, badEntries):
+        self.aodListFileName = aodListFileName
+        self.badEntries = badEntries
+        super().__init__()
+    
+    def __str__(self):
+        return f"{self.aodListFileName} includes {len(self.badEntries)} bad AO2D files (use --cleaned-aod-list to run without them)"
+
+
 class DependencyNotFoundError(Exception):
     
     """Exception raised for if mandatory arg not found
@@ -90,3 +108,38 @@ class DependencyNotFoundError(Exception):
     
     def __str__(self):
         return f"For configuring {self.checkedDep}, you have to specify [{self.task}] {self.cfg} function as true"
+
+
+class DownloadError(Exception):
+    
+    """Exception raised if a file could not be downloaded
+
+    Attributes:
+        url: URL of file
+        reason: HTTP status or error message
+    """
+    
+    def __init__(self, url, reason):
+        self.url = url
+        self.reason = reason
+        super().__init__()
+    
+    def __str__(self):
+        return f"{self.url} could not be downloaded: {self.reason}"
+
+
+class SourceFileNotFoundError(DownloadError):
+    
+    """Exception raised if a task source file is not found in local O2Physics checkout
+
+    Attributes:
+        url: URL of file in O2Physics repository
+        path: Expected path of file in local checkout
+    """
+    
+    def __init__(self, url, path):
+        self.path = path
+        super().__init__(url, "file not found")
+    
+    def __str__(self):
+        return f"{self.path} is not found in local O2Physics checkout (source of {self.url})"
@@ -18,11 +18,393 @@
 
 import os
 import re
-from urllib.request import Request, urlopen
-import ssl
+import json
+import hashlib
 import pathlib
 
-from .utils import getIfStartedInDoubleQuotes, writeFile
+from .dqExceptions import DownloadError
+from .utils import dumpPickle, getIfStartedInDoubleQuotes, loadJson, loadPickle, writeFileAtomic
+
+# Local DQ libraries which are parsed for autocompletion
+DQ_LIB_FILES = {
+    "cuts": "templibs/tempCutsLibrary.cxx",
+    "mcSignals": "templibs/tempMCSignalsLibrary.cxx",
+    "mixing": "templibs/tempMixingLibrary.cxx",
+    "histograms": "templibs/tempHistogramsLibrary.cxx",
+    "varManager": "templibs/tempVarManager.cxx"
+    }
+
+# O2Physics source paths of the DQ libraries
+DQ_LIB_SOURCES = {
+    "cuts": "PWGDQ/Core/CutsLibrary.cxx",
+    "mcSignals": "PWGDQ/Core/MCSignalLibrary.cxx",
+    "mixing": "PWGDQ/Core/MixingLibrary.cxx",
+    "histograms": "PWGDQ/Core/HistogramsLibrary.cxx",
+    "varManager": "PWGDQ/Core/VarManager.cxx"
+    }
+
+O2PHYSICS_GITHUB_URL = "https://github.com/AliceO2Group/O2Physics/blob/{version}/{path}?raw=true"
+
+# Content-addressed store of all downloaded DQ library versions (files are named by SHA-256)
+DQ_LIB_STORE_DIR = "templibs/store"
+DQ_LIB_STORE_FILE = "templibs/store/dqLibStore.json"
+
+# Compiled symbol index of the DQ libraries (bump the version if output of DQ_LIB_PARSERS changes)
+DQ_LIB_INDEX_FILE = "templibs/dqLibIndex.pickle"
+DQ_LIB_INDEX_VERSION = 2
+
+
+def getDQLibUrls(version: str = "master") -> dict:
+    """Returns github URLs of the DQ libraries
+
+    Args:
+        version (str, optional): O2Physics branch or production tag (e.g. nightly-20220619). Defaults to "master".
+
+    Returns:
+        dict[str, str]: DQ libraries with URLs
+    """
+    
+    return {lib: O2PHYSICS_GITHUB_URL.format(version = version, path = path)
+            for lib, path in DQ_LIB_SOURCES.items()}
+
+
+def isImmutableVersion(version: str) -> bool:
+    """Production tags (nightly-<date>) never change, branches like master can change"""
+    
+    return version.startswith("nightly-")
+
+
+def getStoredLibFileName(libSha256: str) -> str:
+    """Returns file name of DQ library in content-addressed store"""
+    
+    return os.path.join(DQ_LIB_STORE_DIR, libSha256 + ".cxx")
+
+
+def loadDQLibStore() -> dict:
+    """Loads metadata of content-addressed DQ lib store (an empty store if it is missing or corrupted)
+
+    Returns:
+        dict: Store as {"current": version, "versions": {version: {lib: {"sha256", "etag", "lastModified"}}}}
+    """
+    
+    try:
+        store = loadJson(DQ_LIB_STORE_FILE)
+    except (OSError, ValueError):
+        store = None
+    if not isinstance(store, dict) or not isinstance(store.get("versions"), dict):
+        return {
+            "current": None,
+            "versions": {}
+            }
+    return store
+
+
+def isStoredLib(libEntry: dict) -> bool:
+    return libEntry is not None and os.path.isfile(getStoredLibFileName(libEntry["sha256"]))
+
+
+def refreshDQLibs(version: str = "master", timeout: float = 60) -> list:
+    """Gets DQ libraries of a version into templibs with a content-addressed store.
+
+    Libraries are downloaded concurrently with conditional requests (ETag/Last-Modified), so unchanged libraries are
+    not downloaded again. All library versions are kept in the store by SHA-256, so switching to a production tag
+    which was downloaded before does not need network. Only libraries whose content changed are rewritten in templibs
+    and parsed again for the symbol index.
+
+    Args:
+        version (str, optional): O2Physics branch or production tag (e.g. nightly-20220619). Defaults to "master".
+        timeout (float, optional): Timeout in seconds for each file. Defaults to 60.
+
+    Raises:
+        DownloadError: If one of DQ libraries could not be downloaded (templibs is not changed in this case)
+
+    Returns:
+        list[str]: DQ libraries which are rewritten in templibs
+    """
+    
+    os.makedirs(DQ_LIB_STORE_DIR, exist_ok = True)
+    store = loadDQLibStore()
+    libEntries = store["versions"].setdefault(version, {})
+    urls = getDQLibUrls(version)
+    
+    if not (isImmutableVersion(version) and all(isStoredLib(libEntries.get(lib)) for lib in urls)):
+        # NOTE http modules are imported only for downloading since they are slow to import for TAB autocompletion
+        from .httpFetcher import HttpFetcher
+        
+        requests = {}
+        for lib, url in urls.items():
+            headers = {}
+            if isStoredLib(libEntries.get(lib)):
+                if libEntries[lib].get("etag"):
+                    headers["If-None-Match"] = libEntries[lib]["etag"]
+                if libEntries[lib].get("lastModified"):
+                    headers["If-Modified-Since"] = libEntries[lib]["lastModified"]
+            requests[lib] = (url, headers)
+        
+        with HttpFetcher(timeout = timeout, maxWorkers = len(urls)) as fetcher:
+            responses = fetcher.mapConcurrent(lambda request: fetcher.request(*request), requests)
+        
+        for lib, response in responses.items():
+            if response.status == 304 and requests[lib][1]:
+                continue # not modified, library is in store
+            if response.status != 200:
+                raise DownloadError(response.url, f"HTTP {response.status}")
+            libSha256 = hashlib.sha256(response.body).hexdigest()
+            if not os.path.isfile(getStoredLibFileName(libSha256)):
+                writeFileAtomic(getStoredLibFileName(libSha256), response.body)
+            libEntries[lib] = {
+                "sha256": libSha256,
+                "etag": response.headers.get("etag"),
+                "lastModified": response.headers.get("last-modified")
+                }
+    
+    # Rewrite only libraries whose content changed in templibs
+    changedLibs = []
+    for lib, fileName in DQ_LIB_FILES.items():
+        libSha256 = libEntries[lib]["sha256"]
+        if os.path.isfile(fileName) and fileSha256(fileName) == libSha256:
+            continue
+        with open(getStoredLibFileName(libSha256), "rb") as f:
+            writeFileAtomic(fileName, f.read())
+        changedLibs.append(lib)
+    
+    store["current"] = version
+    writeFileAtomic(DQ_LIB_STORE_FILE, json.dumps(store, indent = 2).encode("utf-8"))
+    
+    # Parse only changed libraries for the symbol index
+    if changedLibs:
+        getDQLibSymbols()
+    return changedLibs
+
+
+def parseCutsLib(fileName: str) -> dict:
+    """Parses analysis cuts and pair cuts from CutsLibrary"""
+    
+    allAnalysisCuts = getIfStartedInDoubleQuotes(fileName)
+    allOnlyPairCuts = [y for y in allAnalysisCuts if "pair" in y] # Get Only pair cuts from CutsLibrary.cxx
+    
+    # NOTE : Now we have brute-force solution for format specifiers (for dalitz cuts)
+    # TODO We need more simple and flexible solution for this isue
+    getCleanDalitzCuts = []
+    getDalitzCutsWithFormatSpecifiers = [x for x in allAnalysisCuts if "%d" in x]
+    getDalitzCutsWithFormatSpecifiers = list(map(lambda x: x.replace('%d', ''), getDalitzCutsWithFormatSpecifiers)) # delete format specifiers with list comp.
+    
+    # add one to eight suffix due to for loop in O2-DQ Framework
+    for i in getDalitzCutsWithFormatSpecifiers:
+        for j in range(1, 9):
+            getCleanDalitzCuts.append(i + str(j)) # add suffix integers
+    
+    # after getting clean dalitz cuts, we need remove has format specifier dalitz cuts from allAnalysisCuts and add clean dalitz cuts
+    allAnalysisCuts = [x for x in allAnalysisCuts if "%d" not in x] # clean the has format specifier dalitz cuts
+    allAnalysisCuts += getCleanDalitzCuts # add clean dalitz cuts
+    
+    return {
+        "allAnalysisCuts": allAnalysisCuts,
+        "allOnlyPairCuts": allOnlyPairCuts
+        }
+
+
+def parseMCSignalsLib(fileName: str) -> dict:
+    """Parses MC signals from MCSignalLibrary"""
+    
+    return {
+        "allMCSignals": getIfStartedInDoubleQuotes(fileName)
+        }
+
+
+def parseMixingLib(fileName: str) -> dict:
+    """Parses event mixing vars from MixingLibrary"""
+    
+    return {
+        "allMixing": getIfStartedInDoubleQuotes(fileName)
+        }
+
+
+def parseHistogramsLib(fileName: str) -> dict:
+    """Parses histogram groups from HistogramsLibrary"""
+    
+    # Flags for DQ Lib Getter
+    kEvents = True
+    kTracks = True
+    kMCtruths = True
+    kPairs = True
+    # kDileptons = True
+    
+    # Lists for saving Histograms
+    eventHistos = []
+    trackHistos = []
+    mctruthHistos = []
+    pairHistos = []
+    dileptonHistos = []
+    allHistograms = []
+    
+    # Get All histograms with flags
+    with open(fileName) as f:
+        for line in f:
+            if "if" in line:
+                if "track" not in line and kEvents is True: # get event histos
+                    line = re.findall('"([^"]*)"', line)
+                    eventHistos += line
+                    allHistograms += line
+                elif "mctruth" not in line and kTracks is True: # get track histos
+                    line = re.findall('"([^"]*)"', line)
+                    kEvents = False
+                    trackHistos += line
+                    allHistograms += line
+                elif "mctruth" in line and kMCtruths is True: # get mctruth histos
+                    line = re.findall('"([^"]*)"', line)
+                    kTracks = False
+                    mctruthHistos += line
+                    allHistograms += line
+                elif "dilepton" not in line and kPairs is True: # get sep histos
+                    line = re.findall('"([^"]*)"', line)
+                    kMCtruths = False
+                    pairHistos += line
+                    allHistograms += line
+                else: # get dilepton histos
+                    line = re.findall('"([^"]*)"', line)
+                    kPairs = False
+                    dileptonHistos += line
+                    allHistograms += line
+    
+    return {
+        "allHistos": allHistograms,
+        "allEventHistos": eventHistos,
+        "allTrackHistos": trackHistos,
+        "allMCTruthHistos": mctruthHistos,
+        "allPairHistos": pairHistos,
+        "allDileptonHistos": dileptonHistos
+        }
+
+
+def parseVarManager(fileName: str) -> dict:
+    """Parses LHC periods from VarManager"""
+    
+    allLHCPeriods = []
+    with open(fileName) as f:
+        stringIfSearch = [x for x in f if "if" and "period.Contains" in x]
+        for i in stringIfSearch:
+            allLHCPeriods.extend(re.findall('"([^"]*)"', i))
+    return {
+        "allLHCPeriods": allLHCPeriods
+        }
+
+
+# Parser of each DQ library (each library is parsed and indexed independently)
+DQ_LIB_PARSERS = {
+    "cuts": parseCutsLib,
+    "mcSignals": parseMCSignalsLib,
+    "mixing": parseMixingLib,
+    "histograms": parseHistogramsLib,
+    "varManager": parseVarManager
+    }
+
+
+def parseDQLibs() -> dict:
+    """Parses the local DQ libraries and collects all symbols which are used for autocompletion
+
+    Returns:
+        dict[str, list]: Symbol lists (analysis cuts, pair cuts, MC signals, mixing vars, LHC periods and histogram groups)
+    """
+    
+    symbols = {}
+    for lib, fileName in DQ_LIB_FILES.items():
+        symbols.update(DQ_LIB_PARSERS[lib](fileName))
+    return symbols
+
+
+def fileSha256(fileName: str) -> str:
+    """Returns SHA-256 hex digest of a file"""
+    
+    with open(fileName, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def getDQLibsStat() -> dict:
+    """Returns the (mtime, size) pairs of local DQ libraries for fast index validation"""
+    
+    libsStat = {}
+    for lib, fileName in DQ_LIB_FILES.items():
+        stat = os.stat(fileName)
+        libsStat[lib] = (stat.st_mtime_ns, stat.st_size)
+    return libsStat
+
+
+def loadDQLibIndex() -> dict:
+    """Loads the compiled DQ lib symbol index (an empty index if it is missing or has an old version)
+
+    Returns:
+        dict: Index with (mtime, size) pair, SHA-256 hash and symbols of each DQ library
+    """
+    
+    index = loadPickle(DQ_LIB_INDEX_FILE)
+    if not isinstance(index, dict) or index.get("version") != DQ_LIB_INDEX_VERSION:
+        return {
+            "version": DQ_LIB_INDEX_VERSION,
+            "libs": {}
+            }
+    return index
+
+
+def getDQLibSymbols() -> dict:
+    """Returns DQ lib symbols from the compiled index, only DQ libraries which changed are parsed again.
+
+    A library is unchanged if its mtime and size are the same as in the index. If only the mtime differs
+    (e.g. library copied again with same content), the SHA-256 hashes are compared instead.
+
+    Returns:
+        dict[str, list]: Symbol lists (analysis cuts, pair cuts, MC signals, mixing vars, LHC periods and histogram groups)
+    """
+    
+    libsStat = getDQLibsStat()
+    index = loadDQLibIndex()
+    isIndexChanged = False
+    
+    for lib, fileName in DQ_LIB_FILES.items():
+        libIndex = index["libs"].get(lib)
+        if libIndex is not None and libIndex["stat"] == libsStat[lib]:
+            continue
+        
+        # Slow path: compare content hash, parse library only if content changed
+        libSha256 = fileSha256(fileName)
+        if libIndex is None or libIndex["sha256"] != libSha256:
+            libIndex = {
+                "sha256": libSha256,
+                "symbols": DQ_LIB_PARSERS[lib](fileName)
+                }
+        libIndex["stat"] = libsStat[lib] # refresh the stat keys for the next fast path
+        index["libs"][lib] = libIndex
+        isIndexChanged = True
+    
+    if isIndexChanged:
+        dumpPickle(DQ_LIB_INDEX_FILE, index)
+    
+    symbols = {}
+    for lib in DQ_LIB_FILES:
+        symbols.update(index["libs"][lib]["symbols"])
+    return symbols
+
+
+def iterSels(analysisCuts: list, pairCuts: list, multiplicities = range(1, 10)):
+    """Generator for all possible selections of cfgBarrelSels and cfgMuonSels in FilterPP Task
+
+    Args:
+        analysisCuts (list[str]): All analysis cuts
+        pairCuts (list[str]): Only pair cuts
+        multiplicities (list[int], optional): Possible n values. Defaults to 1 to 9.
+
+    Yields:
+        str: Selections as <track-cut>:<pair-cut>:<n> first and <track-cut>::<n> after
+    """
+    
+    # in Filter PP Task, sels options for barrel and muon uses colons e.g. "<track-cut>:[<pair-cut>]:<n> and <track-cut>::<n>
+    for k in multiplicities:
+        for pairCut in pairCuts:
+            for cut in analysisCuts:
+                yield f"{cut}:{pairCut}:{k}" # cut:paircut:n
+    for k in multiplicities:
+        for cut in analysisCuts:
+            yield f"{cut}::{k}" # cut::n
 
 
 class DQLibGetter(object):
@@ -50,39 +432,6 @@ class DQLibGetter(object):
         self.allPairHistos = list(allPairHistos)
         self.allDileptonHistos = list(allDileptonHistos)
         
-        # For filter selections
-        allPairCuts = [] # only pair cuts
-        selsWithDoubleColon = [] # e.g. muonQualityCuts::2
-        pairCutsWithSingleColon = [] # e.g paircutMass:3
-        selsWithSingleColon = [] # track/muon cut:paircut:n
-        singleColon = ":" # Namespace reference
-        doubleColon = "::" # Namespace reference
-        
-        # Flags for DQ Lib Getter
-        kEvents = True
-        kTracks = True
-        kMCtruths = True
-        kPairs = True
-        # kDileptons = True
-        
-        # Lists for saving Histograms
-        eventHistos = []
-        trackHistos = []
-        mctruthHistos = []
-        pairHistos = []
-        dileptonHistos = []
-        allHistograms = []
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_3) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/35.0.1916.47 Safari/537.36"
-            }
-        
-        URL_CUTS_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/CutsLibrary.cxx?raw=true"
-        URL_MCSIGNALS_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MCSignalLibrary.cxx?raw=true"
-        URL_MIXING_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MixingLibrary.cxx?raw=true"
-        URL_HISTOGRAMS_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/HistogramsLibrary.cxx?raw=true"
-        URL_VAR_MANAGER = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/VarManager.cxx?raw=true"
-        
         # Create templibs directory if not exist
         if not os.path.isdir("templibs"):
             path = pathlib.Path(__file__).parent.parent.resolve()
@@ -94,124 +443,40 @@ class DQLibGetter(object):
         
         # Github Links for CutsLibrary and MCSignalsLibrary from PWG-DQ --> download from github
         # This condition solves performance issues
-        if (os.path.isfile("templibs/tempCutsLibrary.cxx") and os.path.isfile("templibs/tempMCSignalsLibrary.cxx") and os.path.isfile("templibs/tempMixingLibrary.cxx") and os.path.isfile("templibs/tempHistogramsLibrary.cxx") and os.path.isfile("templibs/tempVarManager.cxx")) is False:
+        if not all(os.path.isfile(fileName) for fileName in DQ_LIB_FILES.values()):
             print("[INFO] Some Libs are Missing. They will download.")
-            
-            # Dummy SSL Adder
-            context = ssl._create_unverified_context() # prevent ssl problems
-            # request = urllib.request.urlopen(URL_CUTS_LIBRARY, context=context)
-            
-            # HTTP Request
-            requestCutsLibrary = Request(URL_CUTS_LIBRARY, headers = headers)
-            requestMCSignalsLibrary = Request(URL_MCSIGNALS_LIBRARY, headers = headers)
-            requestMixingLibrary = Request(URL_MIXING_LIBRARY, headers = headers)
-            requestHistogramsLibrary = Request(URL_HISTOGRAMS_LIBRARY, headers = headers)
-            requestVarManager = Request(URL_VAR_MANAGER, headers = headers)
-            
-            # Get Files With Http Requests
-            htmlCutsLibrary = urlopen(requestCutsLibrary, context = context).read()
-            htmlMCSignalsLibrary = urlopen(requestMCSignalsLibrary, context = context).read()
-            htmlMixingLibrary = urlopen(requestMixingLibrary, context = context).read()
-            htmlHistogramsLibrary = urlopen(requestHistogramsLibrary, context = context).read()
-            htmlVarManager= urlopen(requestVarManager, context = context).read()
-            
-            # Save Disk to temp DQ libs
-            writeFile("templibs/tempCutsLibrary.cxx", htmlCutsLibrary)
-            writeFile("templibs/tempMCSignalsLibrary.cxx", htmlMCSignalsLibrary)
-            writeFile("templibs/tempMixingLibrary.cxx", htmlMixingLibrary)
-            writeFile("templibs/tempHistogramsLibrary.cxx", htmlHistogramsLibrary)
-            writeFile("templibs/tempVarManager.cxx", htmlVarManager)
+            refreshDQLibs()
             print("[INFO] Libs downloaded succesfully.")
         
-        # Get MC Signals and Mixing vars from DQ Framework header files
-        self.allMCSignals = getIfStartedInDoubleQuotes("templibs/tempMCSignalsLibrary.cxx")
-        self.allMixing = getIfStartedInDoubleQuotes("templibs/tempMixingLibrary.cxx")
+        # Get all symbols from the compiled index (DQ libs are parsed only if they changed)
+        symbols = getDQLibSymbols()
         
-        # Get LHC Periods from DQ Framework VarManager cxx file
-        with open("templibs/tempVarManager.cxx") as f:
-            stringIfSearch = [x for x in f if "if" and "period.Contains" in x]
-            for i in stringIfSearch:
-                self.allLHCPeriods.extend(re.findall('"([^"]*)"', i))
-            
-        # Get All histograms with flags
-        with open("templibs/tempHistogramsLibrary.cxx") as f:
-            for line in f:
-                if "if" in line:
-                    if "track" not in line and kEvents is True: # get event histos
-                        line = re.findall('"([^"]*)"', line)
-                        eventHistos += line
-                        allHistograms += line
-                    elif "mctruth" not in line and kTracks is True: # get track histos
-                        line = re.findall('"([^"]*)"', line)
-                        kEvents = False
-                        trackHistos += line
-                        allHistograms += line
-                    elif "mctruth" in line and kMCtruths is True: # get mctruth histos
-                        line = re.findall('"([^"]*)"', line)
-                        kTracks = False
-                        mctruthHistos += line
-                        allHistograms += line
-                    elif "dilepton" not in line and kPairs is True: # get sep histos
-                        line = re.findall('"([^"]*)"', line)
-                        kMCtruths = False
-                        pairHistos += line
-                        allHistograms += line
-                    else: # get dilepton histos
-                        line = re.findall('"([^"]*)"', line)
-                        kPairs = False
-                        dileptonHistos += line
-                        allHistograms += line
-        f.close()
+        self.allMCSignals = list(symbols["allMCSignals"])
+        self.allMixing = list(symbols["allMixing"])
+        self.allLHCPeriods += symbols["allLHCPeriods"]
         
         # Save histograms to class arguments
-        self.allHistos = allHistograms
-        self.allEventHistos += eventHistos
-        self.allTrackHistos += trackHistos
-        self.allMCTruthHistos += mctruthHistos
-        self.allPairHistos += pairHistos
-        self.allDileptonHistos += dileptonHistos
-        
-        self.allAnalysisCuts = getIfStartedInDoubleQuotes("templibs/tempCutsLibrary.cxx")
-        getPairCuts = [y for y in self.allAnalysisCuts if "pair" in y]
-        if getPairCuts: # if pair cut list is not empty
-            allPairCuts += getPairCuts # Get Only pair cuts from CutsLibrary.cxx
-            namespacedPairCuts = [x + singleColon for x in allPairCuts] # paircut:
-            self.allOnlyPairCuts += allPairCuts # Get all Pair Cuts from CutsLibrary.cxx
+        self.allHistos = list(symbols["allHistos"])
+        self.allEventHistos += symbols["allEventHistos"]
+        self.allTrackHistos += symbols["allTrackHistos"]
+        self.allMCTruthHistos += symbols["allMCTruthHistos"]
+        self.allPairHistos += symbols["allPairHistos"]
+        self.allDileptonHistos += symbols["allDileptonHistos"]
         
-        # NOTE : Now we have brute-force solution for format specifiers (for dalitz cuts)
-        # TODO We need more simple and flexible solution for this isue
-        getCleanDalitzCuts = []
-        getDalitzCutsWithFormatSpecifiers = [x for x in self.allAnalysisCuts if "%d" in x]
-        getDalitzCutsWithFormatSpecifiers = list(map(lambda x: x.replace('%d', ''), getDalitzCutsWithFormatSpecifiers)) # delete format specifiers with list comp.
-        #print(getDalitzCutsWithFormatSpecifiers)
-        
-        # add one to eight suffix due to for loop in O2-DQ Framework
-        for i in getDalitzCutsWithFormatSpecifiers:
-            for j in range(1, 9):
-                i = i + str(j) # add suffix integers
-                getCleanDalitzCuts.append(i)
-                i = i[:-1] # remove last character after suffix
-        
-        # after getting clean dalitz cuts, we need remove has format specifier dalitz cuts from allAnalysisCuts and add clean dalitz cuts
-        self.allAnalysisCuts = [x for x in self.allAnalysisCuts if "%d" not in x] # clean the has format specifier dalitz cuts
-        self.allAnalysisCuts += getCleanDalitzCuts # add clean dalitz cuts
-        
-        # in Filter PP Task, sels options for barrel and muon uses colons e.g. "<track-cut>:[<pair-cut>]:<n> and <track-cut>::<n> For Manage this issue:
-        allAnalysisCutsSingleColon = [x + singleColon for x in self.allAnalysisCuts] # cut:
-        allAnalysisCutsDoubleColon = [x + doubleColon for x in self.allAnalysisCuts] # cut::
-        
-        for k in range(1, 10):
-            # Style 1 <track-cut>::<n> --> selsWithDoubleColon
-            dubletStyle = [x + str(k) for x in allAnalysisCutsDoubleColon] # cut::n
-            selsWithDoubleColon += dubletStyle
-            nAddedPairCuts = [x + str(k) for x in namespacedPairCuts]
-            pairCutsWithSingleColon += nAddedPairCuts
-        
-        # Style 2 <track-cut>:[<pair-cut>]:<n> --> selsWithSingleColon:
-        for i in pairCutsWithSingleColon:
-            tripletStyle = [x + i for x in allAnalysisCutsSingleColon]
-            selsWithSingleColon += tripletStyle
+        self.allAnalysisCuts = list(symbols["allAnalysisCuts"])
+        self.allOnlyPairCuts += symbols["allOnlyPairCuts"] # Get all Pair Cuts from CutsLibrary.cxx
+    
+    @property
+    def allSels(self) -> list:
+        """All possible selections for cfgBarrelSels and cfgMuonSels in FilterPP Task.
         
-        # Merge All possible styles for Sels (cfgBarrelSels and cfgMuonSels) in FilterPP Task
-        f.close()
-        self.allSels = selsWithSingleColon + selsWithDoubleColon
+        NOTE This list is very large (all analysis cuts x all pair cuts x multiplicities), so it is only
+        generated when accessed. For autocompletion use choicesHandler.SelsCompleter instead.
+        """
+        if self._allSels is None:
+            self._allSels = list(iterSels(self.allAnalysisCuts, self.allOnlyPairCuts))
+        return self._allSels
+    
+    @allSels.setter
+    def allSels(self, allSels: list) -> None:
+        self._allSels = list(allSels) if allSels else None
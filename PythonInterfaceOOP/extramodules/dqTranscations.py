@@ -22,7 +22,8 @@ import logging
 import sys
 import os
 
-from .dqExceptions import DependencyNotFoundError, NotInAlienvError, TasknameNotFoundInConfigFileError, TextListNotStartsWithAtError
+from .aodListValidator import AodListValidator
+from .dqExceptions import BadAodFilesError, DependencyNotFoundError, NotInAlienvError, TasknameNotFoundInConfigFileError, TextListNotStartsWithAtError
 
 
 def aodFileChecker(aod: str):
@@ -72,6 +73,45 @@ def aodFileChecker(aod: str):
             raise TypeError(f"{argProvidedAod} is wrong formatted file!!!")
 
 
+def aodListChecker(config: dict, validate: bool, cleanedListFileName: str = None):
+    """Validates every AO2D file of text list in config (@list.txt) before workflow runs (see AodListValidator).
+    If cleaned list file name is provided, bad and duplicate entries are dropped and the workflow reads the cleaned list.
+
+    Args:
+        config (dict[str, dict]): JSON config file
+        validate (CLI argument): Validate AO2D files of text list
+        cleanedListFileName (CLI argument, optional): Cleaned AO2D text list which is written. Defaults to None.
+
+    Raises:
+        BadAodFilesError: If text list includes bad AO2D files and cleaned list is not written
+    """
+    
+    if not validate and cleanedListFileName is None:
+        return
+    aodFile = config.get("internal-dpl-aod-reader", {}).get("aod-file", "")
+    if not aodFile.startswith("@"):
+        logging.warning("AO2D validation needs AO2D files as text list (@list.txt), it is skipped")
+        return
+    
+    aodListValidator = AodListValidator(aodFile[1 :])
+    badEntries = aodListValidator.validate()
+    aodListValidator.report()
+    
+    if cleanedListFileName is not None:
+        if not aodListValidator.getValidFiles():
+            logging.error("There is no valid AO2D file in %s", aodFile[1 :])
+            sys.exit(1)
+        config["internal-dpl-aod-reader"]["aod-file"] = "@" + aodListValidator.writeCleanedList(cleanedListFileName)
+        return
+    
+    try:
+        if badEntries:
+            raise BadAodFilesError(aodFile[1 :], badEntries)
+    except BadAodFilesError as e:
+        logging.exception(e)
+        sys.exit(1)
+
+
 def trackPropagationChecker(trackProp: bool, deps: list):
     """This method automatically deletes the o2-analysis-trackextension(for run2) task from your workflow
     when you add the o2-analysis-track-propagation (for run3)
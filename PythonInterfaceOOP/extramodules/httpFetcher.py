@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes a concurrent HTTP getter for downloading files from github (Developer package)
+
+import http.client
+import logging
+import socket
+import ssl
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+from .dqExceptions import DownloadError
+
+# header for github download
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_3) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/35.0.1916.47 Safari/537.36"
+    }
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+HttpResponse = namedtuple("HttpResponse", ["status", "headers", "body", "url"])
+
+
+class HttpFetcher(object):
+    
+    """Thread safe HTTP(S) getter with keep-alive connections. Connections are kept in a pool of idle connections per
+    host for the lifetime of the getter: a request checks out an idle connection (a new one only if all are in use)
+    and returns it after the response is read, so concurrent downloads, redirects (e.g. github.com -->
+    raw.githubusercontent.com) and later fetchAll calls reuse open connections instead of new TCP+TLS handshakes.
+
+    Args:
+        headers (dict, optional): Headers for all requests. Defaults to DEFAULT_HEADERS.
+        timeout (float, optional): Timeout in seconds for each file (connecting, redirects and reading the body). Defaults to 60.
+        maxWorkers (int, optional): Maximum number of concurrent downloads. Defaults to 8.
+        maxRedirects (int, optional): Maximum number of followed redirects. Defaults to 5.
+    """
+    
+    def __init__(self, headers: dict = None, timeout: float = 60, maxWorkers: int = 8, maxRedirects: int = 5) -> None:
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.timeout = timeout
+        self.maxWorkers = maxWorkers
+        self.maxRedirects = maxRedirects
+        self.context = ssl._create_unverified_context() # prevent ssl problems
+        self._idleConnections = {} # (scheme, netloc): idle connections
+        self._connectionKeys = {} # connection: (scheme, netloc) of all opened connections
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def getConnection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """Checks out an idle keep-alive connection to host (a new connection if all connections are in use)"""
+        
+        with self._lock:
+            idleConnections = self._idleConnections.get((scheme, netloc))
+            if idleConnections:
+                return idleConnections.pop() # most recently used one, it is the most likely to be still open
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(netloc, timeout = self.timeout, context = self.context)
+        else:
+            connection = http.client.HTTPConnection(netloc, timeout = self.timeout)
+        with self._lock:
+            self._connectionKeys[connection] = (scheme, netloc)
+        return connection
+    
+    def release(self, connection: http.client.HTTPConnection, response: http.client.HTTPResponse = None) -> None:
+        """Returns connection to idle connections after the response body is read. Without a fully read response
+        (e.g. after an error) or if server closes it, connection is closed, it will be reopened by its next request.
+        """
+        
+        if response is None or response.will_close:
+            connection.close()
+        with self._lock:
+            if connection in self._connectionKeys:
+                self._idleConnections.setdefault(self._connectionKeys[connection], []).append(connection)
+    
+    def request(self, url: str, headers: dict = None) -> HttpResponse:
+        """Sends GET request and follows redirects
+
+        Args:
+            url (str): URL of file
+            headers (dict, optional): Extra headers for this request (e.g. If-None-Match). Defaults to None.
+
+        Raises:
+            DownloadError: If connection fails, timeout is exceeded or there are too many redirects
+
+        Returns:
+            HttpResponse: Status, headers (lower case names), body and final URL
+        """
+        
+        deadline = time.monotonic() + self.timeout
+        url, connection, response = self.open(url, headers, deadline)
+        try:
+            body = self.readBody(connection, response, url, deadline)
+        except (socket.timeout, OSError, http.client.HTTPException) as error:
+            self.release(connection)
+            raise DownloadError(url, error)
+        self.release(connection, response)
+        return HttpResponse(response.status, self.getHeaders(response), body, url)
+    
+    def iterLines(self, url: str, headers: dict = None):
+        """Streams file line by line while bytes arrive, so the caller can process lines during the network wait
+
+        Args:
+            url (str): URL of file
+            headers (dict, optional): Extra headers for this request. Defaults to None.
+
+        Raises:
+            DownloadError: If connection fails, timeout is exceeded, there are too many redirects or status is not 200
+
+        Yields:
+            bytes: Lines of file (with line endings)
+        """
+        
+        deadline = time.monotonic() + self.timeout
+        url, connection, response = self.open(url, headers, deadline)
+        if response.status != 200:
+            self.release(connection)
+            raise DownloadError(url, f"HTTP {response.status}")
+        
+        isCompleted = False
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout(f"timeout exceeded while reading {url}")
+                if connection.sock is not None:
+                    connection.sock.settimeout(remaining)
+                line = response.readline()
+                if not line:
+                    break
+                yield line
+            isCompleted = True
+        except (socket.timeout, OSError, http.client.HTTPException) as error:
+            raise DownloadError(url, error)
+        finally:
+            # connection is closed if body is not read to the end (error or caller stopped)
+            self.release(connection, response if isCompleted else None)
+    
+    def open(self, url: str, headers: dict, deadline: float):
+        """Sends GET request, reads bodies of redirects and returns final URL, connection and response with unread body"""
+        
+        requestHeaders = {
+            **self.headers,
+            **(headers or {})
+            }
+        for redirect in range(self.maxRedirects + 1):
+            connection, response = self.send(url, requestHeaders, deadline)
+            location = response.getheader("location")
+            if response.status not in REDIRECT_STATUSES or location is None:
+                return url, connection, response
+            try:
+                self.readBody(connection, response, url, deadline) # drain redirect body so connection can be reused
+            except (socket.timeout, OSError, http.client.HTTPException) as error:
+                self.release(connection)
+                raise DownloadError(url, error)
+            self.release(connection, response)
+            url = urljoin(url, location)
+        raise DownloadError(url, "too many redirects")
+    
+    def send(self, url: str, headers: dict, deadline: float):
+        """Sends one GET request on keep-alive connection (retries once if server closed the idle connection)"""
+        
+        parts = urlsplit(url)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        connection = self.getConnection(parts.scheme, parts.netloc)
+        
+        for attempt in range(2):
+            connection.timeout = max(deadline - time.monotonic(), 0.001) # used for connecting
+            try:
+                connection.request("GET", path, headers = headers)
+                return connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, http.client.ResponseNotReady, ConnectionResetError, BrokenPipeError) as error:
+                connection.close()
+                if attempt == 1:
+                    self.release(connection)
+                    raise DownloadError(url, error)
+                logging.debug("Connection to %s is closed, reconnecting", parts.netloc)
+            except (socket.timeout, OSError, http.client.HTTPException) as error:
+                self.release(connection)
+                raise DownloadError(url, error)
+    
+    @staticmethod
+    def getHeaders(response: http.client.HTTPResponse) -> dict:
+        return {name.lower(): value
+                for name, value in response.getheaders()}
+    
+    @staticmethod
+    def readBody(connection: http.client.HTTPConnection, response: http.client.HTTPResponse, url: str, deadline: float) -> bytes:
+        """Reads response body in chunks until deadline"""
+        
+        chunks = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout(f"timeout exceeded while reading {url}")
+            if connection.sock is not None:
+                connection.sock.settimeout(remaining)
+            chunk = response.read(65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    
+    def fetch(self, url: str) -> bytes:
+        """Downloads file
+
+        Raises:
+            DownloadError: If file could not be downloaded
+
+        Returns:
+            bytes: Content of file
+        """
+        
+        response = self.request(url)
+        if response.status != 200:
+            raise DownloadError(url, f"HTTP {response.status}")
+        return response.body
+    
+    def fetchAll(self, urls: dict) -> dict:
+        """Downloads files concurrently (total time is about the time of the slowest file)
+
+        Args:
+            urls (dict): Keys with URLs
+
+        Raises:
+            DownloadError: If one of files could not be downloaded (after all downloads are finished)
+
+        Returns:
+            dict: Keys with contents of files
+        """
+        
+        return self.mapConcurrent(self.fetch, urls)
+    
+    def mapConcurrent(self, function, urls: dict) -> dict:
+        """Calls function(url) concurrently for all URLs and returns keys with results"""
+        
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers = min(self.maxWorkers, len(urls))) as executor:
+            futures = {key: executor.submit(function, url)
+                       for key, url in urls.items()}
+        return {key: future.result()
+                for key, future in futures.items()}
+    
+    def close(self) -> None:
+        """Closes all keep-alive connections"""
+        
+        with self._lock:
+            for connection in self._connectionKeys:
+                connection.close()
+            self._connectionKeys = {}
+            self._idleConnections = {}
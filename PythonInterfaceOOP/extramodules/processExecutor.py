@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes subprocess executor of O2 workflow commands (Developer package)
+
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from .utils import writeFileAtomic
+
+PAGE_SIZE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+
+# Workflows run in their own sessions, so signals of run script are forwarded to running executors (see stopRunningExecutors)
+runningExecutors = set()
+runningExecutorsLock = threading.Lock()
+stopRequested = threading.Event()
+stopSignalNumber = None
+
+
+def getProcessTree(rootPid: int) -> list:
+    """Returns pids of a process and all its descendants from /proc (empty list if /proc is not available)
+
+    Args:
+        rootPid (int): Pid of root process (e.g. shell of O2 workflow pipeline)
+
+    Returns:
+        list: Pids of process tree
+    """
+    
+    children = {}
+    try:
+        procEntries = os.listdir("/proc")
+    except OSError:
+        return []
+    for entry in procEntries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue # process is finished in the meantime
+        # Process name can include spaces and parentheses, fields after it are separated with spaces
+        parentPid = int(stat[stat.rindex(")") + 2 :].split()[1])
+        children.setdefault(parentPid, []).append(int(entry))
+    
+    processTree = []
+    pidsToVisit = [rootPid]
+    while pidsToVisit:
+        pid = pidsToVisit.pop()
+        processTree.append(pid)
+        pidsToVisit.extend(children.get(pid, []))
+    return processTree
+
+
+def getRssKb(pid: int) -> int:
+    """Returns resident set size of a process in kB (0 if process is finished)"""
+    
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE_KB
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def stopRunningExecutors(signalNumber: int, frame) -> None:
+    """Signal handler of run scripts (SIGINT, SIGTERM). The signal is forwarded to process groups of all running
+    workflows (including shards in worker threads) and workflows which are not started yet are not started anymore.
+    If no workflow is running, the signal has its default effect (KeyboardInterrupt or exit).
+    """
+    
+    global stopSignalNumber
+    stopSignalNumber = signalNumber
+    stopRequested.set()
+    with runningExecutorsLock:
+        executors = list(runningExecutors)
+    if not executors:
+        if signalNumber == signal.SIGINT:
+            raise KeyboardInterrupt
+        raise SystemExit(128 + signalNumber)
+    for executor in executors:
+        executor.stop(signalNumber)
+
+
+def installSignalHandlers() -> None:
+    """Installs stopRunningExecutors for SIGINT and SIGTERM (signal handlers can only be installed in main thread)"""
+    
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signalNumber in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signalNumber, stopRunningExecutors)
+
+
+def getStopExitCode():
+    """Returns exit code of a stopped run (128 + signal number), or None if run is not stopped by a signal"""
+    
+    return 128 + stopSignalNumber if stopRequested.is_set() else None
+
+
+class ProcessExecutor(object):
+    
+    """Runs an O2 workflow command (pipeline of DPL devices) in a subprocess instead of os.system. stdout and stderr of
+    the workflow are streamed line by line to console and to a log file, the exit code of the workflow is returned and
+    wall time, CPU time (user + system of all processes in the pipeline) and peak RSS are recorded.
+
+    Peak RSS is given both for the largest process (from resource usage of the finished pipeline) and for the sum of
+    the process tree (sampled from /proc while the workflow runs, DPL devices run at the same time, by the resource
+    monitor if it is given).
+
+    The workflow runs in its own session. SIGINT and SIGTERM of the run script are forwarded to its process group
+    (see installSignalHandlers), a second signal kills it.
+
+    Args:
+        commandToRun (str): Command To Run
+        logFileName (str, optional): Log file of workflow output. Defaults to None (only console).
+        statsFileName (str, optional): JSON file of exit code and resource usage. Defaults to None (only logged).
+        echo (bool, optional): Stream workflow output to console. Defaults to True.
+        cwd (str, optional): Work directory of workflow. Defaults to None (current directory).
+        sampleInterval (float, optional): Interval of process tree RSS sampling in seconds. Defaults to 1.0.
+        name (str, optional): Name of workflow in log messages. Defaults to "Workflow".
+        resourceMonitor (ResourceMonitor, optional): Live resource monitor of workflow processes. Defaults to None.
+    """
+    
+    def __init__(self, commandToRun: str, logFileName: str = None, statsFileName: str = None, echo: bool = True, cwd: str = None, sampleInterval: float = 1.0, name: str = "Workflow", resourceMonitor = None) -> None:
+        self.commandToRun = commandToRun
+        self.logFileName = logFileName
+        self.statsFileName = statsFileName
+        self.echo = echo
+        self.cwd = cwd
+        self.sampleInterval = sampleInterval
+        self.name = name
+        self.resourceMonitor = resourceMonitor
+        self.process = None
+        self.logLock = threading.Lock()
+        self.finished = threading.Event()
+        self.peakTreeRssKb = 0
+        self.stopCount = 0
+        self.stats = {}
+    
+    def streamOutput(self, pipe, consoleStream, logFile) -> None:
+        """Copies workflow output line by line to console and log file"""
+        
+        for line in iter(pipe.readline, b""):
+            if self.echo:
+                consoleStream.write(line)
+                consoleStream.flush()
+            if logFile is not None:
+                with self.logLock:
+                    logFile.write(line)
+                    logFile.flush()
+        pipe.close()
+    
+    def sampleTreeRss(self) -> None:
+        """Samples summed RSS of workflow process tree until workflow is finished"""
+        
+        while not self.finished.wait(self.sampleInterval):
+            treeRssKb = sum(getRssKb(pid) for pid in getProcessTree(self.process.pid))
+            self.peakTreeRssKb = max(self.peakTreeRssKb, treeRssKb)
+    
+    def waitProcess(self):
+        """Waits workflow with resource usage of the whole pipeline (shell and its finished descendants)
+
+        Returns:
+            tuple: Exit code (128 + signal number if workflow is killed by a signal) and resource usage
+        """
+        
+        while True:
+            try:
+                pid, waitStatus, resourceUsage = os.wait4(self.process.pid, 0)
+                break
+            except InterruptedError:
+                continue
+        
+        returnCode = os.waitstatus_to_exitcode(waitStatus)
+        self.process.returncode = returnCode
+        return 128 - returnCode if returnCode < 0 else returnCode, resourceUsage
+    
+    def stop(self, signalNumber: int) -> None:
+        """Forwards a signal to process group of workflow (SIGKILL if workflow is already stopped once)"""
+        
+        if self.process is None or self.process.returncode is not None:
+            return
+        if self.stopCount > 0:
+            signalNumber = signal.SIGKILL
+        self.stopCount += 1
+        logging.warning("%s is stopped with %s", self.name, signal.Signals(signalNumber).name)
+        try:
+            os.killpg(self.process.pid, signalNumber)
+        except ProcessLookupError:
+            pass
+    
+    def run(self) -> int:
+        """Runs workflow and records its resource usage
+
+        Returns:
+            int: Exit code of workflow (128 + signal number if run is stopped before workflow is started)
+        """
+        
+        installSignalHandlers()
+        if stopRequested.is_set():
+            logging.warning("%s is not started, run is stopped", self.name)
+            return getStopExitCode()
+        
+        logFile = open(self.logFileName, "wb") if self.logFileName is not None else None
+        startTime = time.monotonic()
+        with runningExecutorsLock:
+            runningExecutors.add(self)
+        try:
+            self.process = subprocess.Popen(self.commandToRun, shell = True, cwd = self.cwd, stdin = subprocess.DEVNULL, stdout = subprocess.PIPE, stderr = subprocess.PIPE, start_new_session = True)
+            if stopRequested.is_set():
+                self.stop(stopSignalNumber) # signal arrived while workflow was started
+            threads = [threading.Thread(target = self.streamOutput, args = (self.process.stdout, sys.stdout.buffer, logFile), daemon = True), threading.Thread(target = self.streamOutput, args = (self.process.stderr, sys.stderr.buffer, logFile), daemon = True)]
+            if self.resourceMonitor is None:
+                threads.append(threading.Thread(target = self.sampleTreeRss, daemon = True))
+            for thread in threads:
+                thread.start()
+            if self.resourceMonitor is not None:
+                self.resourceMonitor.start(self.process.pid) # monitor samples process tree, so it is not scanned twice
+            
+            returnCode, resourceUsage = self.waitProcess()
+            wallTime = time.monotonic() - startTime
+            self.finished.set()
+            if self.resourceMonitor is not None:
+                self.resourceMonitor.stop()
+                self.peakTreeRssKb = self.resourceMonitor.peakTreeRssKb
+            for thread in threads:
+                thread.join()
+        finally:
+            with runningExecutorsLock:
+                runningExecutors.discard(self)
+            if logFile is not None:
+                logFile.close()
+        
+        self.stats = {
+            "command": self.commandToRun,
+            "exitCode": returnCode,
+            "wallTime": round(wallTime, 3),
+            "userTime": round(resourceUsage.ru_utime, 3),
+            "systemTime": round(resourceUsage.ru_stime, 3),
+            "cpuTime": round(resourceUsage.ru_utime + resourceUsage.ru_stime, 3),
+            "maxRssKb": resourceUsage.ru_maxrss,
+            "peakTreeRssKb": max(self.peakTreeRssKb, resourceUsage.ru_maxrss)
+            }
+        self.report()
+        return returnCode
+    
+    def report(self) -> None:
+        """Logs exit code and resource usage of workflow and writes them to stats file"""
+        
+        logFunction = logging.info if self.stats["exitCode"] == 0 else logging.error
+        logFunction("%s finished with exit code %d (wall time: %.1f s, CPU time: %.1f s, peak RSS: %.1f MB, peak RSS of largest process: %.1f MB)", self.name, self.stats["exitCode"], self.stats["wallTime"], self.stats["cpuTime"], self.stats["peakTreeRssKb"] / 1024, self.stats["maxRssKb"] / 1024)
+        if self.logFileName is not None:
+            logging.info("%s output is written to %s", self.name, self.logFileName)
+        if self.statsFileName is not None:
+            writeFileAtomic(self.statsFileName, json.dumps(self.stats, indent = 2).encode("utf-8"))
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes live resource monitor of O2 workflow process trees (Developer package)
+
+import csv
+import json
+import logging
+import os
+import threading
+import time
+
+from .processExecutor import getProcessTree, getRssKb
+from .utils import writeFileAtomic
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# Columns of time series (one row per process and sample)
+MONITOR_FIELDS = ["time", "pid", "device", "cpuPercent", "rssKb", "pssKb", "shmKb", "readBytes", "writeBytes"]
+
+
+def readProcFile(pid: int, fileName: str) -> str:
+    """Reads a /proc file of a process (None if process is finished or file can't be read)"""
+    
+    try:
+        with open(f"/proc/{pid}/{fileName}") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def getDeviceName(pid: int) -> str:
+    """Returns DPL device name of a process (--id argument of DPL devices, else executable name)"""
+    
+    cmdline = readProcFile(pid, "cmdline")
+    if not cmdline:
+        return None
+    args = cmdline.rstrip("\0").split("\0")
+    if "--id" in args[:-1]:
+        return args[args.index("--id") + 1]
+    return os.path.basename(args[0])
+
+
+def getCpuTicks(pid: int) -> tuple:
+    """Returns CPU time (user + system) and start time of a process in clock ticks (None if process is finished)"""
+    
+    stat = readProcFile(pid, "stat")
+    if stat is None:
+        return None
+    # Fields after process name (it can include spaces), utime and stime are fields 14 and 15, starttime is field 22
+    fields = stat[stat.rindex(")") + 2 :].split()
+    return int(fields[11]) + int(fields[12]), int(fields[19])
+
+
+def getPssKb(pid: int) -> int:
+    """Returns proportional set size of a process in kB (None if smaps_rollup is not available)"""
+    
+    smapsRollup = readProcFile(pid, "smaps_rollup")
+    if smapsRollup is None:
+        return None
+    for line in smapsRollup.splitlines():
+        if line.startswith("Pss:"):
+            return int(line.split()[1])
+    return None
+
+
+def getIoBytes(pid: int) -> tuple:
+    """Returns bytes read and written by a process (files, pipes and sockets), (None, None) if they can't be read"""
+    
+    io = readProcFile(pid, "io")
+    if io is None:
+        return None, None
+    counters = dict(line.split(": ") for line in io.splitlines() if ": " in line)
+    return int(counters.get("rchar", 0)), int(counters.get("wchar", 0))
+
+
+def getShmUsedKb() -> int:
+    """Returns used space of /dev/shm in kB (shared memory segments of DPL devices), None if it is not available"""
+    
+    try:
+        shmStat = os.statvfs("/dev/shm")
+    except OSError:
+        return None
+    return (shmStat.f_blocks - shmStat.f_bfree) * shmStat.f_frsize // 1024
+
+
+def getUptime() -> float:
+    with open("/proc/uptime") as f:
+        return float(f.read().split()[0])
+
+
+class ResourceMonitor(object):
+    
+    """Samples CPU usage, RSS, PSS, /dev/shm usage and I/O bytes of every process of a workflow (the DPL devices of
+    commandToRun) from /proc in a background thread. Samples are written as time series (CSV or JSONL, one row per
+    process and sample) and a per-device summary is written at the end, so devices which dominate cost can be found.
+
+    Args:
+        timeSeriesFileName (str): Time series file (.csv or .jsonl)
+        summaryFileName (str): Per-device summary JSON file
+        interval (float, optional): Sampling interval in seconds. Defaults to 1.0.
+    """
+    
+    def __init__(self, timeSeriesFileName: str, summaryFileName: str, interval: float = 1.0) -> None:
+        self.timeSeriesFileName = timeSeriesFileName
+        self.summaryFileName = summaryFileName
+        self.interval = interval
+        self.rootPid = None
+        self.thread = None
+        self.stopped = threading.Event()
+        self.startTime = None
+        self.lastCpuTicks = {} # pid: (CPU ticks, uptime) of last sample
+        self.devices = {}
+        self.peakShmKb = 0
+        self.peakTreeRssKb = 0
+        self.peakTreePssKb = 0
+        self.sampleCount = 0
+    
+    def start(self, rootPid: int) -> None:
+        """Starts sampling process tree of root process (e.g. shell of workflow pipeline)"""
+        
+        self.rootPid = rootPid
+        self.startTime = time.monotonic()
+        if not os.path.isdir("/proc"):
+            logging.warning("Resource monitor needs /proc file system, workflow is not monitored")
+            return
+        self.thread = threading.Thread(target = self.run, daemon = True)
+        self.thread.start()
+    
+    def stop(self) -> dict:
+        """Stops sampling and writes per-device summary
+
+        Returns:
+            dict: Per-device summary
+        """
+        
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        summary = self.getSummary()
+        writeFileAtomic(self.summaryFileName, json.dumps(summary, indent = 2).encode("utf-8"))
+        self.report(summary)
+        return summary
+    
+    def run(self) -> None:
+        """Samples process tree until monitor is stopped"""
+        
+        isJson = self.timeSeriesFileName.endswith(".jsonl")
+        with open(self.timeSeriesFileName, "w", newline = "") as timeSeriesFile:
+            writer = None if isJson else csv.DictWriter(timeSeriesFile, fieldnames = MONITOR_FIELDS)
+            if writer is not None:
+                writer.writeheader()
+            while True:
+                for row in self.sample():
+                    if writer is None:
+                        timeSeriesFile.write(json.dumps(row, separators = (",", ":")) + "\n")
+                    else:
+                        writer.writerow(row)
+                timeSeriesFile.flush()
+                if self.stopped.wait(self.interval):
+                    break
+    
+    def sample(self) -> list:
+        """Takes one sample of all processes in process tree and updates per-device summary
+
+        Returns:
+            list: Rows of time series
+        """
+        
+        sampleTime = round(time.monotonic() - self.startTime, 3)
+        uptime = getUptime()
+        shmKb = getShmUsedKb()
+        rows = []
+        for pid in getProcessTree(self.rootPid):
+            device = getDeviceName(pid)
+            cpuTicks = getCpuTicks(pid)
+            if device is None or cpuTicks is None:
+                continue # process is finished in the meantime
+            ticks, startTicks = cpuTicks
+            lastTicks, lastUptime = self.lastCpuTicks.get(pid, (0, startTicks / CLOCK_TICKS))
+            elapsed = uptime - lastUptime
+            cpuPercent = round(100 * (ticks-lastTicks) / CLOCK_TICKS / elapsed, 1) if elapsed > 0 else 0.0
+            self.lastCpuTicks[pid] = (ticks, uptime)
+            readBytes, writeBytes = getIoBytes(pid)
+            row = {
+                "time": sampleTime,
+                "pid": pid,
+                "device": device,
+                "cpuPercent": cpuPercent,
+                "rssKb": getRssKb(pid),
+                "pssKb": getPssKb(pid),
+                "shmKb": shmKb,
+                "readBytes": readBytes,
+                "writeBytes": writeBytes
+                }
+            rows.append(row)
+            self.updateDevice(row, ticks)
+        
+        self.sampleCount += 1
+        self.peakShmKb = max(self.peakShmKb, shmKb or 0)
+        self.peakTreeRssKb = max(self.peakTreeRssKb, sum(row["rssKb"] for row in rows))
+        self.peakTreePssKb = max(self.peakTreePssKb, sum(row["pssKb"] or 0 for row in rows))
+        return rows
+    
+    def updateDevice(self, row: dict, ticks: int) -> None:
+        """Updates per-device summary with a sample of a process (processes of a device are summed)"""
+        
+        device = self.devices.setdefault(row["device"], {
+            "pids": {},
+            "peakRssKb": 0,
+            "peakPssKb": 0,
+            "peakCpuPercent": 0.0
+            })
+        device["pids"][row["pid"]] = (ticks, row["readBytes"] or 0, row["writeBytes"] or 0)
+        device["peakRssKb"] = max(device["peakRssKb"], row["rssKb"])
+        device["peakPssKb"] = max(device["peakPssKb"], row["pssKb"] or 0)
+        device["peakCpuPercent"] = max(device["peakCpuPercent"], row["cpuPercent"])
+    
+    def getSummary(self) -> dict:
+        """Returns per-device summary (devices are sorted by CPU time)"""
+        
+        duration = time.monotonic() - self.startTime if self.startTime is not None else 0
+        devices = []
+        for name, device in self.devices.items():
+            cpuTime = sum(ticks for ticks, readBytes, writeBytes in device["pids"].values()) / CLOCK_TICKS
+            devices.append(
+                {
+                    "device": name,
+                    "processes": len(device["pids"]),
+                    "cpuTime": round(cpuTime, 2),
+                    "meanCpuPercent": round(100 * cpuTime / duration, 1) if duration > 0 else 0.0,
+                    "peakCpuPercent": device["peakCpuPercent"],
+                    "peakRssKb": device["peakRssKb"],
+                    "peakPssKb": device["peakPssKb"],
+                    "readBytes": sum(readBytes for ticks, readBytes, writeBytes in device["pids"].values()),
+                    "writeBytes": sum(writeBytes for ticks, readBytes, writeBytes in device["pids"].values())
+                    }
+                )
+        devices.sort(key = lambda device: device["cpuTime"], reverse = True)
+        return {
+            "duration": round(duration, 3),
+            "interval": self.interval,
+            "samples": self.sampleCount,
+            "peakTreeRssKb": self.peakTreeRssKb,
+            "peakTreePssKb": self.peakTreePssKb,
+            "peakShmKb": self.peakShmKb,
+            "devices": devices
+            }
+    
+    def report(self, summary: dict, topDevices: int = 5) -> None:
+        """Logs devices with the highest CPU time"""
+        
+        logging.info("Resource monitor: %d samples, peak PSS of workflow: %.1f MB, peak /dev/shm usage: %.1f MB (time series: %s, summary: %s)", summary["samples"], summary["peakTreePssKb"] / 1024, summary["peakShmKb"] / 1024, self.timeSeriesFileName, self.summaryFileName)
+        for device in summary["devices"][: topDevices]:
+            logging.info(" - %s : CPU time %.1f s (mean %.1f %%), peak RSS %.1f MB, peak PSS %.1f MB, read %.1f MB, written %.1f MB", device["device"], device["cpuTime"], device["meanCpuPercent"], device["peakRssKb"] / 1024, device["peakPssKb"] / 1024, device["readBytes"] / 1024 / 1024, device["writeBytes"] / 1024 / 1024)
+
+
+def createResourceMonitor(directory: str, interval: float = None, timeSeriesFormat: str = "csv"):
+    """Returns resource monitor which writes monitor.csv (or monitor.jsonl) and monitorSummary.json to a directory
+
+    Args:
+        directory (str): Output directory of monitor files (e.g. run directory or work directory of shard)
+        interval (float, optional): Sampling interval in seconds. Defaults to None (no monitor).
+        timeSeriesFormat (str, optional): Format of time series (csv or jsonl). Defaults to "csv".
+
+    Returns:
+        ResourceMonitor: Resource monitor, or None if interval is None
+    """
+    
+    if interval is None:
+        return None
+    return ResourceMonitor(os.path.join(directory, f"monitor.{timeSeriesFormat}"), os.path.join(directory, "monitorSummary.json"), interval)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes isolated work directories of run script invocations (Developer package)
+
+import os
+import tempfile
+import time
+
+# Environment variable for default root of run directories (same as --run-dir-root)
+RUN_DIR_ROOT_ENV = "O2DQ_RUN_DIR_ROOT"
+
+
+class RunDirectory(object):
+    
+    """Work directory of one run script invocation. All generated files of a run (temp JSON configs, AOD
+    reader/writer descriptors, reduced AODs and log files) are placed with getPath, so concurrent runs from
+    one directory don't overwrite each other's files.
+
+    If root is None, files are placed in current working directory with their fixed names (legacy mode),
+    else a unique directory is created under root for each invocation (e.g. runs/tableMaker_20230518_142501_x1b2c3/)
+    and the workflow runs in it, so its outputs (e.g. AnalysisResults.root, dpl-config.json) are written there too.
+
+    Args:
+        root (str, optional): Root directory of run directories. Defaults to None (current working directory).
+        name (str, optional): Prefix of run directory name (e.g. workflow name). Defaults to "run".
+    """
+    
+    def __init__(self, root: str = None, name: str = "run") -> None:
+        self.root = root
+        self.name = name
+        self.dirName = None
+        if root is not None:
+            os.makedirs(root, exist_ok = True)
+            self.dirName = os.path.abspath(tempfile.mkdtemp(prefix = f"{name}_{time.strftime('%Y%m%d_%H%M%S')}_", dir = root))
+    
+    def isIsolated(self) -> bool:
+        return self.dirName is not None
+    
+    def getPath(self, fileName: str) -> str:
+        """Returns path of a generated file of this run
+
+        Args:
+            fileName (str): File name (e.g. tempConfigTableMaker.json)
+
+        Returns:
+            str: Path in run directory, or the file name itself in legacy mode
+        """
+        
+        if self.dirName is None:
+            return fileName
+        return os.path.join(self.dirName, fileName)
+
+
+def getDefaultRunDirRoot():
+    """Returns default root of run directories from O2DQ_RUN_DIR_ROOT environment variable (None if it is not set)"""
+    
+    return os.environ.get(RUN_DIR_ROOT_ENV) or None
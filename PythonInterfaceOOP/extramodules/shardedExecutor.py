@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes sharded parallel execution of O2 workflows over AO2D file lists (Developer package)
+
+import glob
+import heapq
+import json
+import logging
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from .aodListValidator import readAodList
+from .processExecutor import ProcessExecutor, getStopExitCode, installSignalHandlers
+from .resourceMonitor import createResourceMonitor
+from .runDirectory import RunDirectory
+from .utils import loadJson, writeFileAtomic
+
+# Merge commands of shard outputs by output file name ({output}: merged file, {inputs}: shard outputs, {inputList}: text file with shard outputs)
+DEFAULT_MERGE_COMMANDS = {
+    "AnalysisResults.root": "hadd -f {output} {inputs}",
+    "reducedAod.root": "o2-aod-merger --input {inputList} --output {output}",
+    "dileptonAOD.root": "o2-aod-merger --input {inputList} --output {output}"
+    }
+
+AOD_WRITER_JSON_REGEX = re.compile(r"--aod-writer-json (\S+)")
+
+SHARD_PLAN_VERSION = 1
+
+
+def statAodFiles(aodFiles: list, maxWorkers: int = 32) -> list:
+    """Gets sizes of AO2D files concurrently (stat calls on network file systems are slow one by one)
+
+    Args:
+        aodFiles (list): AO2D files
+        maxWorkers (int, optional): Maximum number of concurrent stat calls. Defaults to 32.
+
+    Returns:
+        list: Size in bytes of each AO2D file (None for remote files and files which can't be accessed)
+    """
+    
+    def getSize(aodFile):
+        if "://" in aodFile:
+            return None
+        try:
+            return os.stat(aodFile).st_size
+        except OSError:
+            logging.warning("%s could not be accessed, its size is estimated", aodFile)
+            return None
+    
+    if not aodFiles:
+        return []
+    with ThreadPoolExecutor(max_workers = min(maxWorkers, len(aodFiles))) as executor:
+        return list(executor.map(getSize, aodFiles))
+
+
+def packShards(aodFiles: list, aodSizes: list, nShards: int, minShardBytes: int = 0) -> list:
+    """Packs AO2D files into shards by bytes with longest-processing-time-first bin packing: files are assigned from
+    the largest to the smallest one to the shard with the least bytes. The number of shards is reduced so each shard has
+    at least minShardBytes (tiny files share shards, so startup cost of workflows is amortised). If no size is known
+    (e.g. all AO2D files are remote), files are packed by count and the number of shards is not reduced.
+
+    Args:
+        aodFiles (list): AO2D files
+        aodSizes (list): Size in bytes of each AO2D file (None if unknown, the mean of known sizes is used)
+        nShards (int): Maximum number of shards
+        minShardBytes (int, optional): Minimum bytes of a shard. Defaults to 0.
+
+    Returns:
+        list: Shards as dicts with "bytes" and "files" (AO2D files with their sizes in list order)
+    """
+    
+    knownSizes = [size for size in aodSizes if size is not None]
+    defaultSize = sum(knownSizes) // len(knownSizes) if knownSizes else 1
+    sizes = [defaultSize if size is None else size for size in aodSizes]
+    
+    totalBytes = sum(sizes)
+    requestedShards = nShards
+    if minShardBytes > 0 and knownSizes:
+        nShards = min(nShards, totalBytes // minShardBytes)
+    nShards = max(1, min(nShards, len(aodFiles)))
+    if nShards < requestedShards:
+        logging.info("Number of shards is reduced from %d to %d (%d AO2D files, %.1f MB in total, minimum shard size: %.1f MB)", requestedShards, nShards, len(aodFiles), totalBytes / 1024 / 1024, minShardBytes / 1024 / 1024)
+    
+    # LPT: largest file to the shard with the least bytes (heap of (bytes, shard index))
+    heap = [(0, index) for index in range(nShards)]
+    assignedShards = [None] * len(aodFiles)
+    for fileIndex in sorted(range(len(aodFiles)), key = lambda fileIndex: (-sizes[fileIndex], fileIndex)):
+        shardBytes, shardIndex = heapq.heappop(heap)
+        assignedShards[fileIndex] = shardIndex
+        heapq.heappush(heap, (shardBytes + sizes[fileIndex], shardIndex))
+    
+    shards = [{
+        "bytes": 0,
+        "files": []
+        } for index in range(nShards)]
+    for fileIndex, shardIndex in enumerate(assignedShards):
+        shards[shardIndex]["bytes"] += sizes[fileIndex]
+        shards[shardIndex]["files"].append({
+            "path": aodFiles[fileIndex],
+            "bytes": aodSizes[fileIndex]
+            })
+    return [shard for shard in shards if shard["files"]]
+
+
+def dumpShardPlan(fileName: str, shards: list) -> None:
+    """Writes shard plan as JSON (see packShards), it can be reused with --shard-plan"""
+    
+    shardPlan = {
+        "version": SHARD_PLAN_VERSION,
+        "totalBytes": sum(shard["bytes"] for shard in shards),
+        "shards": shards
+        }
+    writeFileAtomic(fileName, json.dumps(shardPlan, indent = 2).encode("utf-8"))
+
+
+def isShardPlanOf(shards: list, aodFiles: list) -> bool:
+    """Returns True if shards of a shard plan include exactly the given AO2D files"""
+    
+    return sorted(aodFile["path"] for shard in shards for aodFile in shard["files"]) == sorted(aodFiles)
+
+
+def loadShardPlan(fileName: str) -> list:
+    """Loads shards of a shard plan JSON (see dumpShardPlan)
+
+    Raises:
+        ValueError: If shard plan has another version or no shards
+    """
+    
+    shardPlan = loadJson(fileName)
+    if not isinstance(shardPlan, dict) or shardPlan.get("version") != SHARD_PLAN_VERSION or not shardPlan.get("shards"):
+        raise ValueError(f"{fileName} is not a valid shard plan (version {SHARD_PLAN_VERSION})")
+    return shardPlan["shards"]
+
+
+def parseMergeCommands(mergeCommandArgs: list) -> dict:
+    """Returns merge commands with overrides from CLI (--merge-command FILE=COMMAND)
+
+    Raises:
+        ValueError: If an override is not in FILE=COMMAND format
+    """
+    
+    mergeCommands = dict(DEFAULT_MERGE_COMMANDS)
+    for mergeCommandArg in mergeCommandArgs or []:
+        outputFileName, separator, command = mergeCommandArg.partition("=")
+        if not separator or not outputFileName:
+            raise ValueError(f"Invalid merge command {mergeCommandArg} (expected FILE=COMMAND)")
+        mergeCommands[outputFileName] = command
+    return mergeCommands
+
+
+class ShardedExecutor(object):
+    
+    """Runs an O2 workflow over an AO2D file list in shards. Each shard has its own work directory with a copy of the
+    workflow configuration that reads only the AO2D files of the shard, so shard outputs (e.g. AnalysisResults.root,
+    reducedAod.root) don't overwrite each other. At most maxParallel shards run at the same time. Then outputs of
+    shards are merged with merge commands (see DEFAULT_MERGE_COMMANDS).
+
+    Args:
+        commandToRun (str): Command To Run for whole AO2D list
+        configFileName (str): Final JSON configuration file of workflow (used in commandToRun)
+        shards (list): Shards with their AO2D files (see packShards)
+        maxParallel (int, optional): Maximum number of shards running at the same time. Defaults to number of CPUs.
+        workDir (str, optional): Directory for work directories of shards. Defaults to current directory.
+        outputDir (str, optional): Directory for merged outputs. Defaults to current directory.
+        mergeCommands (dict, optional): Merge commands by output file name. Defaults to DEFAULT_MERGE_COMMANDS.
+        monitorInterval (float, optional): Sampling interval of resource monitor of each shard. Defaults to None (no monitor).
+        monitorFormat (str, optional): Format of resource monitor time series (csv or jsonl). Defaults to "csv".
+    """
+    
+    def __init__(self, commandToRun: str, configFileName: str, shards: list, maxParallel: int = None, workDir: str = ".", outputDir: str = ".", mergeCommands: dict = None, monitorInterval: float = None, monitorFormat: str = "csv") -> None:
+        self.commandToRun = commandToRun
+        self.configFileName = configFileName
+        self.shards = shards
+        self.maxParallel = max(1, min(maxParallel or os.cpu_count() or 1, len(shards)))
+        self.outputDir = outputDir
+        self.mergeCommands = DEFAULT_MERGE_COMMANDS if mergeCommands is None else mergeCommands
+        self.monitorInterval = monitorInterval
+        self.monitorFormat = monitorFormat
+        os.makedirs(workDir, exist_ok = True)
+        self.shardsDir = tempfile.mkdtemp(prefix = "shards_", dir = workDir) # unique, so outputs of old runs are never merged
+    
+    def prepareShard(self, index: int, shardFiles: list, config: dict) -> tuple:
+        """Creates work directory of a shard with its AO2D list, configuration and AOD writer descriptors
+
+        Returns:
+            tuple: Work directory and Command To Run of shard
+        """
+        
+        shardDir = os.path.abspath(os.path.join(self.shardsDir, f"shard_{index:03d}"))
+        os.makedirs(shardDir)
+        aodListFileName = os.path.join(shardDir, "aodList.txt")
+        writeFileAtomic(aodListFileName, "".join(f"{aodFile['path']}\n" for aodFile in shardFiles).encode("utf-8"))
+        
+        shardConfig = dict(config)
+        shardConfig["internal-dpl-aod-reader"] = {
+            **config.get("internal-dpl-aod-reader", {}), "aod-file": f"@{aodListFileName}"
+            }
+        shardConfigFileName = os.path.join(shardDir, os.path.basename(self.configFileName))
+        writeFileAtomic(shardConfigFileName, json.dumps(shardConfig, indent = 2).encode("utf-8"))
+        
+        command = self.commandToRun.replace(f"json://{self.configFileName}", f"json://{shardConfigFileName}")
+        command = AOD_WRITER_JSON_REGEX.sub(lambda match: f"--aod-writer-json {self.prepareWriterConfig(match.group(1), shardDir)}", command)
+        return shardDir, command
+    
+    @staticmethod
+    def prepareWriterConfig(writerConfigFileName: str, shardDir: str) -> str:
+        """Copies AOD writer descriptor into work directory of shard, so produced AO2D file is written there"""
+        
+        shardWriterConfigFileName = os.path.join(shardDir, os.path.basename(writerConfigFileName))
+        if not os.path.isfile(shardWriterConfigFileName):
+            writerConfig = loadJson(writerConfigFileName)
+            outputDirector = writerConfig.get("OutputDirector", {})
+            if "resfile" in outputDirector:
+                outputDirector["resfile"] = os.path.basename(outputDirector["resfile"])
+            writeFileAtomic(shardWriterConfigFileName, json.dumps(writerConfig, indent = 2).encode("utf-8"))
+        return shardWriterConfigFileName
+    
+    def runShard(self, index: int, shardDir: str, command: str) -> int:
+        """Runs workflow of a shard in its work directory (output is written to O2.log of shard)"""
+        
+        logging.info("Shard %d started in %s", index, shardDir)
+        resourceMonitor = createResourceMonitor(shardDir, self.monitorInterval, self.monitorFormat)
+        processExecutor = ProcessExecutor(command, os.path.join(shardDir, "O2.log"), os.path.join(shardDir, "workflowStats.json"), echo = False, cwd = shardDir, name = f"Shard {index}", resourceMonitor = resourceMonitor)
+        return processExecutor.run()
+    
+    def mergeOutputs(self, shardDirs: list) -> int:
+        """Merges ROOT outputs of shards into output directory
+
+        Returns:
+            int: 0 if all outputs are merged, else exit code of first failed merge (1 if there is no merge command)
+        """
+        
+        shardOutputs = {}
+        for shardDir in shardDirs:
+            for shardOutput in sorted(glob.glob(os.path.join(shardDir, "*.root"))):
+                shardOutputs.setdefault(os.path.basename(shardOutput), []).append(shardOutput)
+        
+        returnCode = 0
+        for outputFileName, inputs in shardOutputs.items():
+            output = os.path.join(self.outputDir, outputFileName)
+            if len(inputs) == 1:
+                shutil.copyfile(inputs[0], output)
+                logging.info("%s is copied from the only shard which produced it", output)
+                continue
+            if outputFileName not in self.mergeCommands:
+                logging.error("There is no merge command for %s, shard outputs are kept in %s", outputFileName, self.shardsDir)
+                returnCode = returnCode or 1
+                continue
+            
+            inputListFileName = os.path.join(self.shardsDir, f"{outputFileName}.inputs.txt")
+            writeFileAtomic(inputListFileName, "".join(f"{shardOutput}\n" for shardOutput in inputs).encode("utf-8"))
+            mergeCommand = self.mergeCommands[outputFileName].format(output = shlex.quote(output), inputs = " ".join(shlex.quote(shardOutput) for shardOutput in inputs), inputList = shlex.quote(inputListFileName))
+            logging.info("Merging %d shard outputs into %s: %s", len(inputs), output, mergeCommand)
+            with open(os.path.join(self.shardsDir, f"{outputFileName}.merge.log"), "wb") as logFile:
+                mergeReturnCode = subprocess.run(mergeCommand, shell = True, stdout = logFile, stderr = subprocess.STDOUT).returncode
+            if mergeReturnCode != 0:
+                logging.error("Merging %s failed with exit code %d (see %s)", output, mergeReturnCode, logFile.name)
+                returnCode = returnCode or mergeReturnCode
+        return returnCode
+    
+    def run(self) -> int:
+        """Runs all shards with bounded concurrency and merges their outputs
+
+        Returns:
+            int: 0 if all shards and merges succeeded, else first non-zero exit code
+        """
+        
+        config = loadJson(self.configFileName)
+        preparedShards = [self.prepareShard(index, shard["files"], config) for index, shard in enumerate(self.shards)]
+        
+        shardPlanFileName = os.path.join(self.shardsDir, "shardPlan.json")
+        dumpShardPlan(shardPlanFileName, self.shards)
+        logging.info("%d AO2D files are packed into %d shards, %d shards run at the same time (shard plan: %s)", sum(len(shard["files"]) for shard in self.shards), len(self.shards), self.maxParallel, shardPlanFileName)
+        for index, shard in enumerate(self.shards):
+            logging.debug("Shard %d: %d files, %d bytes", index, len(shard["files"]), shard["bytes"])
+        
+        with ThreadPoolExecutor(max_workers = self.maxParallel) as executor:
+            returnCodes = list(executor.map(lambda args: self.runShard(*args), ((index, shardDir, command) for index, (shardDir, command) in enumerate(preparedShards))))
+        
+        if getStopExitCode() is not None:
+            logging.error("Sharded run is stopped, outputs are not merged")
+            return getStopExitCode()
+        failedShards = [index for index, returnCode in enumerate(returnCodes) if returnCode != 0]
+        if failedShards:
+            logging.error("Shards %s failed, outputs are not merged", ", ".join(str(index) for index in failedShards))
+            return next(returnCode for returnCode in returnCodes if returnCode != 0)
+        return self.mergeOutputs([shardDir for shardDir, command in preparedShards])
+
+
+def runWorkflow(commandToRun: str, configFileName: str, allArgs: dict, runDirectory: RunDirectory = None) -> int:
+    """Runs generated O2 workflow, in shards if --shards is set and AO2D files are provided as text list (@list.txt)
+
+    Args:
+        commandToRun (str): Command To Run
+        configFileName (str): Final JSON configuration file of workflow (used in commandToRun)
+        allArgs (dict): All provided args in CLI
+        runDirectory (RunDirectory, optional): Work directory of run for shards and merged outputs. Defaults to current directory.
+
+    Returns:
+        int: Exit status of workflow
+    """
+    
+    installSignalHandlers() # SIGINT and SIGTERM stop all workflows of run (see stopRunningExecutors)
+    nShards = allArgs.get("shards") or 1
+    monitorInterval = allArgs.get("monitor_interval") if allArgs.get("monitor") else None
+    monitorFormat = allArgs.get("monitor_format") or "csv"
+    if nShards > 1:
+        aodFile = loadJson(configFileName).get("internal-dpl-aod-reader", {}).get("aod-file", "")
+        if aodFile.startswith("@"):
+            runDirectory = runDirectory or RunDirectory()
+            outputDir = runDirectory.dirName or "."
+            aodFiles = readAodList(aodFile[1 :], deduplicate = True)
+            if allArgs.get("shard_plan"):
+                shards = loadShardPlan(allArgs["shard_plan"])
+                if not isShardPlanOf(shards, aodFiles):
+                    logging.error("Shard plan %s is not created for AO2D files of %s, remove --shard-plan to create a new plan", allArgs["shard_plan"], aodFile[1 :])
+                    return 1
+            else:
+                shards = packShards(aodFiles, statAodFiles(aodFiles), nShards, int((allArgs.get("min_shard_size") or 0) * 1024 * 1024))
+            shardedExecutor = ShardedExecutor(commandToRun, configFileName, shards, allArgs.get("max_parallel"), outputDir, outputDir, parseMergeCommands(allArgs.get("merge_command")), monitorInterval, monitorFormat)
+            return shardedExecutor.run()
+        logging.warning("--shards needs AO2D files as text list (@list.txt), workflow runs without shards")
+    runDirectory = runDirectory or RunDirectory()
+    # In isolated run directory, workflow runs in it (AO2D input is already absolute, see WorkflowBuilder)
+    resourceMonitor = createResourceMonitor(runDirectory.dirName or ".", monitorInterval, monitorFormat)
+    processExecutor = ProcessExecutor(commandToRun, runDirectory.getPath("O2.log"), runDirectory.getPath("workflowStats.json"), cwd = runDirectory.dirName, resourceMonitor = resourceMonitor)
+    return processExecutor.run()
@@ -18,6 +18,10 @@
 import json
 import re
 import logging
+import mmap
+import os
+import pickle
+import threading
 
 
 def listToString(s: list):
@@ -94,6 +98,42 @@ def writeFile(openFile: str, writeFile: str):
     f.close()
 
 
+def writeFileAtomic(fileName: str, content: bytes) -> None:
+    """Atomic write a file util function (readers never see a partially written file)
+
+    Raises:
+        OSError: If file could not be written
+    """
+    
+    tempFileName = f"{fileName}.{os.getpid()}.{threading.get_ident()}.tmp" # unique for concurrent writers
+    try:
+        with open(tempFileName, "wb") as f:
+            f.write(content)
+        os.replace(tempFileName, fileName)
+    except BaseException:
+        if os.path.isfile(tempFileName):
+            os.remove(tempFileName)
+        raise
+
+
+def iterMappedLines(fileName: str, encoding = "utf-8"):
+    """Memory-mapped line reader util function (pages are loaded by OS on demand, file is not copied into one string)
+
+    Raises:
+        OSError: If file could not be opened
+
+    Yields:
+        str: Lines of file (with line endings)
+    """
+    
+    with open(fileName, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return # empty files can't be mapped
+        with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mappedFile:
+            for line in iter(mappedFile.readline, b""):
+                yield line.decode(encoding)
+
+
 def loadJson(fileName: str) -> dict:
     """JSON Loader util function"""
     
@@ -108,6 +148,43 @@ def dumpJson(updatedConfigFileName: str, config: dict, indent = 2) -> None:
         json.dump(config, outputFile, indent = indent)
 
 
+def dumpJsonLines(fileName: str, records: list) -> None:
+    """Atomic JSON Lines dump util function (one JSON object per line)"""
+    
+    content = "".join(json.dumps(record) + "\n" for record in records)
+    writeFileAtomic(fileName, content.encode("utf-8"))
+
+
+def loadPickle(fileName: str):
+    """Pickle loader util function for cache files
+
+    Returns:
+        Any: Loaded object or None if file is not found or it is corrupted
+    """
+    
+    try:
+        with open(fileName, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError, ValueError):
+        return None
+
+
+def dumpPickle(fileName: str, obj) -> bool:
+    """Atomic pickle dump util function for cache files (readers never see a partially written file)
+
+    Returns:
+        bool: True if file is written
+    """
+    
+    try:
+        writeFileAtomic(fileName, pickle.dumps(obj, protocol = pickle.HIGHEST_PROTOCOL))
+        return True
+    except OSError as error:
+        # Cache files are only an optimization, read-only installations still work without them
+        logging.debug("%s could not be written: %s", fileName, error)
+        return False
+
+
 """
 def dumpYaml(updatedConfigFileName: str, config: dict) -> None:
     import yaml
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes in-memory builder of final workflow configuration for run scripts (Developer package)
+
+import json
+import logging
+import os
+
+from .aodListValidator import readAodList
+from .utils import writeFileAtomic
+
+
+class WorkflowBuilder(object):
+    
+    """Keeps configs of a workflow in memory and writes the final configuration file once. In parallel sessions
+    (skimming and analysis at the same time), the analysis config is merged into the skimming config in memory, so
+    there are no intermediate JSON files. The final file is written atomically, so concurrent runs in the same
+    directory never read a partially written configuration.
+
+    If the run directory is isolated, the workflow runs in it, so AO2D input of the final config is made absolute
+    in memory before it is written (see getIsolatedAodFile).
+
+    Args:
+        configFileName (str): Final JSON configuration file name of workflow (used in O2 commands)
+        config (dict): Skimming or main task JSON config
+        indent (int, optional): Indentation of final JSON configuration file. Defaults to 2.
+        runDirectory (RunDirectory, optional): Run directory of workflow. Defaults to None (current directory).
+    """
+    
+    def __init__(self, configFileName: str, config: dict, indent: int = 2, runDirectory = None) -> None:
+        self.configFileName = configFileName
+        self.config = config
+        self.indent = indent
+        self.runDirectory = runDirectory
+        self.analysisTaskName = None
+        self.analysisConfig = None
+        self.isWritten = False
+    
+    def setAnalysisWorkflow(self, analysisTaskName: str, analysisConfig: dict) -> None:
+        """Sets analysis task which runs at the same time with skimming task
+
+        Args:
+            analysisTaskName (str): Command to Run for Analysis Task in O2 (e.g. o2-analysis-dq-table-reader)
+            analysisConfig (dict): Analysis task JSON config
+        """
+        
+        self.analysisTaskName = analysisTaskName
+        self.analysisConfig = analysisConfig
+    
+    def getMergedConfig(self) -> dict:
+        """Returns final config (skimming config has priority over analysis config)"""
+        
+        mergedConfig = self.config
+        if self.analysisConfig is not None:
+            mergedConfig = {
+                **self.analysisConfig,
+                **self.config
+                }
+        
+        readerConfig = mergedConfig.get("internal-dpl-aod-reader")
+        if self.runDirectory is not None and self.runDirectory.isIsolated() and readerConfig and readerConfig.get("aod-file"):
+            mergedConfig = {
+                **mergedConfig, "internal-dpl-aod-reader": {
+                    **readerConfig, "aod-file": self.getIsolatedAodFile(readerConfig["aod-file"])
+                    }
+                }
+        return mergedConfig
+    
+    def getIsolatedAodFile(self, aodFile: str) -> str:
+        """Returns AO2D input for a workflow which runs in the isolated run directory. AO2D text lists are copied into
+        run directory with absolute paths (and without duplicates), local files get absolute paths.
+
+        Args:
+            aodFile (str): AO2D file or text list (@list.txt) of internal-dpl-aod-reader
+
+        Returns:
+            str: AO2D input which is valid in run directory
+        """
+        
+        if aodFile.startswith("@"):
+            aodListFileName = self.runDirectory.getPath("aodList.txt")
+            writeFileAtomic(aodListFileName, "".join(f"{listedFile}\n" for listedFile in readAodList(aodFile[1 :], deduplicate = True)).encode("utf-8"))
+            return f"@{aodListFileName}"
+        if "://" not in aodFile:
+            return os.path.abspath(aodFile)
+        return aodFile
+    
+    def getParallelCommand(self, commandToRun: str, writerConfigFileName: str = "aodWriterSkimmingTempConfig.json") -> str:
+        """Appends analysis task to skimming command for parallel session run in O2
+
+        Args:
+            commandToRun (str): Command To Run for skimming task and its dependencies
+            writerConfigFileName (str, optional): AOD writer JSON of skimming task. Defaults to "aodWriterSkimmingTempConfig.json".
+
+        Raises:
+            ValueError: If analysis workflow is not set (see setAnalysisWorkflow)
+
+        Returns:
+            str: Command To Run for run analysis and skimming task at same time
+        """
+        
+        if self.analysisTaskName is None:
+            raise ValueError("Analysis workflow is not set for parallel session")
+        return f"{commandToRun} | {self.analysisTaskName} --configuration json://{self.configFileName} --aod-writer-json {writerConfigFileName} -b"
+    
+    def writeConfig(self) -> str:
+        """Writes final JSON configuration file atomically (only once, configs can't be changed after that)
+
+        Returns:
+            str: Final JSON configuration file name
+        """
+        
+        if not self.isWritten:
+            content = json.dumps(self.getMergedConfig(), indent = self.indent)
+            writeFileAtomic(self.configFileName, content.encode("utf-8"))
+            self.isWritten = True
+            logging.debug("Configuration file of workflow is written: %s", self.configFileName)
+        return self.configFileName
@@ -21,12 +21,14 @@
 
 import logging
 import logging.config
-import os
 import sys
-from extramodules.dqTranscations import depsChecker, mandatoryArgChecker, aodFileChecker, jsonTypeChecker, mainTaskChecker
+from extramodules.dqTranscations import depsChecker, mandatoryArgChecker, aodFileChecker, aodListChecker, jsonTypeChecker, mainTaskChecker
 from extramodules.configSetter import SetArgsToArgumentParser, dispInterfaceMode, dispO2HelpMessage, generateDescriptors, setConfigs, setProcessDummy, debugSettings, dispArgs, setSwitch, tableProducerAnalysis
 from extramodules.pycacheRemover import runPycacheRemover
-from extramodules.utils import dumpJson, loadJson
+from extramodules.runDirectory import RunDirectory
+from extramodules.shardedExecutor import runWorkflow
+from extramodules.utils import loadJson
+from extramodules.workflowBuilder import WorkflowBuilder
 
 # run template: `python3 runAnalysis.py <config.json> --task-name:<configurable|processFunc> parameter ...`
 # parameter can be multiple like this:
@@ -121,11 +123,16 @@ def main():
         "processElectronMuonSkimmed": [],
         }
     
+    # Work directory of this run (unique for each run if --run-dir-root is set)
+    runDirectory = RunDirectory(args.run_dir_root, "analysis")
+    
     # Debug settings
-    fileName = "tableReader.log"
+    fileName = runDirectory.getPath("tableReader.log")
     if runOverMC:
-        fileName = "dqEfficiency.log"
+        fileName = runDirectory.getPath("dqEfficiency.log")
     debugSettings(args.debug, args.logFile, fileName)
+    if runDirectory.isIsolated():
+        logging.info("Run directory: %s", runDirectory.dirName)
     
     # if cliMode true, Overrider mode else additional mode
     cliMode = args.override
@@ -156,6 +163,7 @@ def main():
     
     # Transacations
     aodFileChecker(allArgs["internal_dpl_aod_reader:aod_file"])
+    aodListChecker(config, args.validate_aod, args.cleaned_aod_list)
     depsChecker(config, sameEventPairingDeps, sameEventPairingTaskName)
     depsChecker(config, eventMixingDeps, eventMixingTaskName)
     depsChecker(config, dileptonTrackDeps, dileptonTrackTaskName)
@@ -163,18 +171,18 @@ def main():
     setProcessDummy(config, dummyHasTasks) # dummy automizer
     
     # Write the updated configuration file into a temporary file
-    updatedConfigFileName = "tempConfigTableReader.json"
+    updatedConfigFileName = runDirectory.getPath("tempConfigTableReader.json")
     if runOverMC:
-        updatedConfigFileName = "tempConfigDQEfficiency.json"
+        updatedConfigFileName = runDirectory.getPath("tempConfigDQEfficiency.json")
     
-    dumpJson(updatedConfigFileName, config)
+    WorkflowBuilder(updatedConfigFileName, config, runDirectory = runDirectory).writeConfig()
     if args.writer == "true":
         tablesToProduce = tableProducerAnalysis(config, "analysis-same-event-pairing", commonTables, barrelCommonTables, muonCommonTables, specificTables, runOverMC)
         
-        writerConfigFileName = "aodWriterAnalysisTempConfig.json"
+        writerConfigFileName = runDirectory.getPath("aodWriterAnalysisTempConfig.json")
         
         # Generate the aod-writer output descriptor json file
-        generateDescriptors("dileptonAOD", tablesToProduce, tables, writerConfigFileName, kFlag = False)
+        generateDescriptors(runDirectory.getPath("dileptonAOD"), tablesToProduce, tables, writerConfigFileName, kFlag = False)
     
     commandToRun = f"{taskNameInCommandLine} --configuration json://{updatedConfigFileName} -b"
     if args.writer == "true":
@@ -185,6 +193,7 @@ def main():
     dispO2HelpMessage(args.helpO2, commandToRun)
     
     if args.runParallel is True:
+        logging.info("Analysis config for parallel session (runTableMaker.py -runParallel --analysis-config): %s", updatedConfigFileName)
         dispArgs(allArgs)
         sys.exit()
     print("====================================================================================================================")
@@ -198,8 +207,9 @@ def main():
         print("====================================================================================================================")
     dispArgs(allArgs) # Display all args
     
-    os.system(commandToRun) # Execute O2 generated commands
+    returnCode = runWorkflow(commandToRun, updatedConfigFileName, allArgs, runDirectory) # Execute O2 generated commands (in shards if --shards is set)
     runPycacheRemover() # Run pycacheRemover
+    return returnCode # exit code of workflow is exit code of script
 
 
 if __name__ == '__main__':
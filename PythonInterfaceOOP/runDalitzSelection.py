@@ -25,11 +25,13 @@
 import sys
 import logging
 import logging.config
-import os
-from extramodules.dqTranscations import aodFileChecker, jsonTypeChecker, mainTaskChecker, trackPropagationChecker
+from extramodules.dqTranscations import aodFileChecker, aodListChecker, jsonTypeChecker, mainTaskChecker, trackPropagationChecker
 from extramodules.configSetter import SetArgsToArgumentParser, commonDepsToRun, dispInterfaceMode, dispO2HelpMessage, setConfigs, setConverters, debugSettings, dispArgs, setProcessDummy, setSwitch
 from extramodules.pycacheRemover import runPycacheRemover
-from extramodules.utils import dumpJson, loadJson
+from extramodules.runDirectory import RunDirectory
+from extramodules.shardedExecutor import runWorkflow
+from extramodules.utils import loadJson
+from extramodules.workflowBuilder import WorkflowBuilder
 
 
 def main():
@@ -45,8 +47,13 @@ def main():
     # All Dependencies
     commonDeps = ["o2-analysis-timestamp", "o2-analysis-event-selection", "o2-analysis-multiplicity-table", "o2-analysis-centrality-table", "o2-analysis-trackselection", "o2-analysis-trackextension", "o2-analysis-pid-tof-base", "o2-analysis-pid-tof-full", "o2-analysis-pid-tof-beta", "o2-analysis-pid-tpc-full"]
     
+    # Work directory of this run (unique for each run if --run-dir-root is set)
+    runDirectory = RunDirectory(args.run_dir_root, "dalitzSelection")
+    
     # Debug Settings
-    debugSettings(args.debug, args.logFile, fileName = "dalitzSelection.log")
+    debugSettings(args.debug, args.logFile, fileName = runDirectory.getPath("dalitzSelection.log"))
+    if runDirectory.isIsolated():
+        logging.info("Run directory: %s", runDirectory.dirName)
     
     # if cliMode true, Overrider mode else additional mode
     cliMode = args.override
@@ -74,13 +81,14 @@ def main():
     
     # Transactions
     aodFileChecker(allArgs["internal_dpl_aod_reader:aod_file"])
+    aodListChecker(config, args.validate_aod, args.cleaned_aod_list)
     trackPropagationChecker(args.add_track_prop, commonDeps)
     setProcessDummy(config, dummyHasTasks) # dummy automizer
     
     # Write the updated configuration file into a temporary file
-    updatedConfigFileName = "tempConfigDalitzSelection.json"
+    updatedConfigFileName = runDirectory.getPath("tempConfigDalitzSelection.json")
     
-    dumpJson(updatedConfigFileName, config)
+    WorkflowBuilder(updatedConfigFileName, config, runDirectory = runDirectory).writeConfig()
     
     # Check which dependencies need to be run
     depsToRun = commonDepsToRun(commonDeps)
@@ -102,8 +110,9 @@ def main():
     logging.info(depsToRun.keys())
     print("====================================================================================================================")
     dispArgs(allArgs) # Display all args
-    os.system(commandToRun) # Execute O2 generated commands
+    returnCode = runWorkflow(commandToRun, updatedConfigFileName, allArgs, runDirectory) # Execute O2 generated commands (in shards if --shards is set)
     runPycacheRemover() # Run pycacheRemover
+    return returnCode # exit code of workflow is exit code of script
 
 
 if __name__ == '__main__':
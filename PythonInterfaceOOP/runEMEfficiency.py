@@ -26,11 +26,13 @@
 import sys
 import logging
 import logging.config
-import os
-from extramodules.dqTranscations import mandatoryArgChecker, aodFileChecker, depsChecker, jsonTypeChecker, mainTaskChecker
+from extramodules.dqTranscations import mandatoryArgChecker, aodFileChecker, aodListChecker, depsChecker, jsonTypeChecker, mainTaskChecker
 from extramodules.configSetter import SetArgsToArgumentParser, commonDepsToRun, dispInterfaceMode, dispO2HelpMessage, setConfigs, debugSettings, setConverters, setProcessDummy, dispArgs, setSwitch
 from extramodules.pycacheRemover import runPycacheRemover
-from extramodules.utils import dumpJson, loadJson
+from extramodules.runDirectory import RunDirectory
+from extramodules.shardedExecutor import runWorkflow
+from extramodules.utils import loadJson
+from extramodules.workflowBuilder import WorkflowBuilder
 
 
 def main():
@@ -65,11 +67,16 @@ def main():
         }
     # yapf: enable
     
+    # Work directory of this run (unique for each run if --run-dir-root is set)
+    runDirectory = RunDirectory(args.run_dir_root, "emEfficiency")
+    
     # Debug Settings
-    fileName = "emEfficiencyEE.log"
+    fileName = runDirectory.getPath("emEfficiencyEE.log")
     if runOverSkimmed is False:
-        fileName = "emEfficiencyEENotSkimmed.log"
+        fileName = runDirectory.getPath("emEfficiencyEENotSkimmed.log")
     debugSettings(args.debug, args.logFile, fileName)
+    if runDirectory.isIsolated():
+        logging.info("Run directory: %s", runDirectory.dirName)
     
     # if cliMode true, Overrider mode else additional mode
     cliMode = args.override
@@ -97,6 +104,7 @@ def main():
     
     # Transactions
     aodFileChecker(allArgs["internal_dpl_aod_reader:aod_file"])
+    aodListChecker(config, args.validate_aod, args.cleaned_aod_list)
     depsChecker(config, sameEventPairingDeps, sameEventPairingTaskName)
     mandatoryArgChecker(config, taskNameInConfig, "processSkimmed")
     setProcessDummy(config, dummyHasTasks) # dummy automizer
@@ -105,11 +113,11 @@ def main():
         args.aod_memory_rate_limit = "6000000000"
     
     # Write the updated configuration file into a temporary file
-    updatedConfigFileName = "tempConfigEMEfficiencyEE.json"
+    updatedConfigFileName = runDirectory.getPath("tempConfigEMEfficiencyEE.json")
     if runOverSkimmed is False:
-        updatedConfigFileName = "tempConfigEMEfficiencyEENoSkimmed.json"
+        updatedConfigFileName = runDirectory.getPath("tempConfigEMEfficiencyEENoSkimmed.json")
     
-    dumpJson(updatedConfigFileName, config)
+    WorkflowBuilder(updatedConfigFileName, config, runDirectory = runDirectory).writeConfig()
     
     # Check which dependencies need to be run
     if runOverSkimmed is False:
@@ -134,8 +142,9 @@ def main():
         logging.info(depsToRun.keys())
         print("====================================================================================================================")
     dispArgs(allArgs) # Display all args
-    os.system(commandToRun) # Execute O2 generated commands
+    returnCode = runWorkflow(commandToRun, updatedConfigFileName, allArgs, runDirectory) # Execute O2 generated commands (in shards if --shards is set)
     runPycacheRemover() # Run pycacheRemover
+    return returnCode # exit code of workflow is exit code of script
 
 
 if __name__ == '__main__':
@@ -27,11 +27,13 @@
 import sys
 import logging
 import logging.config
-import os
-from extramodules.dqTranscations import mandatoryArgChecker, aodFileChecker, jsonTypeChecker, mainTaskChecker, trackPropagationChecker
-from extramodules.configSetter import SetArgsToArgumentParser, commonDepsToRun, dispInterfaceMode, dispO2HelpMessage, setConfigs, setParallelismOnSkimming, setProcessDummy, setConverters, debugSettings, dispArgs, generateDescriptors, setSwitch, tableProducerSkimming
+from extramodules.dqTranscations import mandatoryArgChecker, aodFileChecker, aodListChecker, jsonTypeChecker, mainTaskChecker, trackPropagationChecker
+from extramodules.configSetter import SetArgsToArgumentParser, commonDepsToRun, dispInterfaceMode, dispO2HelpMessage, setConfigs, setProcessDummy, setConverters, debugSettings, dispArgs, generateDescriptors, setSwitch, tableProducerSkimming
 from extramodules.pycacheRemover import runPycacheRemover
-from extramodules.utils import dumpJson, loadJson
+from extramodules.runDirectory import RunDirectory
+from extramodules.shardedExecutor import runWorkflow
+from extramodules.utils import loadJson
+from extramodules.workflowBuilder import WorkflowBuilder
 
 
 def main():
@@ -50,6 +52,7 @@ def main():
     
     # Setting arguments for CLI
     setArgsToArgumentParser = SetArgsToArgumentParser(parsedJsonFile, ["timestamp-task", "tof-event-time", "bc-selection-task", "tof-pid-beta"])
+    setArgsToArgumentParser.parser.add_argument("--analysis-config", help = "Analysis config of runAnalysis.py for -runParallel (defaults to tempConfigTableReader.json or tempConfigDQEfficiency.json in current directory)", action = "store", type = str)
     args = setArgsToArgumentParser.parseArgs()
     dummyHasTasks = setArgsToArgumentParser.dummyHasTasks
     processFuncs = setArgsToArgumentParser.processFuncs
@@ -149,15 +152,20 @@ def main():
         "processAmbiguousBarrelOnly": ["AmbiguousTracksMid"]
         }
     
+    # Work directory of this run (unique for each run if --run-dir-root is set)
+    runDirectory = RunDirectory(args.run_dir_root, "tableMaker")
+    
     # Debug Settings
-    fileName = "tableMaker.log"
+    fileName = runDirectory.getPath("tableMaker.log")
     if args.runParallel:
-        fileName = "fullAnalysisData.json"
+        fileName = runDirectory.getPath("fullAnalysisData.log")
     if runOverMC:
-        fileName = "tableMakerMC.log"
+        fileName = runDirectory.getPath("tableMakerMC.log")
         if args.runParallel:
-            fileName = "fullAnalysisMC.log"
+            fileName = runDirectory.getPath("fullAnalysisMC.log")
     debugSettings(args.debug, args.logFile, fileName)
+    if runDirectory.isIsolated():
+        logging.info("Run directory: %s", runDirectory.dirName)
     
     # if cliMode true, Overrider mode else additional mode
     cliMode = args.override
@@ -190,20 +198,21 @@ def main():
     
     # Transactions
     aodFileChecker(allArgs["internal_dpl_aod_reader:aod_file"])
+    aodListChecker(config, args.validate_aod, args.cleaned_aod_list)
     trackPropagationChecker(args.add_track_prop, barrelDeps)
     mandatoryArgChecker(config, taskNameInConfig, "processOnlyBCs")
     setProcessDummy(config, dummyHasTasks) # dummy automizer
     
-    # Write the updated configuration file into a temporary file
-    updatedConfigFileName = "tempConfigTableMaker.json"
+    # Final configuration file of workflow (it is written once after the workflow is built)
+    updatedConfigFileName = runDirectory.getPath("tempConfigTableMaker.json")
     if args.runParallel:
-        updatedConfigFileName = "tempConfigFullAnalysisData.json"
+        updatedConfigFileName = runDirectory.getPath("tempConfigFullAnalysisData.json")
     if runOverMC:
-        updatedConfigFileName = "tempConfigTableMakerMC.json"
+        updatedConfigFileName = runDirectory.getPath("tempConfigTableMakerMC.json")
         if args.runParallel:
-            updatedConfigFileName = "tempConfigFullAnalysisMC.json"
+            updatedConfigFileName = runDirectory.getPath("tempConfigFullAnalysisMC.json")
     
-    dumpJson(updatedConfigFileName, config)
+    workflowBuilder = WorkflowBuilder(updatedConfigFileName, config, runDirectory = runDirectory)
     
     # Check which dependencies need to be run
     depsToRun = commonDepsToRun(commonDeps)
@@ -224,10 +233,10 @@ def main():
     # Check which tables are required in the output
     tablesToProduce = tableProducerSkimming(config, taskNameInConfig, commonTables, barrelCommonTables, muonCommonTables, specificTables, specificDeps, runOverMC)
     
-    writerConfigFileName = "aodWriterSkimmingTempConfig.json"
+    writerConfigFileName = runDirectory.getPath("aodWriterSkimmingTempConfig.json")
     
     # Generate the aod-writer output descriptor json file
-    generateDescriptors("reducedAod", tablesToProduce, tables, writerConfigFileName, kFlag = False)
+    generateDescriptors(runDirectory.getPath("reducedAod"), tablesToProduce, tables, writerConfigFileName, kFlag = False)
     
     commandToRun = f"{taskNameInCommandLine} --configuration json://{updatedConfigFileName} --severity error --shm-segment-size 12000000000 --aod-writer-json {writerConfigFileName} -b"
     if args.aod_memory_rate_limit:
@@ -241,11 +250,15 @@ def main():
     
     commandToRun = setConverters(allArgs, updatedConfigFileName, commandToRun)
     
+    # Analysis config is produced by runAnalysis.py, it is merged in memory with skimming config
     if args.runParallel is True:
         if runOverMC is True:
-            commandToRun = setParallelismOnSkimming(commandToRun, updatedConfigFileName, "o2-analysis-dq-efficiency", "tempConfigDQEfficiency.json", config)
+            workflowBuilder.setAnalysisWorkflow("o2-analysis-dq-efficiency", loadJson(args.analysis_config or "tempConfigDQEfficiency.json"))
         if runOverMC is False:
-            commandToRun = setParallelismOnSkimming(commandToRun, updatedConfigFileName, "o2-analysis-dq-table-reader", "tempConfigTableReader.json", config)
+            workflowBuilder.setAnalysisWorkflow("o2-analysis-dq-table-reader", loadJson(args.analysis_config or "tempConfigTableReader.json"))
+        commandToRun = workflowBuilder.getParallelCommand(commandToRun, writerConfigFileName)
+    
+    workflowBuilder.writeConfig()
     
     dispO2HelpMessage(args.helpO2, commandToRun)
     
@@ -260,8 +273,9 @@ def main():
     logging.info(depsToRun.keys())
     print("====================================================================================================================")
     dispArgs(allArgs) # Display all args
-    os.system(commandToRun) # Execute O2 generated commands
+    returnCode = runWorkflow(commandToRun, updatedConfigFileName, allArgs, runDirectory) # Execute O2 generated commands (in shards if --shards is set)
     runPycacheRemover() # Run pycacheRemover
+    return returnCode # exit code of workflow is exit code of script
 
 
 if __name__ == '__main__':
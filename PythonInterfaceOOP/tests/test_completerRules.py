@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# Tests of autocompletion rules (classification of configurables to completer kinds)
+#
+# Usage (from PythonInterfaceOOP):
+#   python3 -m pytest -q tests
+
+import glob
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from argcomplete.completers import ChoicesCompleter # noqa: E402
+from extramodules.choicesHandler import ChoicesCompleterList, SelsCompleter # noqa: E402
+from extramodules.completerRules import DEFAULT_COMPLETER_RULES, SKIP_KIND, getDefaultCompleterRules # noqa: E402
+
+CONFIGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "configs")
+
+BOOLEAN_CONFIGURABLES = ["cfgIsAmbiguous", "cfgFillCandidateTable", "cfgFlatTables", "cfgTPCpostCalib", "cfgUseKFVertexing", "cfgUseRemoteField", "cfgUseAbsDCA", "cfgPropToPCA", "compatibilityIU", "produceFBextendedTable", "doNotCrashOnNull", "useParamCollection", "fatalOnPassNotAvailable", "doNotSwap", "debug"]
+
+
+def classifyWithIfChain(configurable: str):
+    """Previous ordered if/elif chain of configSetter (reference of classification)"""
+
+    if "Cuts" in configurable:
+        return "analysisCuts"
+    if configurable.endswith("Signals") or configurable.endswith("signals"):
+        return "mcSignals"
+    if configurable == "cfgRunPeriods":
+        return "runPeriods"
+    if "Histogram" in configurable:
+        return "histograms"
+    if configurable.endswith("BarrelSels") or configurable.endswith("MuonSels"):
+        return "sels"
+    if "MixingVars" in configurable:
+        return "mixingVars"
+    if configurable.startswith("cfg") and "QA" in configurable:
+        return "booleanSelection"
+    if configurable in BOOLEAN_CONFIGURABLES[: 8]:
+        return "booleanSelection"
+    if configurable == "processDummy":
+        return SKIP_KIND
+    if configurable.startswith("process"):
+        return "booleanSelection"
+    if configurable == "syst":
+        return "collisionSystemSelection"
+    if configurable == "doVertexZeq":
+        return "binarySelection"
+    if configurable.startswith("pid-") or configurable.startswith("est"):
+        return "tripletSelection"
+    if configurable == "muonSelection":
+        return "eventMuonSelection"
+    if configurable == "itsMatching":
+        return "itsMatchingSelection"
+    if configurable in BOOLEAN_CONFIGURABLES[8 :]:
+        return "booleanSelection"
+    return None
+
+
+# (configurable, expected completer kind), names which match several rules pin the rule order
+CLASSIFICATION_TABLE = [
+    # cuts
+    ("cfgEventCuts", "analysisCuts"),
+    ("cfgBarrelTrackCuts", "analysisCuts"),
+    ("cfgPairCuts", "analysisCuts"),
+    ("cfgCutsSignals", "analysisCuts"), # cuts before signals
+    ("cfgQACuts", "analysisCuts"), # cuts before QA
+    ("cfgHistogramCuts", "analysisCuts"), # cuts before histograms
+    # signals
+    ("cfgBarrelMCSignals", "mcSignals"),
+    ("cfgMCsignals", "mcSignals"),
+    ("cfgHistogramSignals", "mcSignals"), # signals before histograms
+    ("cfgSignalsQA", "booleanSelection"), # suffix rule
+    # run periods
+    ("cfgRunPeriods", "runPeriods"),
+    # histograms
+    ("cfgAddEventHistogram", "histograms"),
+    ("cfgAddSEPHistogram", "histograms"),
+    ("cfgMixingVarsHistogram", "histograms"), # histograms before mixing vars
+    ("cfgQAHistogram", "histograms"), # histograms before QA
+    # sels
+    ("cfgBarrelSels", "sels"),
+    ("cfgMuonSels", "sels"),
+    ("cfgBarrelSelsExtra", None),
+    # mixing
+    ("cfgMixingVars", "mixingVars"),
+    ("cfgMixingVarsQA", "mixingVars"), # mixing vars before QA
+    # bool args
+    ("cfgQA", "booleanSelection"),
+    ("cfgDetailedQA", "booleanSelection"),
+    ("fConfigQA", None), # QA rule needs cfg prefix
+    *[(configurable, "booleanSelection") for configurable in BOOLEAN_CONFIGURABLES],
+    # process functions
+    ("processDummy", SKIP_KIND),
+    ("processFull", "booleanSelection"),
+    ("processSkimmed", "booleanSelection"),
+    ("processQA", "booleanSelection"),
+    ("processBarrelCuts", "analysisCuts"), # DQ rules before process functions
+    # common framework
+    ("syst", "collisionSystemSelection"),
+    ("doVertexZeq", "binarySelection"),
+    ("pid-el", "tripletSelection"),
+    ("est-FT0M", "tripletSelection"),
+    ("estRun2V0M", "tripletSelection"),
+    ("muonSelection", "eventMuonSelection"),
+    ("itsMatching", "itsMatchingSelection"),
+    # without autocompletion
+    ("cfgMixingDepth", None),
+    ("ccdb-url", None),
+    ("cfgBarrelLowPt", None),
+    ("isRun3", None),
+    ("systematics", None)
+    ]
+
+
+class FakeDQLibGetter(object):
+    allAnalysisCuts = ["jpsiPID1", "jpsiPID2"]
+    allOnlyPairCuts = ["pairMassLow"]
+    allMCSignals = ["eeFromJpsi"]
+    allLHCPeriods = ["LHC22f"]
+    allHistos = ["event", "track"]
+    allMixing = ["Centrality1"]
+
+
+class CompleterRulesTest(unittest.TestCase):
+
+    def testClassificationTable(self):
+        for configurable, expectedKind in CLASSIFICATION_TABLE:
+            with self.subTest(configurable = configurable):
+                self.assertEqual(DEFAULT_COMPLETER_RULES.classify(configurable), expectedKind)
+                self.assertEqual(classifyWithIfChain(configurable), expectedKind)
+
+    def testConfigurablesOfBundledConfigs(self):
+        configurables = set()
+        for configFileName in glob.glob(os.path.join(CONFIGS_DIR, "config*.json")):
+            with open(configFileName) as f:
+                config = json.load(f)
+            configurables.update(configurable for block in config.values() if isinstance(block, dict) for configurable in block)
+        self.assertGreater(len(configurables), 100)
+        for configurable in sorted(configurables):
+            with self.subTest(configurable = configurable):
+                self.assertEqual(DEFAULT_COMPLETER_RULES.classify(configurable), classifyWithIfChain(configurable))
+
+    def testCompleters(self):
+        expectedCompleters = {
+            "analysisCuts": (ChoicesCompleterList, True, False),
+            "mcSignals": (ChoicesCompleterList, True, False),
+            "runPeriods": (ChoicesCompleterList, True, False),
+            "histograms": (ChoicesCompleterList, True, False),
+            "sels": (SelsCompleter, True, False),
+            "mixingVars": (ChoicesCompleterList, True, False),
+            "booleanSelection": (ChoicesCompleter, False, True),
+            "collisionSystemSelection": (ChoicesCompleter, False, False),
+            "binarySelection": (ChoicesCompleter, False, False),
+            "tripletSelection": (ChoicesCompleterList, True, False),
+            "eventMuonSelection": (ChoicesCompleter, False, False),
+            "itsMatchingSelection": (ChoicesCompleter, False, False)
+            }
+        self.assertEqual(set(DEFAULT_COMPLETER_RULES.kinds), set(expectedCompleters))
+        for kind, (completerClass, multiValue, lowerCase) in expectedCompleters.items():
+            with self.subTest(kind = kind):
+                self.assertIsInstance(DEFAULT_COMPLETER_RULES.getCompleter(kind, FakeDQLibGetter()), completerClass)
+                self.assertEqual(DEFAULT_COMPLETER_RULES.isMultiValue(kind), multiValue)
+                self.assertEqual(DEFAULT_COMPLETER_RULES.isLowerCase(kind), lowerCase)
+        self.assertIsNone(DEFAULT_COMPLETER_RULES.getCompleter("analysisCuts"))
+        self.assertEqual(DEFAULT_COMPLETER_RULES.getCompleter("booleanSelection").choices, ["true", "false"])
+
+    def testExtendedRules(self):
+        completerRules = getDefaultCompleterRules()
+        completerRules.addKind("ptBinSelection", choices = ["1", "2", "5"])
+        completerRules.addExact("ptBinSelection", ["cfgPtBin"])
+        completerRules.addPrefix("ptBinSelection", ["cfgPt"])
+        self.assertEqual(completerRules.classify("cfgPtBin"), "ptBinSelection")
+        self.assertEqual(completerRules.classify("cfgPtLow"), "ptBinSelection")
+        self.assertEqual(completerRules.classify("cfgPtCuts"), "analysisCuts") # added rules come after default rules
+        self.assertNotEqual(completerRules.fingerprint(), DEFAULT_COMPLETER_RULES.fingerprint())
+        self.assertIsNone(DEFAULT_COMPLETER_RULES.classify("cfgPtLow")) # default rules are not changed
+        with self.assertRaises(KeyError):
+            completerRules.addExact("unknownKind", ["cfgUnknown"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# Tests of config merging (iterative ConfigMerger against known outputs and the previous recursive merge)
+#
+# Usage (from PythonInterfaceOOP):
+#   python3 -m pytest -q tests
+
+import copy
+import os
+import sys
+import unittest
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extramodules.configUpdaterFramework import TYPE_CONFLICT, VALUE_CONFLICT, ConfigMerger, MergeConflict, reconcileConfigs # noqa: E402
+
+
+def recursiveMergeConfigs(config1: dict, config2: dict) -> dict:
+    """Previous recursive merge of ConfigMerger (reference of merged configs)"""
+
+    mergedConfig = OrderedDict()
+    for key, value in config1.items():
+        if isinstance(value, dict) and key in config2 and isinstance(config2[key], dict):
+            mergedConfig[key] = recursiveMergeConfigs(value, config2[key])
+        else:
+            mergedConfig[key] = value
+    for key, value in config2.items():
+        if key not in mergedConfig:
+            mergedConfig[key] = value
+        elif isinstance(value, dict) and not isinstance(mergedConfig[key], dict):
+            mergedConfig[key] = value
+    return mergedConfig
+
+
+OLD_CONFIG = {
+    "internal-dpl-aod-reader": {
+        "aod-file": "AO2D.root"
+        },
+    "table-maker": {
+        "cfgEventCuts": "eventStandard",
+        "cfgBarrelTrackCuts": "jpsiPID1",
+        "cfgMuonPtRange": [1, 2],
+        "cfgQA": "true",
+        "processBarrelOnlyWithQvector": "false",
+        "cfgOldCut": "1",
+        "ccdb": {
+            "url": "http://alice-ccdb.cern.ch",
+            "path": {
+                "grp": "GLO/GRP"
+                }
+            },
+        "cfgHistograms": "event",
+        "cfgSignals": {
+            "signal": "eeFromJpsi"
+            }
+        },
+    "event-selection-task": {
+        "syst": "pp",
+        "processRun3": "true"
+        }
+    }
+
+LATEST_CONFIG = {
+    "table-maker": {
+        "cfgEventCuts": "eventStandardNoINT7",
+        "cfgBarrelTrackCuts": "jpsiPID1",
+        "cfgMuonPtRange": [0],
+        "cfgQA": "false",
+        "ccdb": {
+            "url": "http://alice-ccdb.cern.ch",
+            "path": {
+                "grp": "GLO/GRP",
+                "mag": "GLO/Config/GRPMagField"
+                }
+            },
+        "cfgHistograms": {
+            "event": "true"
+            },
+        "cfgSignals": "eeFromJpsi",
+        "cfgNewCut": "2"
+        },
+    "event-selection-task": {
+        "syst": "pp",
+        "processRun3": "true"
+        },
+    "timestamp-task": {
+        "verbose": "false"
+        }
+    }
+
+EXPECTED_MERGED_CONFIG = {
+    "internal-dpl-aod-reader": {
+        "aod-file": "AO2D.root"
+        },
+    "table-maker": {
+        "cfgEventCuts": "eventStandard",
+        "cfgBarrelTrackCuts": "jpsiPID1",
+        "cfgMuonPtRange": [1, 2],
+        "cfgQA": "true",
+        "processBarrelOnlyWithQvector": "false",
+        "cfgOldCut": "1",
+        "ccdb": {
+            "url": "http://alice-ccdb.cern.ch",
+            "path": {
+                "grp": "GLO/GRP",
+                "mag": "GLO/Config/GRPMagField"
+                }
+            },
+        "cfgHistograms": {
+            "event": "true"
+            },
+        "cfgSignals": {
+            "signal": "eeFromJpsi"
+            },
+        "cfgNewCut": "2"
+        },
+    "event-selection-task": {
+        "syst": "pp",
+        "processRun3": "true"
+        },
+    "timestamp-task": {
+        "verbose": "false"
+        }
+    }
+
+EXPECTED_CONFLICTS = [
+    MergeConflict(("table-maker", "cfgEventCuts"), VALUE_CONFLICT, "eventStandard", "eventStandardNoINT7"),
+    MergeConflict(("table-maker", "cfgMuonPtRange"), VALUE_CONFLICT, [1, 2], [0]),
+    MergeConflict(("table-maker", "cfgQA"), VALUE_CONFLICT, "true", "false"),
+    MergeConflict(("table-maker", "cfgHistograms"), TYPE_CONFLICT, "event", {"event": "true"}),
+    MergeConflict(("table-maker", "cfgSignals"), TYPE_CONFLICT, {"signal": "eeFromJpsi"}, "eeFromJpsi")
+    ]
+
+
+class ConfigMergerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.oldConfig = copy.deepcopy(OLD_CONFIG)
+        self.latestConfig = copy.deepcopy(LATEST_CONFIG)
+
+    def assertInputsUnchanged(self):
+        self.assertEqual(self.oldConfig, OLD_CONFIG)
+        self.assertEqual(self.latestConfig, LATEST_CONFIG)
+        self.assertEqual(list(self.oldConfig["table-maker"]), list(OLD_CONFIG["table-maker"]))
+
+    def testMergedConfig(self):
+        for shareUnchanged in (False, True):
+            with self.subTest(shareUnchanged = shareUnchanged):
+                configMerger = ConfigMerger(self.oldConfig, self.latestConfig, shareUnchanged = shareUnchanged)
+                self.assertEqual(configMerger.mergedConfig, EXPECTED_MERGED_CONFIG)
+                self.assertEqual(configMerger.mergedConfig, recursiveMergeConfigs(OLD_CONFIG, LATEST_CONFIG))
+                self.assertInputsUnchanged()
+
+    def testKeyOrder(self):
+        mergedConfig = ConfigMerger(self.oldConfig, self.latestConfig).mergedConfig
+        self.assertEqual(list(mergedConfig), list(EXPECTED_MERGED_CONFIG))
+        self.assertEqual(list(mergedConfig["table-maker"]), list(EXPECTED_MERGED_CONFIG["table-maker"]))
+        self.assertEqual(list(mergedConfig["table-maker"]["ccdb"]["path"]), ["grp", "mag"])
+
+    def testConflicts(self):
+        configMerger = ConfigMerger(self.oldConfig, self.latestConfig, shareUnchanged = True)
+        self.assertEqual(configMerger.conflicts, EXPECTED_CONFLICTS)
+        self.assertEqual(configMerger.getConflictReport()[3], {
+            "path": ["table-maker", "cfgHistograms"],
+            "kind": TYPE_CONFLICT,
+            "config1Value": "event",
+            "config2Value": {
+                "event": "true"
+                }
+            })
+
+    def testSharedUnchangedSubDicts(self):
+        mergedConfig = ConfigMerger(self.oldConfig, self.latestConfig, shareUnchanged = True).mergedConfig
+        # Unchanged sub-dicts are shared with first config, changed ones are new dicts
+        self.assertIs(mergedConfig["event-selection-task"], self.oldConfig["event-selection-task"])
+        self.assertIs(mergedConfig["internal-dpl-aod-reader"], self.oldConfig["internal-dpl-aod-reader"])
+        self.assertIsNot(mergedConfig["table-maker"], self.oldConfig["table-maker"])
+        self.assertIsNot(mergedConfig["table-maker"]["ccdb"], self.oldConfig["table-maker"]["ccdb"])
+        self.assertIsNot(mergedConfig["table-maker"]["ccdb"]["path"], self.oldConfig["table-maker"]["ccdb"]["path"])
+
+        mergedConfig = ConfigMerger(self.oldConfig, self.latestConfig).mergedConfig
+        self.assertIsNot(mergedConfig["event-selection-task"], self.oldConfig["event-selection-task"])
+
+    def testReconcileKeepsSubKeys(self):
+        configMerger = ConfigMerger(self.oldConfig, self.latestConfig, shareUnchanged = True)
+        alignedConfig, diff = reconcileConfigs(configMerger.mergedConfig, self.latestConfig, self.oldConfig, ["internal-dpl-aod-reader"], ["processBarrelOnlyWithQvector"], configMerger.conflicts)
+        self.assertInputsUnchanged()
+        self.assertEqual(list(alignedConfig), ["internal-dpl-aod-reader", "table-maker", "event-selection-task", "timestamp-task"])
+        self.assertEqual(alignedConfig["table-maker"], {
+            "cfgEventCuts": "eventStandard",
+            "cfgBarrelTrackCuts": "jpsiPID1",
+            "cfgMuonPtRange": [1, 2],
+            "cfgQA": "true",
+            "ccdb": EXPECTED_MERGED_CONFIG["table-maker"]["ccdb"],
+            "cfgHistograms": {
+                "event": "true"
+                },
+            "cfgSignals": {
+                "signal": "eeFromJpsi"
+                },
+            "cfgNewCut": "2",
+            "processBarrelOnlyWithQvector": "false"
+            })
+        self.assertEqual(diff["deprecatedConfigs"], {"table-maker": ["cfgOldCut"]})
+        self.assertEqual(diff["newTasks"], {"timestamp-task": {"verbose": "false"}})
+        self.assertEqual(diff["newConfigs"], {"table-maker": {"cfgNewCut": "2"}})
+        self.assertEqual(diff["changedDefaults"]["table-maker"]["cfgQA"], {"value": "true", "default": "false"})
+
+    def testEmptyAndDisjointConfigs(self):
+        self.assertEqual(ConfigMerger({}, {}).mergedConfig, {})
+        self.assertEqual(ConfigMerger({"a": {"x": "1"}}, {}).mergedConfig, {"a": {"x": "1"}})
+        self.assertEqual(ConfigMerger({}, {"b": {"y": "2"}}, shareUnchanged = True).mergedConfig, {"b": {"y": "2"}})
+
+    def testDeepConfig(self):
+        config1 = config2 = None
+        for depth in range(3000): # deeper than recursion limit
+            config1 = {"level": config1 or "1"}
+            config2 = {"level": config2 or "2", "extra": str(depth)}
+        mergedConfig = ConfigMerger(config1, config2).mergedConfig
+        self.assertEqual(mergedConfig["extra"], "2999")
+        self.assertEqual(len(ConfigMerger(config1, config2).conflicts), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
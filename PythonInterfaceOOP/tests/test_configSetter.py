@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# Tests of TAB autocompletion fast path (arguments which are registered for completing a command line)
+#
+# Usage (from PythonInterfaceOOP):
+#   python3 -m pytest -q tests
+
+import argparse
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extramodules.configSetter import findArgsOfOption, getArgsToComplete # noqa: E402
+
+MANIFEST_ARGS = [
+    ["table-maker:cfgQA", "booleanSelection"],
+    ["table-maker:cfgEventCuts", "analysisCuts"],
+    ["table-maker:cfgBarrelTrackCuts", "analysisCuts"],
+    ["table-maker:processFull", "booleanSelection"],
+    ["event-selection-task:syst", "collisionSystemSelection"],
+    ["event-selection-task:systematics", None]
+    ]
+
+# (command line, expected arguments to register, expected with completers)
+COMPLETION_TABLE = [
+    # option names
+    ("runTableMaker.py config.json --tab", MANIFEST_ARGS, False),
+    ("runTableMaker.py config.json --table-maker:cfgQA", MANIFEST_ARGS, False),
+    # parameter in next word
+    ("runTableMaker.py config.json --table-maker:cfgQA ", MANIFEST_ARGS[0 : 1], True),
+    ("runTableMaker.py config.json --table-maker:cfgEventCuts jpsi", MANIFEST_ARGS[1 : 2], True),
+    ("runTableMaker.py config.json --table-maker:cfgEventCuts eventStandard jpsi", MANIFEST_ARGS[1 : 2], True),
+    # abbreviations
+    ("runTableMaker.py config.json --table-maker:cfgQ ", MANIFEST_ARGS[0 : 1], True),
+    ("runTableMaker.py config.json --table-maker:cfgE ", MANIFEST_ARGS[1 : 2], True),
+    ("runTableMaker.py config.json --table-maker:cfg ", [], True), # ambiguous
+    ("runTableMaker.py config.json --event-selection-task:syst ", MANIFEST_ARGS[4 : 5], True), # exact before prefix
+    ("runTableMaker.py config.json --event-selection-task:syste ", MANIFEST_ARGS[5 :], True),
+    ("runTableMaker.py config.json --unknown ", [], True),
+    ("runTableMaker.py config.json -- ", [], True),
+    # parameter in same word
+    ("runTableMaker.py config.json --table-maker:cfgQA=", MANIFEST_ARGS[0 : 1], True),
+    ("runTableMaker.py config.json --table-maker:cfgQA=tr", MANIFEST_ARGS[0 : 1], True),
+    ("runTableMaker.py config.json --table-maker:cfgEv=jpsiPID1,jpsi", MANIFEST_ARGS[1 : 2], True),
+    ("runTableMaker.py config.json --table-maker:cfgEventCuts=jpsiPID1 ", [], False), # parameter is already provided
+    # positional argument
+    ("runTableMaker.py conf", [], False)
+    ]
+
+
+class GetArgsToCompleteTest(unittest.TestCase):
+
+    def testCompletionTable(self):
+        for compLine, expectedArgs, expectedWithCompleters in COMPLETION_TABLE:
+            with self.subTest(compLine = compLine):
+                self.assertEqual(getArgsToComplete(MANIFEST_ARGS, compLine, len(compLine)), (expectedArgs, expectedWithCompleters))
+
+    def testSameResolutionAsArgparse(self):
+        parser = argparse.ArgumentParser()
+        for arg, completerKind in MANIFEST_ARGS:
+            parser.add_argument("--" + arg, action = "store")
+        for optionString in ["--table-maker:cfgQ", "--table-maker:cfgBarrel", "--event-selection-task:syst", "--event-selection-task:systematic", "--table-maker:proc=true"]:
+            with self.subTest(optionString = optionString):
+                argsToRegister = findArgsOfOption(MANIFEST_ARGS, optionString)
+                self.assertEqual(len(argsToRegister), 1)
+                commandLine = [optionString] if "=" in optionString else [optionString, "value"]
+                parsedArgs = {dest: value for dest, value in vars(parser.parse_args(commandLine)).items() if value is not None}
+                self.assertEqual(list(parsedArgs), [argsToRegister[0][0].replace("-", "_")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# Tests of incremental config updates (task blocks are rebuilt only if their source changed) with a local O2Physics checkout
+#
+# Usage (from PythonInterfaceOOP):
+#   python3 -m pytest -q tests
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import configUpdater # noqa: E402
+from extramodules import configManifest # noqa: E402
+from extramodules.configUpdaterFramework import O2SourceCache # noqa: E402
+
+TASK_SOURCE = """struct Task{name} {{
+  Configurable<float> cfgPt{{"cfgPt", {pt}, "pt cut"}};
+  Configurable<std::string> cfgCuts{{"cfgCuts", "jpsiPID1",
+                                    "Comma separated list of cuts"}};
+  void processFull() {{}}
+  PROCESS_SWITCH(Task{name}, processFull, "Run full selection", true);
+}};
+WorkflowSpec defineDataProcessing(ConfigContext const& cfgc)
+{{
+  return WorkflowSpec{{adaptAnalysisTask<Task{name}>(cfgc, TaskName{{"task-{lowerName}"}})}};
+}}
+"""
+
+OLD_CONFIG = {
+    "internal-dpl-aod-reader": {
+        "aod-file": "AO2D.root"
+        },
+    "task-a": {
+        "cfgPt": "2.0",
+        "cfgOld": "1",
+        "processFull": "true"
+        },
+    "task-b": {
+        "cfgPt": "3.0",
+        "processFull": "false"
+        },
+    "task-c": {
+        "cfgPt": "4.0",
+        "processFull": "true"
+        }
+    }
+
+TASK_NAMES = ["A", "B", "C"]
+
+
+class IncrementalConfigUpdateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempDir.cleanup)
+        self.sourceDir = os.path.join(self.tempDir.name, "O2Physics")
+        os.makedirs(os.path.join(self.sourceDir, "PWGDQ", "Tasks"))
+        for name in TASK_NAMES:
+            self.writeTaskSource(name, "1.0f")
+        self.taskWithDeps = {f"task{name}": f"https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Tasks/task{name}.cxx?raw=true" for name in TASK_NAMES}
+        self.oldConfigFileName = os.path.join(self.tempDir.name, "configs", "configTest.json")
+        self.configFileName = os.path.join(self.tempDir.name, "updatedconfigs", "configTest.json")
+        os.makedirs(os.path.dirname(self.oldConfigFileName))
+        self.writeJson(self.oldConfigFileName, OLD_CONFIG)
+
+    def writeTaskSource(self, name: str, pt: str) -> None:
+        with open(os.path.join(self.sourceDir, "PWGDQ", "Tasks", f"task{name}.cxx"), "w") as f:
+            f.write(TASK_SOURCE.format(name = name, lowerName = name.lower(), pt = pt))
+
+    def writeJson(self, fileName: str, content: dict) -> None:
+        with open(fileName, "w") as f:
+            json.dump(content, f, indent = 4)
+
+    def readBytes(self, fileName: str) -> bytes:
+        with open(fileName, "rb") as f:
+            return f.read()
+
+    def update(self, keepSubKeys: list = [], incremental: bool = True) -> tuple:
+        """Updates old config with a new source cache and returns diff records and task blocks which are rebuilt"""
+
+        rebuiltTasks = []
+
+        def recordConfigMerger(oldTaskBlocks, latestTaskBlocks, **kwargs):
+            rebuiltTasks.extend(sorted(set(oldTaskBlocks) | set(latestTaskBlocks)))
+            return configMerger(oldTaskBlocks, latestTaskBlocks, **kwargs)
+
+        configMerger = configUpdater.ConfigMerger
+        with mock.patch.object(configUpdater, "ConfigMerger", side_effect = recordConfigMerger):
+            diffRecords = configUpdater.updatedConfigFileGenerator(self.taskWithDeps, [self.oldConfigFileName], ["internal-dpl-aod-reader"], keepSubKeys, O2SourceCache(sourceDir = self.sourceDir), incremental, [self.configFileName])
+        return diffRecords, rebuiltTasks
+
+    def testFirstUpdateBuildsAllTasks(self):
+        diffRecords, rebuiltTasks = self.update()
+        self.assertEqual(rebuiltTasks, ["internal-dpl-aod-reader", "task-a", "task-b", "task-c"])
+        self.assertEqual(diffRecords[0]["status"], "updated")
+        with open(self.configFileName) as f:
+            config = json.load(f)
+        self.assertEqual(list(config), ["internal-dpl-aod-reader", "task-a", "task-b", "task-c"])
+        self.assertEqual(config["task-a"], {"cfgPt": "2.0", "cfgCuts": "jpsiPID1", "processFull": "true"})
+
+    def testUnchangedSourcesAreUpToDate(self):
+        self.update()
+        content = self.readBytes(self.configFileName)
+        diffRecords, rebuiltTasks = self.update()
+        self.assertEqual(rebuiltTasks, [])
+        self.assertEqual(diffRecords[0]["status"], "unchanged")
+        self.assertEqual(diffRecords[0]["deprecatedConfigs"], {"task-a": ["cfgOld"]})
+        self.assertEqual(self.readBytes(self.configFileName), content)
+
+    def testOnlyChangedTaskIsRebuilt(self):
+        self.update()
+        with open(self.configFileName) as f:
+            previousConfig = json.load(f)
+
+        self.writeTaskSource("B", "5.0f") # new source hash and new default value of task-b
+        diffRecords, rebuiltTasks = self.update()
+        self.assertEqual(rebuiltTasks, ["task-b"])
+        self.assertEqual(diffRecords[0]["status"], "updated")
+        self.assertEqual(diffRecords[0]["changedDefaults"]["task-b"]["cfgPt"], {"value": "3.0", "default": "5.0"})
+        self.assertEqual(diffRecords[0]["deprecatedConfigs"], {"task-a": ["cfgOld"]}) # diff of reused task blocks is kept
+
+        # Other task blocks are byte-identical: the file is the previous file with only task-b replaced
+        with open(self.configFileName) as f:
+            config = json.load(f)
+        self.assertEqual(self.readBytes(self.configFileName), json.dumps({**previousConfig, "task-b": config["task-b"]}, indent = 4).encode("utf-8"))
+
+    def assertFullRebuild(self, **updateArgs):
+        diffRecords, rebuiltTasks = self.update(**updateArgs)
+        self.assertEqual(rebuiltTasks, ["internal-dpl-aod-reader", "task-a", "task-b", "task-c"])
+        self.assertEqual(diffRecords[0]["status"], "updated")
+
+    def testChangedOldConfigForcesFullRebuild(self):
+        self.update()
+        self.writeJson(self.oldConfigFileName, {**OLD_CONFIG, "task-c": {"cfgPt": "6.0", "processFull": "true"}})
+        self.assertFullRebuild()
+
+    def testChangedKeepKeyForcesFullRebuild(self):
+        self.update()
+        self.assertFullRebuild(keepSubKeys = ["cfgOld"])
+
+    def testManifestVersionForcesFullRebuild(self):
+        self.update()
+        with mock.patch.object(configManifest, "CONFIG_MANIFEST_VERSION", configManifest.CONFIG_MANIFEST_VERSION + 1):
+            self.assertFullRebuild()
+
+    def testHandEditedOutputForcesFullRebuild(self):
+        self.update()
+        with open(self.configFileName) as f:
+            config = json.load(f)
+        config["task-a"]["cfgPt"] = "7.0"
+        self.writeJson(self.configFileName, config)
+        self.assertFullRebuild()
+        with open(self.configFileName) as f:
+            self.assertEqual(json.load(f)["task-a"]["cfgPt"], "2.0")
+
+    def testMissingManifestForcesFullRebuild(self):
+        self.update()
+        os.remove(configManifest.getConfigManifestFileName(self.configFileName))
+        self.assertFullRebuild()
+
+    def testFullModeRebuildsAllTasks(self):
+        self.update()
+        self.assertFullRebuild(incremental = False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# Tests of HTTP getter (redirects, ETag/304, deadline, keep-alive) with a local stand-in of github servers
+#
+# Usage (from PythonInterfaceOOP):
+#   python3 -m pytest -q tests
+
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extramodules.dqExceptions import DownloadError # noqa: E402
+from extramodules.httpFetcher import HttpFetcher # noqa: E402
+
+FILE_CONTENT = b"struct tableMaker {\nConfigurable<float> fConfigCut{\"cfgCut\", 1.0, \"cut\"};\n};\n"
+FILE_ETAG = '"v1"'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    """Stand-in of github: /file (with ETag), redirects to it, a redirect loop and a slow body"""
+
+    protocol_version = "HTTP/1.1" # keep-alive connections
+
+    def log_message(self, format, *args):
+        pass
+
+    def sendResponse(self, status: int, headers: dict = None, body: bytes = b"") -> None:
+        self.server.clientPorts.add(self.client_address[1])
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/file":
+            if self.headers.get("If-None-Match") == FILE_ETAG:
+                self.sendResponse(304, {"ETag": FILE_ETAG})
+            else:
+                self.sendResponse(200, {"ETag": FILE_ETAG}, FILE_CONTENT)
+        elif self.path == "/redirect":
+            self.sendResponse(302, {"Location": "/moved"}, b"moved")
+        elif self.path == "/moved":
+            self.sendResponse(301, {"Location": f"http://127.0.0.1:{self.server.server_port}/file"}, b"moved")
+        elif self.path == "/loop":
+            self.sendResponse(302, {"Location": "/loop"})
+        elif self.path == "/slow":
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(FILE_CONTENT)))
+            self.end_headers()
+            try:
+                self.wfile.write(FILE_CONTENT[: 10])
+                self.wfile.flush()
+                time.sleep(2)
+                self.wfile.write(FILE_CONTENT[10 :])
+            except OSError:
+                pass # client gave up
+        else:
+            self.sendResponse(404, body = b"not found")
+
+
+class HttpFetcherTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.server.daemon_threads = True
+        cls.server.clientPorts = set()
+        cls.serverThread = threading.Thread(target = cls.server.serve_forever, daemon = True)
+        cls.serverThread.start()
+        cls.baseUrl = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.clientPorts.clear()
+        self.httpFetcher = HttpFetcher(timeout = 5)
+        self.addCleanup(self.httpFetcher.close)
+
+    def testFetch(self):
+        self.assertEqual(self.httpFetcher.fetch(f"{self.baseUrl}/file"), FILE_CONTENT)
+
+    def testRedirectsAreFollowedOnOneConnection(self):
+        response = self.httpFetcher.request(f"{self.baseUrl}/redirect")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.body, FILE_CONTENT)
+        self.assertEqual(response.url, f"{self.baseUrl}/file")
+        self.assertEqual(len(self.server.clientPorts), 1)
+
+    def testTooManyRedirects(self):
+        with self.assertRaises(DownloadError) as context:
+            HttpFetcher(timeout = 5, maxRedirects = 3).fetch(f"{self.baseUrl}/loop")
+        self.assertEqual(context.exception.reason, "too many redirects")
+
+    def testNotModified(self):
+        response = self.httpFetcher.request(f"{self.baseUrl}/file")
+        self.assertEqual(response.headers["etag"], FILE_ETAG)
+        response = self.httpFetcher.request(f"{self.baseUrl}/file", {"If-None-Match": response.headers["etag"]})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.body, b"")
+        self.assertEqual(len(self.server.clientPorts), 1)
+
+    def testNotFound(self):
+        with self.assertRaises(DownloadError) as context:
+            self.httpFetcher.fetch(f"{self.baseUrl}/missing")
+        self.assertEqual(context.exception.reason, "HTTP 404")
+
+    def testDeadline(self):
+        httpFetcher = HttpFetcher(timeout = 0.5)
+        self.addCleanup(httpFetcher.close)
+        startTime = time.monotonic()
+        with self.assertRaises(DownloadError):
+            httpFetcher.fetch(f"{self.baseUrl}/slow")
+        self.assertLess(time.monotonic() - startTime, 1.5)
+        with self.assertRaises(DownloadError):
+            list(httpFetcher.iterLines(f"{self.baseUrl}/slow"))
+
+    def testIterLines(self):
+        self.assertEqual(b"".join(self.httpFetcher.iterLines(f"{self.baseUrl}/redirect")), FILE_CONTENT)
+
+    def testFetchAll(self):
+        urls = {index: f"{self.baseUrl}/file" for index in range(4)}
+        self.assertEqual(self.httpFetcher.fetchAll(urls), {index: FILE_CONTENT for index in range(4)})
+
+    def testConnectionsAreReusedAcrossFetchAll(self):
+        httpFetcher = HttpFetcher(timeout = 5, maxWorkers = 4)
+        self.addCleanup(httpFetcher.close)
+        urls = {index: f"{self.baseUrl}/redirect" for index in range(8)}
+        httpFetcher.fetchAll(urls)
+        firstPorts = set(self.server.clientPorts)
+        self.assertLessEqual(len(firstPorts), 4)
+        for _ in range(3):
+            httpFetcher.fetchAll(urls)
+            httpFetcher.fetch(f"{self.baseUrl}/file")
+        self.assertEqual(self.server.clientPorts, firstPorts)
+
+    def testErrorsDontLeakConnections(self):
+        for _ in range(3):
+            with self.assertRaises(DownloadError):
+                self.httpFetcher.fetch(f"{self.baseUrl}/missing")
+        self.httpFetcher.fetch(f"{self.baseUrl}/file")
+        self.assertEqual(len(self.server.clientPorts), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# Tests of sharded execution (shard packing, bounded concurrency, merge, failed shards) with a fake O2 workflow
+#
+# Usage (from PythonInterfaceOOP):
+#   python3 -m pytest -q tests
+
+import json
+import os
+import shlex
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extramodules.shardedExecutor import ShardedExecutor, isShardPlanOf, packShards # noqa: E402
+
+# Fake O2 workflow: reads AO2D list of its json:// configuration, records how many workflows run at the same time
+# and writes AnalysisResults.root (and AO2D output of --aod-writer-json) with the AO2D files it read
+FAKE_WORKFLOW = """
+import json, os, sys, time
+args = sys.argv[1:]
+config = json.load(open(args[args.index("--configuration") + 1][len("json://"):]))
+aodFiles = [line.strip() for line in open(config["internal-dpl-aod-reader"]["aod-file"][1:]) if line.strip()]
+if "--fail-on" in args and any(args[args.index("--fail-on") + 1] in aodFile for aodFile in aodFiles):
+    sys.exit(3)
+runningDir = args[args.index("--running-dir") + 1]
+marker = os.path.join(runningDir, str(os.getpid()))
+open(marker, "w").close()
+with open(os.path.join(runningDir, "..", "concurrency.log"), "a") as f:
+    f.write(str(len(os.listdir(runningDir))) + "\\n")
+time.sleep(0.3)
+os.remove(marker)
+output = "".join(aodFile + "\\n" for aodFile in aodFiles)
+open("AnalysisResults.root", "w").write(output)
+if "--aod-writer-json" in args:
+    writerConfig = json.load(open(args[args.index("--aod-writer-json") + 1]))
+    open(writerConfig["OutputDirector"]["resfile"] + ".root", "w").write(output)
+"""
+
+
+class ShardedExecutorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempDir.cleanup)
+        self.dirName = self.tempDir.name
+        self.runningDir = os.path.join(self.dirName, "running")
+        os.makedirs(self.runningDir)
+        self.outputDir = os.path.join(self.dirName, "output")
+        os.makedirs(self.outputDir)
+
+        self.workflowFileName = self.writeFile("fakeWorkflow.py", FAKE_WORKFLOW)
+        self.aodFiles = [self.writeFile(f"AO2D_{index}.root", "root" + "x" * index) for index in range(1, 9)]
+        self.configFileName = self.writeFile("configTableMakerDataRun3.json", json.dumps({"internal-dpl-aod-reader": {"aod-file": "@list.txt"}}))
+        self.writerConfigFileName = self.writeFile("aodWriterTempConfig.json", json.dumps({"OutputDirector": {"resfile": os.path.join(self.dirName, "reducedAod")}}))
+        self.mergeCommands = {
+            "AnalysisResults.root": "cat {inputs} > {output}",
+            "reducedAod.root": "cat {inputs} > {output}"
+            }
+
+    def writeFile(self, fileName: str, content: str) -> str:
+        fileName = os.path.join(self.dirName, fileName)
+        with open(fileName, "w") as f:
+            f.write(content)
+        return fileName
+
+    def getCommand(self, *extraArgs) -> str:
+        return " ".join([shlex.quote(sys.executable), shlex.quote(self.workflowFileName), "--configuration", f"json://{self.configFileName}", "--aod-writer-json", self.writerConfigFileName, "--running-dir", self.runningDir, *extraArgs])
+
+    def getShardedExecutor(self, nShards: int, maxParallel: int, command: str = None, mergeCommands: dict = None) -> ShardedExecutor:
+        shards = packShards(self.aodFiles, [os.path.getsize(aodFile) for aodFile in self.aodFiles], nShards)
+        return ShardedExecutor(command or self.getCommand(), self.configFileName, shards, maxParallel, self.dirName, self.outputDir, self.mergeCommands if mergeCommands is None else mergeCommands)
+
+    def readLines(self, fileName: str) -> list:
+        with open(fileName) as f:
+            return f.read().splitlines()
+
+    def testPackShardsBalancesBytes(self):
+        shards = packShards(["a", "b", "c", "d", "e", "f"], [50, 40, 30, 20, 10, 10], 3)
+        self.assertEqual(len(shards), 3)
+        self.assertTrue(isShardPlanOf(shards, ["a", "b", "c", "d", "e", "f"]))
+        self.assertEqual(sorted(shard["bytes"] for shard in shards), [50, 50, 60])
+
+    def testPackShardsMinimumSize(self):
+        shards = packShards(["a", "b", "c", "d"], [10, 10, 10, 10], 4, minShardBytes = 20)
+        self.assertEqual(len(shards), 2)
+        self.assertTrue(isShardPlanOf(shards, ["a", "b", "c", "d"]))
+
+    def testPackShardsUnknownSizesKeepShardCount(self):
+        aodFiles = [f"alien:///AO2D_{index}.root" for index in range(8)]
+        shards = packShards(aodFiles, [None] * len(aodFiles), 4, minShardBytes = 256 * 1024 * 1024)
+        self.assertEqual([len(shard["files"]) for shard in shards], [2, 2, 2, 2])
+
+    def testPrepareShardRewritesConfigAndWriter(self):
+        shardedExecutor = self.getShardedExecutor(2, 2)
+        shardDir, command = shardedExecutor.prepareShard(0, shardedExecutor.shards[0]["files"], {"internal-dpl-aod-reader": {"aod-file": "@list.txt"}})
+
+        shardConfigFileName = os.path.join(shardDir, "configTableMakerDataRun3.json")
+        shardWriterConfigFileName = os.path.join(shardDir, "aodWriterTempConfig.json")
+        self.assertIn(f"json://{shardConfigFileName}", command)
+        self.assertNotIn(f"json://{self.configFileName}", command)
+        self.assertIn(f"--aod-writer-json {shardWriterConfigFileName}", command)
+        with open(shardConfigFileName) as f:
+            self.assertEqual(json.load(f)["internal-dpl-aod-reader"]["aod-file"], "@" + os.path.join(shardDir, "aodList.txt"))
+        with open(shardWriterConfigFileName) as f:
+            self.assertEqual(json.load(f)["OutputDirector"]["resfile"], "reducedAod")
+        self.assertEqual(self.readLines(os.path.join(shardDir, "aodList.txt")), [aodFile["path"] for aodFile in shardedExecutor.shards[0]["files"]])
+
+    def testRunMergesShardOutputs(self):
+        shardedExecutor = self.getShardedExecutor(4, 4)
+        self.assertEqual(len(shardedExecutor.shards), 4)
+        self.assertEqual(shardedExecutor.run(), 0)
+        for outputFileName in ("AnalysisResults.root", "reducedAod.root"):
+            self.assertEqual(sorted(self.readLines(os.path.join(self.outputDir, outputFileName))), sorted(self.aodFiles))
+
+    def testRunBoundsConcurrency(self):
+        shardedExecutor = self.getShardedExecutor(4, 2)
+        self.assertEqual(shardedExecutor.run(), 0)
+        concurrency = [int(line) for line in self.readLines(os.path.join(self.dirName, "concurrency.log"))]
+        self.assertEqual(len(concurrency), 4)
+        self.assertLessEqual(max(concurrency), 2)
+
+    def testFailedShardIsNotMerged(self):
+        shardedExecutor = self.getShardedExecutor(4, 4, self.getCommand("--fail-on", "AO2D_3.root"))
+        self.assertEqual(shardedExecutor.run(), 3)
+        self.assertEqual(os.listdir(self.outputDir), [])
+
+    def testMissingMergeCommand(self):
+        shardedExecutor = self.getShardedExecutor(2, 2, mergeCommands = {"AnalysisResults.root": "cat {inputs} > {output}"})
+        self.assertEqual(shardedExecutor.run(), 1)
+        self.assertEqual(os.listdir(self.outputDir), ["AnalysisResults.root"])
+        for index in range(2):
+            self.assertTrue(os.path.isfile(os.path.join(shardedExecutor.shardsDir, f"shard_{index:03d}", "reducedAod.root")))
+
+
+if __name__ == "__main__":
+    unittest.main()